@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark player_identity name resolution as the projection pool grows.
+
+Pads the real projection pool with synthetic players (real first names
+crossed with real last names) at 1x, 10x and 100x, then times resolving
+every blocked/roster/my_players name. Per-lookup time should grow far
+slower than the pool.
+
+Usage (from the repo root):
+    python benchmarks/bench_identity.py [scale ...]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import match_players  # noqa: E402
+import player_identity  # noqa: E402
+
+DEFAULT_SCALES = [1, 10, 100]
+
+
+def synthetic_pool(projections, scale, seed=0):
+    """The real pool plus (scale - 1) x len(pool) made-up minor leaguers."""
+    extra = len(projections) * (scale - 1)
+    if extra == 0:
+        return projections
+    rng = np.random.default_rng(seed)
+    parts = projections['NameASCII'].str.split(' ', n=1)
+    firsts = parts.str[0].dropna().unique()
+    lasts = parts.str[1].dropna().unique()
+    names = [f'{f} {l}' for f, l in zip(rng.choice(firsts, extra), rng.choice(lasts, extra))]
+    fake = pd.DataFrame({
+        'NameASCII': names,
+        'PlayerId': [f'syn{i}' for i in range(extra)],
+        'MLBAMID': np.nan,
+        'Team': None,
+        'Player_Type': 'Batter',
+        'FPTS': 0.0,
+    })
+    return pd.concat([projections[fake.columns], fake], ignore_index=True)
+
+
+def main(argv):
+    scales = [int(a) for a in argv] or DEFAULT_SCALES
+
+    batters, pitchers, blocked, rosters = match_players.load_sources()
+    projections, _ = match_players.merge_sources(batters, pitchers, blocked, rosters)
+    names = pd.concat([
+        blocked['Player'],
+        rosters['Player Name'].dropna(),
+        pd.read_csv('my_players.csv')['Player'],
+    ], ignore_index=True)
+
+    print("\n" + "=" * 70)
+    print("IDENTITY RESOLUTION BENCHMARK")
+    print("=" * 70)
+    print(f"{'Scale':>6} {'Pool':>10} {'Index s':>9} {'Lookups':>8} {'us/lookup':>10} {'Matched':>8}")
+
+    for scale in scales:
+        pool = synthetic_pool(projections, scale)
+
+        start = time.perf_counter()
+        index = player_identity.PlayerIndex(pool)
+        index_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        report = index.resolve(names)
+        elapsed = time.perf_counter() - start
+
+        matched = report['PlayerId'].notna().sum()
+        print(f"{f'{scale}x':>6} {len(pool):>10,} {index_time:>9.2f} {len(names):>8,} "
+              f"{elapsed / len(names) * 1e6:>10.1f} {matched:>8,}")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark the match_players.py ingestion stage (salary parsing + counting stats).
+
+Times derive_columns() on the merged projection table at 1x, 10x and 100x the
+current row count, plus the old row-wise implementation at 1x for reference.
+
+Usage (from the repo root):
+    python benchmarks/bench_ingest.py [scale ...]
+"""
+
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import match_players  # noqa: E402
+
+DEFAULT_SCALES = [1, 10, 100]
+REPEATS = 3
+
+
+def legacy_clean_salary(val):
+    """Row-wise salary parser that match_players.py used before vectorizing."""
+    if pd.isna(val) or val == '' or val == ' $ -   ':
+        return None
+    val_str = str(val).replace('$', '').replace(',', '').strip()
+    if val_str == '' or val_str == 'YP' or val_str == '-':
+        return None
+    try:
+        return float(val_str)
+    except ValueError:
+        return None
+
+
+def legacy_calc_counting(row):
+    """Row-wise counting stats that match_players.py used before vectorizing."""
+    if row['Player_Type'] == 'Batter':
+        return (pd.to_numeric(row['HR'], errors='coerce') or 0) + \
+               (pd.to_numeric(row['R'], errors='coerce') or 0) + \
+               (pd.to_numeric(row['RBI'], errors='coerce') or 0) + \
+               (pd.to_numeric(row['SB'], errors='coerce') or 0)
+    elif row['Player_Type'] == 'Pitcher':
+        return (pd.to_numeric(row['W'], errors='coerce') or 0) + \
+               (pd.to_numeric(row['QS'], errors='coerce') or 0) + \
+               (pd.to_numeric(row['SV'], errors='coerce') or 0) + \
+               (pd.to_numeric(row['HLD'], errors='coerce') or 0) + \
+               (pd.to_numeric(row['SO'], errors='coerce') or 0)
+    return None
+
+
+def legacy_stage(projections):
+    salaries = {target: projections[source].apply(legacy_clean_salary)
+                for source, target in match_players.SALARY_COLUMNS.items()}
+    counting = projections.apply(legacy_calc_counting, axis=1)
+    return salaries, counting
+
+
+def best_time(func, *args):
+    """Best-of-REPEATS wall time in seconds."""
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(argv):
+    scales = [int(a) for a in argv] or DEFAULT_SCALES
+
+    batters, pitchers, blocked, rosters = match_players.load_sources()
+    merged, _ = match_players.merge_sources(batters, pitchers, blocked, rosters)
+
+    # The vectorized path must reproduce the row-wise one before we time it
+    derived = match_players.derive_columns(merged)
+    salaries, counting = legacy_stage(merged)
+    for target, legacy in salaries.items():
+        pd.testing.assert_series_equal(derived[target], legacy.astype(float), check_names=False)
+    pd.testing.assert_series_equal(derived['Counting_Stats'], counting.astype(float), check_names=False)
+
+    print("\n" + "=" * 60)
+    print("INGESTION STAGE BENCHMARK (salary parsing + counting stats)")
+    print("=" * 60)
+    print(f"{'Scale':>6} {'Rows':>10} {'Seconds':>10} {'us/row':>8}")
+
+    legacy_time = best_time(legacy_stage, merged)
+    print(f"{'1x':>6} {len(merged):>10,} {legacy_time:>10.3f} {legacy_time / len(merged) * 1e6:>8.2f}  (row-wise legacy)")
+
+    for scale in scales:
+        frame = pd.concat([merged] * scale, ignore_index=True) if scale > 1 else merged
+        elapsed = best_time(match_players.derive_columns, frame)
+        print(f"{f'{scale}x':>6} {len(frame):>10,} {elapsed:>10.3f} {elapsed / len(frame) * 1e6:>8.2f}")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Stage-level benchmarks for the whole pipeline, at growing sizes.
+
+Stages:
+    ingest          match_players merge + derived columns (projection CSVs x scale)
+    board:<key>     draft_board_analysis.build_boards for one strategy
+    boards          every strategy in one build_boards call
+    page            generate_fbb_page: boards -> JSON records -> HTML
+    analyze         analyze_fantasy.py on a standings table (teams x categories)
+
+Player stages run on the players who pass the playing-time filters (1x)
+and on synthetic pools of 10x, 100x and 1000x them (stats jittered, fresh
+PlayerIds), so every extra row reaches the scoring code. The pools keep
+only the columns the board code reads, which is what lets 1000x fit in
+memory. ingest scales the raw projection CSVs instead (every column, as
+read) and stops at 10x by default: 100x of the raw table needs several GB.
+analyze runs on fantrax_data.csv and on synthetic standings with more teams
+and more categories.
+
+Each (stage, size) runs in its own worker process so peak RSS is that
+stage's alone. A worker records the best wall time (of up to 3 runs while
+they total under 2s), the process peak RSS, and the peak traced allocation
+in a separate tracemalloc run. Rows are appended to benchmarks/results.csv
+with the commit, and each is compared with the previous run of the same
+stage and size.
+
+Usage (from the repo root):
+    python benchmarks/bench_pipeline.py                       # everything
+    python benchmarks/bench_pipeline.py --stages board:balanced page --scales 1 10
+    python benchmarks/bench_pipeline.py --stages analyze --leagues 12x14 24x14 12x18
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import analyze_fantasy  # noqa: E402
+import draft_board_analysis as dba  # noqa: E402
+import roto  # noqa: E402
+
+RESULTS_PATH = os.path.join(ROOT, 'benchmarks', 'results.csv')
+RESULT_FIELDS = ['Timestamp', 'Commit', 'Stage', 'Size', 'Rows', 'Seconds', 'Peak_RSS_MB',
+                 'Alloc_Peak_MB', 'Status']
+DEFAULT_SCALES = [1, 10, 100, 1000]
+DEFAULT_LEAGUES = ['12x14', '24x14', '48x14', '12x16']
+MAX_SCALE = {'ingest': 10}
+REPEATS = 3
+REPEAT_BUDGET = 2.0   # seconds; slower stages are timed once
+TIMEOUT = 1800
+JITTER = 0.05
+
+# =============================================================================
+# SYNTHETIC INPUTS
+# =============================================================================
+
+def replicate(frame, scale, seed=0, name_col='Name', id_col='PlayerId'):
+    """frame plus (scale - 1) jittered copies with distinct names and ids."""
+    if scale == 1:
+        return frame
+    rng = np.random.default_rng(seed)
+    copies = pd.concat([frame] * scale, ignore_index=True)
+    copy_no = np.repeat(np.arange(scale), len(frame))
+    numeric = [c for c in copies.columns if pd.api.types.is_float_dtype(copies[c]) and c != id_col]
+    noise = 1 + JITTER * rng.standard_normal((len(copies), len(numeric))) * (copy_no > 0)[:, None]
+    copies[numeric] = copies[numeric].to_numpy() * noise
+    suffix = pd.Series(copy_no).map(lambda k: f' {k}' if k else '')
+    for col in (name_col, 'NameASCII'):
+        if col in copies.columns:
+            copies[col] = copies[col].astype(str) + suffix.to_numpy()
+    if id_col in copies.columns:
+        copies[id_col] = copies[id_col].astype(str) + suffix.str.replace(' ', '-').to_numpy()
+    return copies
+
+
+def player_pool(scale):
+    """Batters/pitchers for board stages: the qualifying pool x scale, board columns only."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        batters, pitchers = dba.load_players(dba.TABLE_COLUMNS)
+    batters = batters[batters['PA'] >= dba.MIN_PA]
+    pitchers = pitchers[pitchers['IP'] >= dba.MIN_IP_RP]
+    return replicate(batters, scale, seed=1), replicate(pitchers, scale, seed=2)
+
+
+def league_table(teams, categories, seed=0):
+    """fantrax_data.csv-shaped standings; extra categories beyond the real 14 are X15, X16, ..."""
+    if (teams, categories) == (12, 14):
+        return pd.read_csv(os.path.join(ROOT, 'fantrax_data.csv'))
+    rng = np.random.default_rng(seed)
+    names = roto.CATEGORIES + [f'X{i}' for i in range(len(roto.CATEGORIES) + 1, categories + 1)]
+    names = names[:categories]
+    values = np.round(rng.normal(100, 15, (teams, len(names))), 1)
+    signed = pd.DataFrame(values * roto.direction(names))   # higher is better
+    return pd.DataFrame({
+        'Team': np.repeat([f'Team {t + 1}' for t in range(teams)], len(names)),
+        'Category': np.tile(names, teams),
+        'Value': values.ravel(),
+        'Rank': signed.rank(method='min', ascending=False).to_numpy(dtype=int).ravel(),
+        'Points': signed.rank(method='average').to_numpy().ravel(),
+    })
+
+# =============================================================================
+# STAGES
+# =============================================================================
+
+def setup_ingest(scale):
+    import match_players
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        batters, pitchers, blocked, rosters = match_players.load_sources()
+    batters = replicate(batters, scale, seed=1, name_col='Name')
+    pitchers = replicate(pitchers, scale, seed=2, name_col='Name')
+
+    def run():
+        merged, _ = match_players.merge_sources(batters.copy(), pitchers.copy(), blocked.copy(), rosters.copy())
+        return match_players.derive_columns(merged)
+    return run, len(batters) + len(pitchers)
+
+
+def setup_boards(scale, keys):
+    batters, pitchers = player_pool(scale)
+    return (lambda: dba.build_boards(batters, pitchers, keys)), len(batters) + len(pitchers)
+
+
+def setup_page(scale):
+    import generate_fbb_page
+
+    batters, pitchers = player_pool(scale)
+
+    def run():
+        boards = dba.build_boards(batters, pitchers, list(generate_fbb_page.STRATEGIES))
+        return generate_fbb_page.generate_html(generate_fbb_page.load_strategy_data(boards))
+    return run, len(batters) + len(pitchers)
+
+
+def setup_analyze(teams, categories):
+    workdir = tempfile.mkdtemp(prefix='bench_analyze_')
+    table = league_table(teams, categories)
+    table.to_csv(os.path.join(workdir, 'fantrax_data.csv'), index=False)
+    path = os.path.join(workdir, 'fantrax_data.csv')
+
+    def run():
+        analyze_fantasy.analyze(path)
+    return run, len(table)
+
+
+def setup(stage, size):
+    if stage == 'analyze':
+        teams, categories = (int(x) for x in size.split('x'))
+        return setup_analyze(teams, categories)
+    scale = int(size)
+    if stage == 'ingest':
+        return setup_ingest(scale)
+    if stage == 'page':
+        return setup_page(scale)
+    if stage == 'boards':
+        return setup_boards(scale, list(dba.STRATEGIES))
+    if stage.startswith('board:'):
+        return setup_boards(scale, [stage.split(':', 1)[1]])
+    raise ValueError(f"Unknown stage: {stage}")
+
+# =============================================================================
+# WORKER
+# =============================================================================
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure(stage, size):
+    """Run one stage in this process; returns the result record."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        run, rows = setup(stage, size)
+        times = []
+        while len(times) < REPEATS and sum(times) < REPEAT_BUDGET:
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+        rss = peak_rss_mb()
+
+        tracemalloc.start()
+        run()
+        alloc_peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+    return {'Stage': stage, 'Size': size, 'Rows': rows, 'Seconds': min(times),
+            'Peak_RSS_MB': rss, 'Alloc_Peak_MB': alloc_peak, 'Status': 'ok'}
+
+
+def run_worker(stage, size, timeout=TIMEOUT):
+    """Measure (stage, size) in a fresh interpreter."""
+    cmd = [sys.executable, os.path.abspath(__file__), '--worker', stage, str(size)]
+    try:
+        proc = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {'Stage': stage, 'Size': size, 'Status': f'timeout {timeout}s'}
+    if proc.returncode < 0:
+        return {'Stage': stage, 'Size': size, 'Status': f'killed by signal {-proc.returncode} (out of memory?)'}
+    if proc.returncode != 0:
+        error = (proc.stderr.strip().splitlines() or ['failed'])[-1]
+        return {'Stage': stage, 'Size': size, 'Status': error[:120]}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+# =============================================================================
+# RESULTS
+# =============================================================================
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ''
+
+
+def previous_results(path=RESULTS_PATH):
+    """Last recorded ok result per (Stage, Size)."""
+    if not os.path.exists(path):
+        return {}
+    previous = {}
+    for row in csv.DictReader(open(path, newline='')):
+        if row['Status'] == 'ok':
+            previous[(row['Stage'], row['Size'])] = row
+    return previous
+
+
+def append_results(records, path=RESULTS_PATH):
+    new_file = not os.path.exists(path)
+    with open(path, 'a', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+        if new_file:
+            writer.writeheader()
+        for record in records:
+            writer.writerow({field: record.get(field, '') for field in RESULT_FIELDS})
+
+
+def change(new, old):
+    if old is None or not old.get('Seconds'):
+        return ''
+    return f"{(new / float(old['Seconds']) - 1) * 100:>+7.1f}%"
+
+
+def print_record(record, previous):
+    if record['Status'] != 'ok':
+        print(f"{record['Stage']:<22} {record['Size']:>7}  {record['Status']}")
+        return
+    old = previous.get((record['Stage'], str(record['Size'])))
+    print(f"{record['Stage']:<22} {record['Size']:>7} {record['Rows']:>10,} {record['Seconds']:>9.3f} "
+          f"{record['Peak_RSS_MB']:>8.0f} {record['Alloc_Peak_MB']:>9.1f} {change(record['Seconds'], old):>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--stages', nargs='+',
+                        default=['ingest'] + [f'board:{k}' for k in dba.STRATEGIES] + ['boards', 'page', 'analyze'])
+    parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES)
+    parser.add_argument('--leagues', nargs='+', default=DEFAULT_LEAGUES, help='TEAMSxCATEGORIES for analyze')
+    parser.add_argument('--max-scale', type=int, default=None, help='override the per-stage scale caps')
+    parser.add_argument('--timeout', type=int, default=TIMEOUT, help='seconds per worker')
+    parser.add_argument('--no-save', action='store_true', help=f'do not append to {RESULTS_PATH}')
+    parser.add_argument('--worker', nargs=2, metavar=('STAGE', 'SIZE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(measure(*args.worker)))
+        return
+
+    previous = previous_results()
+    commit, stamp = git_commit(), datetime.now().isoformat(timespec='seconds')
+    print("\n" + "=" * 80)
+    print(f"PIPELINE BENCHMARK ({commit or 'no commit'})")
+    print("=" * 80)
+    print(f"{'Stage':<22} {'Size':>7} {'Rows':>10} {'Seconds':>9} {'RSS MB':>8} {'Alloc MB':>9} {'vs last':>8}")
+
+    records = []
+    for stage in args.stages:
+        sizes = args.leagues if stage == 'analyze' else args.scales
+        for size in sizes:
+            cap = args.max_scale or MAX_SCALE.get(stage)
+            if stage != 'analyze' and cap and int(size) > cap:
+                print(f"{stage:<22} {size:>7}  skipped (above {cap}x; raise with --max-scale)")
+                continue
+            record = run_worker(stage, size, args.timeout)
+            record.update({'Timestamp': stamp, 'Commit': commit})
+            print_record(record, previous)
+            records.append(record)
+
+    if not args.no_save:
+        append_results(records)
+        print(f"\nAppended {len(records)} results to {os.path.relpath(RESULTS_PATH, ROOT)}")
+
+
+if __name__ == '__main__':
+    main()
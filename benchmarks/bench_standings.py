@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Benchmark roto.league_points on many simulated leagues at once.
+
+First checks that league_points and league_ranks, tie-broken by the fantrax
+Rank column, reproduce fantrax_data.csv's Points and Rank exactly. Then
+times scoring 1, 100 and 10,000 leagues: the real category values plus
+noise, stacked as (leagues x teams x categories).
+
+Usage (from the repo root):
+    python benchmarks/bench_standings.py [leagues ...]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import roto  # noqa: E402
+
+DEFAULT_LEAGUES = [1, 100, 10_000]
+REPEATS = 3
+NOISE = 0.05           # relative sd of each simulated category value
+
+
+def main(argv):
+    counts = [int(a) for a in argv] or DEFAULT_LEAGUES
+
+    # Must reproduce the fantrax standings before we time it
+    teams, values, points, ranks = roto.load_league(ranks=True)
+    np.testing.assert_array_equal(roto.league_points(values, tiebreak=ranks), points)
+    np.testing.assert_array_equal(roto.league_ranks(values, tiebreak=ranks), ranks)
+
+    print("\n" + "=" * 60)
+    print(f"LEAGUE POINTS BENCHMARK ({len(teams)} teams x {len(roto.CATEGORIES)} categories)")
+    print("=" * 60)
+    print(f"{'Leagues':>8} {'Seconds':>10} {'us/league':>10}")
+
+    rng = np.random.default_rng(0)
+    for n in counts:
+        leagues = values * (1 + NOISE * rng.standard_normal((n,) + values.shape))
+        times = []
+        for _ in range(REPEATS):
+            start = time.perf_counter()
+            roto.league_points(leagues)
+            times.append(time.perf_counter() - start)
+        elapsed = min(times)
+        print(f"{n:>8,} {elapsed:>10.3f} {elapsed / n * 1e6:>10.1f}")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Incremental build of the player table, draft boards, page and analysis.
+
+The manual order (match_players.py, draft_board_analysis.py per strategy,
+generate_fbb_page.py) is modelled as a graph of stages:
+
+    table           match_players: source CSVs -> all_players.csv + cache
+    board:<key>     one draft_board_<key>.csv per strategy (needs table)
+    page            index.html from the board CSVs (needs every board)
+    standings       franchises.py: projected standings -> projected_standings.csv
+    analysis        analyze_fantasy.py report -> analysis_report.txt
+
+A stage's key hashes the content of its input files, the code it runs and
+the output hashes of the stages it depends on. Keys and output hashes are
+recorded in .fbb_build.json; a stage whose key matches and whose outputs are
+unchanged on disk is skipped. Because dependents hash upstream outputs, not
+upstream keys, a rebuild that reproduces identical outputs stops there.
+Ready stages run in parallel worker processes (the per-strategy boards are
+independent), with each stage's printed output in .fbb_build/<stage>.log.
+With --trace each worker writes its own fbb_trace.<pid>.json.
+
+Usage:
+    python build.py                     # bring everything up to date
+    python build.py board:balanced      # one target and what it needs
+    python build.py --dry-run           # show what would run
+    python build.py --force --jobs 2    # rebuild everything, two workers
+"""
+
+import argparse
+import contextlib
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import tracing
+
+STATE_PATH = '.fbb_build.json'
+LOG_DIR = '.fbb_build'
+STATE_VERSION = 1
+
+TABLE_INPUTS = [
+    'fangraphs-leaderboard-projections.csv',
+    'pitchers.csv',
+    'blocked_players.csv',
+    'rosters.csv',
+    'my_players.csv',
+]
+TABLE_CODE = ['match_players.py', 'player_identity.py', 'joins.py', 'player_cache.py']
+BOARD_INPUTS = ['fantrax_data.csv', 'eligibility.csv']
+BOARD_CODE = ['draft_board_analysis.py', 'positions.py', 'sgp.py', 'roto.py', 'player_cache.py']
+PAGE_CODE = ['generate_fbb_page.py', 'draft_board_analysis.py']
+STANDINGS_CODE = ['franchises.py', 'roto.py', 'player_cache.py']
+ANALYSIS_INPUTS = ['fantrax_data.csv']
+ANALYSIS_CODE = ['analyze_fantasy.py', 'bundles.py']
+
+
+# =============================================================================
+# STAGE FUNCTIONS (run in worker processes)
+# =============================================================================
+
+def run_table():
+    import match_players
+    match_players.main([])
+
+
+def run_board(key):
+    import draft_board_analysis
+    # The table stage owns the cache; parallel boards only read it
+    batters, pitchers = draft_board_analysis.load_players(draft_board_analysis.TABLE_COLUMNS, rebuild=False)
+    board = draft_board_analysis.build_boards(batters, pitchers, [key])[key]
+    print(f"Saved draft board to {draft_board_analysis.export_board(board, key)} ({len(board)} players)")
+
+
+def run_page(page_path):
+    import pandas as pd
+    import generate_fbb_page
+    boards = {key: pd.read_csv(info['file']) for key, info in generate_fbb_page.STRATEGIES.items()}
+    generate_fbb_page.write_page(boards, page_path)
+
+
+def run_standings():
+    import franchises
+    franchises.main(['--csv'])
+
+
+def run_analysis(report_path):
+    import analyze_fantasy
+    with open(report_path, 'w') as f, contextlib.redirect_stdout(f):
+        analyze_fantasy.analyze()
+
+
+def run_stage(name, func, args):
+    """Run one stage with its output captured to LOG_DIR/<name>.log."""
+    os.makedirs(LOG_DIR, exist_ok=True)
+    log_path = os.path.join(LOG_DIR, f"{name.replace(':', '_')}.log")
+    start = time.perf_counter()
+    with open(log_path, 'w') as log, contextlib.redirect_stdout(log):
+        with tracing.span(f'stage.{name}'):
+            globals()[func](*args)
+        # Pool workers never run atexit hooks; write this worker's spans now
+        # (write() names the file after the worker's pid)
+        tracing.write()
+    return time.perf_counter() - start
+
+# =============================================================================
+# GRAPH
+# =============================================================================
+
+def stage_graph(page_path):
+    """{name: stage} in dependency order; each stage lists inputs, code, deps and outputs."""
+    import generate_fbb_page
+    import player_cache
+    page_dir = os.path.dirname(page_path)
+    # The cache entry is a table output, so a missing one rebuilds the table
+    manifest = os.path.join(player_cache.CACHE_DIR, player_cache.cache_key(), 'manifest.json')
+
+    graph = {'table': {
+        'inputs': TABLE_INPUTS, 'code': TABLE_CODE, 'deps': [],
+        'outputs': ['all_players.csv', 'identity_report.csv', manifest],
+        'func': 'run_table', 'args': [],
+    }}
+    for key, info in generate_fbb_page.STRATEGIES.items():
+        graph[f'board:{key}'] = {
+            'inputs': BOARD_INPUTS, 'code': BOARD_CODE, 'deps': ['table'],
+            'outputs': [info['file']],
+            'func': 'run_board', 'args': [key],
+        }
+    graph['page'] = {
+        'inputs': [], 'code': PAGE_CODE, 'deps': [f'board:{key}' for key in generate_fbb_page.STRATEGIES],
+        'outputs': [page_path] + [os.path.join(page_dir, info['file'])
+                                  for info in generate_fbb_page.STRATEGIES.values()],
+        'func': 'run_page', 'args': [page_path],
+    }
+    graph['standings'] = {
+        'inputs': [], 'code': STANDINGS_CODE, 'deps': ['table'],
+        'outputs': ['projected_standings.csv'],
+        'func': 'run_standings', 'args': [],
+    }
+    graph['analysis'] = {
+        'inputs': ANALYSIS_INPUTS, 'code': ANALYSIS_CODE, 'deps': [],
+        'outputs': ['analysis_report.txt'],
+        'func': 'run_analysis', 'args': ['analysis_report.txt'],
+    }
+    return graph
+
+
+def required(graph, targets):
+    """Targets plus everything they depend on, in graph order."""
+    needed = set()
+    pending = list(targets)
+    while pending:
+        name = pending.pop()
+        if name not in needed:
+            needed.add(name)
+            pending.extend(graph[name]['deps'])
+    return [name for name in graph if name in needed]
+
+# =============================================================================
+# HASHING
+# =============================================================================
+
+def file_hash(path, _memo={}):
+    """sha256 of a file's content ('missing' if absent), memoised by mtime and size."""
+    if not os.path.exists(path):
+        return 'missing'
+    stat = os.stat(path)
+    memo_key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    if memo_key not in _memo:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        _memo[memo_key] = digest.hexdigest()
+    return _memo[memo_key]
+
+
+def stage_key(name, stage, state):
+    """Hash of the stage's definition, inputs, code and upstream outputs."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256(f'fbb-build-v{STATE_VERSION}:{name}:{stage["args"]}'.encode())
+    for path in stage['inputs']:
+        digest.update(f'{path}:{file_hash(path)}'.encode())
+    for path in stage['code']:
+        digest.update(f'{path}:{file_hash(os.path.join(here, path))}'.encode())
+    for dep in stage['deps']:
+        digest.update(f'{dep}:{json.dumps(state[dep]["outputs"], sort_keys=True)}'.encode())
+    return digest.hexdigest()[:16]
+
+
+def up_to_date(stage, key, record):
+    if record is None or record['key'] != key:
+        return False
+    return all(file_hash(path) == record['outputs'].get(path) for path in stage['outputs'])
+
+
+def load_state():
+    if os.path.exists(STATE_PATH):
+        with open(STATE_PATH) as f:
+            state = json.load(f)
+        if state.get('version') == STATE_VERSION:
+            return state['stages']
+    return {}
+
+
+def save_state(stages):
+    tmp = f'{STATE_PATH}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump({'version': STATE_VERSION, 'stages': stages}, f, indent=1, sort_keys=True)
+    os.replace(tmp, STATE_PATH)
+
+# =============================================================================
+# RUNNER
+# =============================================================================
+
+def build(graph, targets, jobs=None, force=False, dry_run=False):
+    """Bring targets up to date; returns {stage: 'skipped' | 'ran' | 'failed' | 'blocked'}."""
+    names = required(graph, targets)
+    state = load_state()
+    status = {}
+    running = {}
+    keys = {}
+
+    def ready():
+        return [name for name in names if name not in status and name not in running.values()
+                and all(status.get(dep) in ('skipped', 'ran') for dep in graph[name]['deps'])]
+
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+        while len(status) < len(names):
+            batch = ready()
+            for name in batch:
+                stage = graph[name]
+                key = stage_key(name, stage, state)
+                if not force and up_to_date(stage, key, state.get(name)):
+                    status[name] = 'skipped'
+                    print(f"  up to date  {name}")
+                elif dry_run:
+                    status[name] = 'ran'
+                    # Dependents of a stage that would run are out of date too
+                    state[name] = {'key': key, 'outputs': {path: f'pending:{key}' for path in stage['outputs']}}
+                    print(f"  would run   {name}")
+                else:
+                    running[pool.submit(run_stage, name, stage['func'], stage['args'])] = name
+                    keys[name] = key
+
+            if not running:
+                if batch:
+                    continue
+                # Whatever is left waits on a failed stage
+                for name in names:
+                    status.setdefault(name, 'blocked')
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    elapsed = future.result()
+                except Exception as e:
+                    status[name] = 'failed'
+                    print(f"  FAILED      {name}: {e!r} (see {LOG_DIR}/)")
+                    continue
+                stage = graph[name]
+                state[name] = {'key': keys.pop(name),
+                               'outputs': {path: file_hash(path) for path in stage['outputs']}}
+                status[name] = 'ran'
+                print(f"  built       {name} ({elapsed:.2f}s)")
+                save_state(state)
+
+    return status
+
+
+def main(argv=None):
+    import generate_fbb_page
+
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('targets', nargs='*', help='stages to build (default: all)')
+    parser.add_argument('--jobs', type=int, help='worker processes (default: CPU count)')
+    parser.add_argument('--force', action='store_true', help='rebuild even if up to date')
+    parser.add_argument('--dry-run', action='store_true', help='list stages that would run')
+    parser.add_argument('--page', default=generate_fbb_page.OUTPUT_PATH, help='index.html path')
+    args = parser.parse_args(tracing.enable_from_argv(sys.argv[1:] if argv is None else argv))
+
+    graph = stage_graph(os.path.abspath(args.page))
+    unknown = [t for t in args.targets if t not in graph]
+    if unknown:
+        print(f"Unknown stage: {', '.join(unknown)}")
+        print(f"Available stages: {', '.join(graph)}")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    status = build(graph, args.targets or list(graph), args.jobs, args.force, args.dry_run)
+    counts = {s: list(status.values()).count(s) for s in ('ran', 'skipped', 'failed', 'blocked')}
+    print(f"\n{counts['ran']} {'would run' if args.dry_run else 'built'}, {counts['skipped']} up to date"
+          + (f", {counts['failed']} failed, {counts['blocked']} blocked" if counts['failed'] else '')
+          + f" in {time.perf_counter() - start:.2f}s")
+    if counts['failed']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Category bundle search: every k-category subset of a standings table, scored
+in batches.
+
+A bundle is scored three ways from the teams x categories points table:
+
+    Score        best single-team total over the bundle (and that team)
+    Avg_Corr     mean pairwise correlation of the bundle's categories
+    Max_Points   sum of each category's best points (what a team winning
+                 every bundle category would earn)
+
+Subsets are enumerated in itertools.combinations order, BATCH at a time, as
+rows of a 0/1 membership matrix M (bundles x categories). Then every score is
+a matrix product: team totals are M @ points.T, the pairwise correlation sum
+is (sum((M @ corr) * M) - sum(M * diag)) / 2 and Max_Points is M @ colmax.
+Only the best `top` bundles seen so far are kept between batches, so memory
+depends on the batch size, not on C(categories, k): 20 categories at k=10 is
+184,756 bundles. Ties keep enumeration order, as a stable sort would.
+
+Missing cells count as 0 points. A NaN correlation (a category with no
+variance, e.g. every team tied early in the season) makes Avg_Corr NaN only
+for the bundles that contain it, and NaN keys sort last.
+
+Usage:
+    python bundles.py                        # top 10 7-category bundles by best team score
+    python bundles.py --by corr --top 5      # least correlated bundles
+    python bundles.py --k 5 --by max_points
+"""
+
+import argparse
+import math
+import time
+from itertools import chain, combinations, islice
+
+import numpy as np
+import pandas as pd
+
+BATCH = 20_000
+ORDERS = {
+    'score': ('Score', False),        # highest best-team total first
+    'corr': ('Avg_Corr', True),       # least correlated first
+    'max_points': ('Max_Points', False),
+}
+COLUMNS = ['Categories', 'Team', 'Score', 'Avg_Corr', 'Max_Points']
+
+
+def membership_batches(n, k, batch=BATCH):
+    """(batch x n) 0/1 float arrays covering combinations(range(n), k) in order."""
+    combos = combinations(range(n), k)
+    while True:
+        idx = np.fromiter(chain.from_iterable(islice(combos, batch)), dtype=np.intp)
+        if not len(idx):
+            return
+        rows = len(idx) // k
+        m = np.zeros((rows, n))
+        m[np.repeat(np.arange(rows), k), idx] = 1.0
+        yield m
+
+
+def _pair_sums(m, matrix):
+    """Sum of matrix[i, j] over the unordered category pairs in each row of m."""
+    return (((m @ matrix) * m).sum(axis=1) - m @ np.diag(matrix)) / 2
+
+
+def score_bundles(m, points, corr, colmax):
+    """Best team index, best score, average correlation and max points per row of m."""
+    totals = m @ np.nan_to_num(points).T        # bundles x teams
+    team = totals.argmax(axis=1)
+    k = m[0].sum() if len(m) else 0
+    pairs = k * (k - 1) / 2
+    # 0 * NaN is NaN, so zero the NaNs and count them per bundle instead
+    missing = np.isnan(corr)
+    pair_sum = _pair_sums(m, np.where(missing, 0.0, corr))
+    avg_corr = np.full(len(m), np.nan)
+    if pairs:
+        ok = _pair_sums(m, missing.astype(float)) == 0
+        avg_corr[ok] = pair_sum[ok] / pairs
+    return team, totals[np.arange(len(m)), team], avg_corr, m @ colmax
+
+
+def _best(keys, order, top):
+    """Positions of the top smallest keys (NaN last), ties broken by order."""
+    keys = np.nan_to_num(keys, nan=np.inf)
+    if len(keys) > top:
+        cut = np.partition(keys, top - 1)[top - 1]
+        keep = np.flatnonzero(keys <= cut)
+    else:
+        keep = np.arange(len(keys))
+    return keep[np.lexsort((order[keep], keys[keep]))][:top]
+
+
+def search(points, k, top=10, by='score', corr=None, batch=BATCH):
+    """Top bundles of k categories from a teams x categories points DataFrame.
+
+    by is 'score', 'corr' or 'max_points' (see ORDERS); corr defaults to
+    points.corr(). Returns a DataFrame of COLUMNS, best first, with each
+    bundle's categories as a tuple in column order.
+    """
+    if by not in ORDERS:
+        raise ValueError(f"Unknown bundle order {by!r}; use one of {', '.join(ORDERS)}")
+    categories = list(points.columns)
+    teams = list(points.index)
+    if corr is None:
+        corr = points.corr()
+    p = points.to_numpy(dtype=float)
+    c = corr.loc[categories, categories].to_numpy(dtype=float)
+    colmax = np.nan_to_num(np.fmax.reduce(p, axis=0))
+    column, ascending = ORDERS[by]
+    sign = 1.0 if ascending else -1.0
+
+    kept_m = np.zeros((0, len(categories)))
+    kept_key = np.zeros(0)
+    kept_order = np.zeros(0, dtype=np.int64)
+    seen = 0
+    for m in membership_batches(len(categories), k, batch):
+        metrics = dict(zip(COLUMNS[2:], score_bundles(m, p, c, colmax)[1:]))
+        kept_m = np.concatenate([kept_m, m])
+        kept_key = np.concatenate([kept_key, sign * metrics[column]])
+        kept_order = np.concatenate([kept_order, seen + np.arange(len(m))])
+        seen += len(m)
+        best = _best(kept_key, kept_order, top)
+        kept_m, kept_key, kept_order = kept_m[best], kept_key[best], kept_order[best]
+
+    team, score, avg_corr, max_points = score_bundles(kept_m, p, c, colmax)
+    return pd.DataFrame({
+        'Categories': [tuple(categories[j] for j in np.flatnonzero(row)) for row in kept_m],
+        'Team': [teams[t] for t in team],
+        'Score': score,
+        'Avg_Corr': avg_corr,
+        'Max_Points': max_points,
+    }, columns=COLUMNS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Search every k-category bundle of the standings')
+    parser.add_argument('--path', default='fantrax_data.csv', help='Fantrax standings export')
+    parser.add_argument('--k', type=int, default=7, help='categories per bundle (default: 7)')
+    parser.add_argument('--top', type=int, default=10, help='bundles to show (default: 10)')
+    parser.add_argument('--by', choices=list(ORDERS), default='score', help='ranking (default: score)')
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.path)
+    points = df.pivot_table(index='Team', columns='Category', values='Points', aggfunc='first')
+    points = points[df['Category'].unique()]
+    if not 1 <= args.k <= points.shape[1]:
+        parser.error(f'--k must be between 1 and {points.shape[1]}')
+
+    start = time.perf_counter()
+    result = search(points, args.k, args.top, args.by)
+    elapsed = time.perf_counter() - start
+
+    print("\n" + "=" * 80)
+    print(f"TOP {args.top} {args.k}-CATEGORY BUNDLES BY {ORDERS[args.by][0].upper()}")
+    print("=" * 80)
+    print(f"Scored {math.comb(points.shape[1], args.k):,} bundles in {elapsed * 1000:.1f} ms\n")
+    for i, row in enumerate(result.itertuples(index=False), 1):
+        print(f"{i:>3}. {row.Score:>6.1f} pts ({row.Team}), avg r {row.Avg_Corr:>6.3f}, "
+              f"max {row.Max_Points:>6.1f}  {', '.join(row.Categories)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Salary-cap roster optimizer: the best roster a strategy board can buy.
+
+Chooses exactly ROSTER_BATTERS batters and ROSTER_PITCHERS pitchers from a
+draft board to maximize total Strategy_Score, subject to a cap in each of
+2026, 2027 and 2028 on the players' Salary_20xx cap hits. Players without a
+2026 salary (free agents, YP and minors contracts) cost --fa-salary for
+--fa-years seasons.
+
+The solver is an exact branch and bound. Its bound is the Lagrangian
+relaxation of the three cap constraints: with multipliers lambda the problem
+splits into "take the best players by Strategy_Score - lambda . salary",
+and lambda is tuned once at the root by subgradient descent. Players are
+branched in that reduced-score order, so every node's bound is two prefix
+sums and the search visits few nodes. A heap keeps the top-k rosters.
+
+CapOptimizer.remove() / add() re-solve incrementally: rosters from the last
+solve that are still feasible seed the heap, so the new search starts with
+a tight incumbent (or skips the search when a removed player was in none of
+them).
+
+Usage:
+    python cap_optimizer.py                          # volume_power, $150M cap each year
+    python cap_optimizer.py balanced --cap 120 110 90 --k 10
+    python cap_optimizer.py speed_rates --fa-salary 2 --exclude "Pete Alonso" --exclude "Matt Olson"
+"""
+
+import argparse
+import heapq
+import sys
+import time
+
+import numpy as np
+
+import draft_board_analysis as dba
+import roto
+
+SALARY_YEARS = ['Salary_2026', 'Salary_2027', 'Salary_2028']
+DEFAULT_CAP = 150.0    # $M per season
+FA_SALARY = 1.0        # $M cap hit for players without a contract
+FA_YEARS = 1
+SUBGRADIENT_STEPS = 200
+EPS = 1e-9
+
+
+def salary_matrix(board, fa_salary=FA_SALARY, fa_years=FA_YEARS):
+    """players x SALARY_YEARS cap hits in $M; uncontracted players cost fa_salary."""
+    salaries = board[SALARY_YEARS].to_numpy(dtype=float) / 1_000_000
+    uncontracted = np.isnan(salaries[:, 0])
+    salaries = np.nan_to_num(salaries)
+    fa_cost = np.where(np.arange(len(SALARY_YEARS)) < fa_years, fa_salary, 0.0)
+    salaries[uncontracted] = fa_cost
+    return salaries
+
+
+def lagrangian_bound(scores, salaries, is_batter, caps, n_batters, n_pitchers, lam):
+    """L(lambda) and the selection attaining it (best reduced scores per side)."""
+    reduced = scores - salaries @ lam
+    chosen = np.zeros(len(scores), dtype=bool)
+    for side, need in ((is_batter, n_batters), (~is_batter, n_pitchers)):
+        rows = np.flatnonzero(side)
+        if len(rows) < need:
+            return -np.inf, chosen
+        if need:
+            chosen[rows[np.argpartition(-reduced[rows], need - 1)[:need]]] = True
+    return reduced[chosen].sum() + lam @ caps, chosen
+
+
+def tune_multipliers(scores, salaries, is_batter, caps, n_batters, n_pitchers, lam=None,
+                     steps=SUBGRADIENT_STEPS):
+    """Subgradient descent on L(lambda); returns the best (lowest) bound's lambda."""
+    lam = np.zeros(len(caps)) if lam is None else np.array(lam, dtype=float)
+    best_lam, best = lam.copy(), np.inf
+    scale = max(np.abs(scores).max(), 1.0) / max(caps.max(), 1.0)
+    for step in range(steps):
+        bound, chosen = lagrangian_bound(scores, salaries, is_batter, caps, n_batters, n_pitchers, lam)
+        if bound < best:
+            best, best_lam = bound, lam.copy()
+        slack = caps - salaries[chosen].sum(axis=0)
+        if np.all(slack >= 0) and np.all(lam * slack <= EPS):
+            break  # complementary slackness: the relaxation is exact
+        lam = np.maximum(lam - scale / np.sqrt(step + 1) * slack / max(np.linalg.norm(slack), EPS), 0)
+    return best_lam
+
+
+class CapOptimizer:
+    """Top-k salary-cap rosters over one draft board, with incremental re-solves."""
+
+    def __init__(self, board, caps=(DEFAULT_CAP,) * 3, fa_salary=FA_SALARY, fa_years=FA_YEARS,
+                 n_batters=roto.ROSTER_BATTERS, n_pitchers=roto.ROSTER_PITCHERS):
+        self.board = board.reset_index(drop=True)
+        self.scores = self.board['Strategy_Score'].to_numpy(dtype=float)
+        self.salaries = salary_matrix(self.board, fa_salary, fa_years)
+        self.is_batter = (self.board['Player_Type'] == 'Batter').to_numpy()
+        self.caps = np.broadcast_to(np.asarray(caps, dtype=float), (len(SALARY_YEARS),)).copy()
+        self.n_batters, self.n_pitchers = n_batters, n_pitchers
+        self.active = np.isfinite(self.scores)
+        self.lam = None
+        self.solutions = []   # [(value, rows)] best first
+        self.nodes = 0
+
+    # -- search --------------------------------------------------------------
+
+    def _prepare(self):
+        rows = np.flatnonzero(self.active)
+        self.lam = tune_multipliers(self.scores[rows], self.salaries[rows], self.is_batter[rows],
+                                    self.caps, self.n_batters, self.n_pitchers, self.lam)
+        reduced = self.scores[rows] - self.salaries[rows] @ self.lam
+        order = rows[np.argsort(-reduced, kind='stable')]
+        self.order = order
+        self.order_reduced = self.scores[order] - self.salaries[order] @ self.lam
+        self.order_batter = self.is_batter[order]
+
+        # Per side: prefix sums of reduced scores in branching order, and for
+        # each depth the index (into that side's list) of the next such player
+        self.prefix, self.next_at = {}, {}
+        for side, mask in ((True, self.order_batter), (False, ~self.order_batter)):
+            self.prefix[side] = np.concatenate([[0.0], np.cumsum(self.order_reduced[mask])])
+            self.next_at[side] = np.concatenate([np.cumsum(mask[::-1])[::-1], [0]])
+            self.next_at[side] = int(mask.sum()) - self.next_at[side]
+
+        # Cheapest possible cap hits of the remaining players, per year
+        self.suffix_min = np.minimum.accumulate(self.salaries[order][::-1], axis=0)[::-1]
+
+    def _bound(self, depth, need_b, need_p, reduced_value):
+        total = reduced_value + self.lam @ self.caps
+        for side, need in ((True, need_b), (False, need_p)):
+            start = self.next_at[side][depth]
+            if start + need > len(self.prefix[side]) - 1:
+                return -np.inf
+            total += self.prefix[side][start + need] - self.prefix[side][start]
+        return total
+
+    def _search(self, depth, need_b, need_p, spent, value, reduced_value, chosen):
+        self.nodes += 1
+        if need_b == 0 and need_p == 0:
+            self._offer(value, chosen)
+            return
+        if len(self.heap) == self.k and self._bound(depth, need_b, need_p, reduced_value) <= self.heap[0][0] + EPS:
+            return
+        n = len(self.order)
+        # Skip players whose side is already full
+        while depth < n and ((self.order_batter[depth] and need_b == 0)
+                             or (not self.order_batter[depth] and need_p == 0)):
+            depth += 1
+        if depth >= n:
+            return
+        if np.any(spent + (need_b + need_p) * self.suffix_min[depth] > self.caps + EPS):
+            return
+
+        row = self.order[depth]
+        cost = spent + self.salaries[row]
+        if np.all(cost <= self.caps + EPS):
+            chosen.append(row)
+            batter = self.order_batter[depth]
+            self._search(depth + 1, need_b - batter, need_p - (not batter), cost,
+                         value + self.scores[row], reduced_value + self.order_reduced[depth], chosen)
+            chosen.pop()
+        self._search(depth + 1, need_b, need_p, spent, value, reduced_value, chosen)
+
+    def _offer(self, value, rows):
+        entry = (value, tuple(sorted(rows)))
+        if entry[1] in self.seen:
+            return
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, entry)
+        elif value > self.heap[0][0]:
+            self.seen.discard(heapq.heapreplace(self.heap, entry)[1])
+        else:
+            return
+        self.seen.add(entry[1])
+
+    def _feasible(self, rows):
+        rows = np.asarray(rows)
+        return (self.active[rows].all()
+                and self.is_batter[rows].sum() == self.n_batters
+                and (~self.is_batter[rows]).sum() == self.n_pitchers
+                and np.all(self.salaries[rows].sum(axis=0) <= self.caps + EPS))
+
+    def solve(self, k=5, seeds=()):
+        """Top-k rosters as [(total_score, rows)], best first; rows index self.board."""
+        self.k = k
+        self._prepare()
+        self.heap, self.seen, self.nodes = [], set(), 0
+        for value, rows in seeds:
+            if self._feasible(rows):
+                self._offer(value, list(rows))
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(limit, 2 * len(self.order) + 100))
+        try:
+            self._search(0, self.n_batters, self.n_pitchers, np.zeros(len(self.caps)), 0.0, 0.0, [])
+        finally:
+            sys.setrecursionlimit(limit)
+        self.solutions = sorted(self.heap, reverse=True)
+        return self.solutions
+
+    # -- incremental updates --------------------------------------------------
+
+    def remove(self, row):
+        """Take a player out of the pool and re-solve (skipped if the player was in no top-k roster)."""
+        self.active[row] = False
+        if not any(row in rows for _, rows in self.solutions):
+            return self.solutions
+        return self.solve(self.k, seeds=self.solutions)
+
+    def add(self, row):
+        """Put a player (back) in the pool and re-solve from the current rosters."""
+        self.active[row] = np.isfinite(self.scores[row])
+        return self.solve(self.k, seeds=self.solutions)
+
+    def find(self, name):
+        rows = np.flatnonzero(self.board['Name'].to_numpy() == name)
+        if not len(rows):
+            raise KeyError(f"{name} is not on the board")
+        return rows[0]
+
+# =============================================================================
+# REPORT
+# =============================================================================
+
+def print_roster(optimizer, value, rows):
+    board = optimizer.board
+    rows = sorted(rows, key=lambda r: (not optimizer.is_batter[r], -optimizer.scores[r]))
+    print(f"{'Name':<25} {'Pos':<7} {'Score':>6} " + ' '.join(f"{y[-4:]:>6}" for y in SALARY_YEARS)
+          + "  Rostered By")
+    for row in rows:
+        rostered = board.at[row, 'Rostered_By']
+        print(f"{board.at[row, 'Name']:<25} {board.at[row, 'Position']:<7} {optimizer.scores[row]:>6.2f} "
+              + ' '.join(f"{s:>6.1f}" for s in optimizer.salaries[row])
+              + f"  {rostered if isinstance(rostered, str) else 'FA'}")
+    spent = optimizer.salaries[list(rows)].sum(axis=0)
+    print(f"{'TOTAL':<25} {'':<7} {value:>6.2f} " + ' '.join(f"{s:>6.1f}" for s in spent))
+    print(f"{'CAP':<25} {'':<7} {'':>6} " + ' '.join(f"{c:>6.1f}" for c in optimizer.caps))
+
+
+def print_alternatives(optimizer, solutions):
+    best_value, best_rows = solutions[0]
+    names = optimizer.board['Name']
+    print(f"\n{'#':>2} {'Score':>7} {'Gap':>6}  Changes vs optimal")
+    for i, (value, rows) in enumerate(solutions, 1):
+        out = [names[r] for r in best_rows if r not in rows]
+        into = [names[r] for r in rows if r not in best_rows]
+        change = f"-{', -'.join(out)} / +{', +'.join(into)}" if out else 'optimal'
+        print(f"{i:>2} {value:>7.2f} {value - best_value:>6.2f}  {change}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('strategy', nargs='?', default='volume_power')
+    parser.add_argument('--cap', type=float, nargs='+', default=[DEFAULT_CAP],
+                        help='cap in $M: one value for every season, or 2026 2027 2028')
+    parser.add_argument('--k', type=int, default=5, help='number of rosters to return')
+    parser.add_argument('--fa-salary', type=float, default=FA_SALARY)
+    parser.add_argument('--fa-years', type=int, default=FA_YEARS)
+    parser.add_argument('--exclude', action='append', default=[], help='player name to leave out')
+    args = parser.parse_args()
+
+    if args.strategy not in dba.STRATEGIES:
+        print(f"Unknown strategy: {args.strategy}")
+        print(f"Available: {', '.join(dba.STRATEGIES)}")
+        sys.exit(1)
+    if len(args.cap) not in (1, len(SALARY_YEARS)):
+        print(f"--cap takes 1 or {len(SALARY_YEARS)} values")
+        sys.exit(1)
+
+    batters, pitchers = dba.load_players()
+    board = dba.build_boards(batters, pitchers, [args.strategy])[args.strategy]
+    optimizer = CapOptimizer(board, args.cap, args.fa_salary, args.fa_years)
+    for name in args.exclude:
+        optimizer.active[optimizer.find(name)] = False
+
+    start = time.perf_counter()
+    solutions = optimizer.solve(args.k)
+    elapsed = time.perf_counter() - start
+    if not solutions:
+        print("No roster fits under the cap")
+        sys.exit(1)
+
+    print("\n" + "=" * 80)
+    print(f"OPTIMAL ROSTER: {dba.STRATEGIES[args.strategy]['name']} "
+          f"({optimizer.n_batters} batters + {optimizer.n_pitchers} pitchers)")
+    print("=" * 80)
+    print_roster(optimizer, *solutions[0])
+    print_alternatives(optimizer, solutions)
+    print(f"\nSolved {len(optimizer.order)} players, top {args.k}, in {elapsed:.3f}s "
+          f"({optimizer.nodes:,} nodes)")
+
+    # Incremental re-solve: the best player on the optimal roster is taken
+    best_row = max(solutions[0][1], key=lambda r: optimizer.scores[r])
+    start = time.perf_counter()
+    resolved = optimizer.remove(best_row)
+    print(f"Re-solve without {optimizer.board.at[best_row, 'Name']}: {resolved[0][0]:.2f} "
+          f"in {time.perf_counter() - start:.3f}s ({optimizer.nodes:,} nodes)")
+    start = time.perf_counter()
+    optimizer.add(best_row)
+    print(f"Re-solve with the player back: {optimizer.solutions[0][0]:.2f} "
+          f"in {time.perf_counter() - start:.3f}s ({optimizer.nodes:,} nodes)")
+
+
+if __name__ == '__main__':
+    main()
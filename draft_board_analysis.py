@@ -8,12 +8,25 @@ Strategies based on Fantrax league analysis:
 2. power_rp: HR, RBI, SLG + SV, HLD, ERA, WHIP (punt SB, QS)
 3. speed_rates: SB, AVG, OBP + ERA, WHIP, K (punt HR, QS)
 4. balanced: All categories weighted equally
+
+Usage:
+    python draft_board_analysis.py [strategy ...]      # default: volume_power
+    python draft_board_analysis.py --all               # every strategy in one pass
+    python draft_board_analysis.py --sgp [...]         # score SGP instead of z-scores
+    python draft_board_analysis.py --positional [...]  # rank and tier on score above replacement
 """
 
 import pandas as pd
 import numpy as np
+import os
 import sys
 
+import player_cache
+import positions
+import roto
+import sgp
+import tracing
+
 # =============================================================================
 # STRATEGY DEFINITIONS
 # =============================================================================
@@ -82,66 +95,92 @@ STRATEGIES = {
 }
 
 # =============================================================================
-# SELECT STRATEGY
+# SCORING CONFIGURATION
 # =============================================================================
 
-# Default strategy or get from command line
-if len(sys.argv) > 1:
-    STRATEGY_KEY = sys.argv[1]
-else:
-    STRATEGY_KEY = 'volume_power'
+BATTER_CATEGORIES = ['z_HR', 'z_R', 'z_RBI', 'z_SB', 'z_AVG', 'z_OBP', 'z_SLG']
+PITCHER_CATEGORIES = ['z_QS', 'z_K', 'z_ERA', 'z_WHIP', 'z_SV', 'z_HLD']
 
-if STRATEGY_KEY not in STRATEGIES:
-    print(f"Unknown strategy: {STRATEGY_KEY}")
-    print(f"Available strategies: {', '.join(STRATEGIES.keys())}")
-    sys.exit(1)
+# Category valuations: z-scores within the pool, or league standings gain
+# points (sgp_* columns, see sgp.py). Strategy weights apply to either.
+VALUATIONS = ['z', 'sgp']
 
-STRATEGY = STRATEGIES[STRATEGY_KEY]
-BATTER_WEIGHTS = STRATEGY['batter']
-PITCHER_WEIGHTS = STRATEGY['pitcher']
+MIN_PA = 400  # Minimum plate appearances for batters
+MIN_IP = 100  # Minimum innings pitched for pitchers
+
+# For reliever-focused strategies, use lower IP threshold to include actual relievers
+RELIEVER_STRATEGIES = ['power_rp', 'elite_bullpen']
+MIN_IP_SP = 100  # Starters still need 100 IP
+MIN_IP_RP = 40   # Relievers need 40 IP (about 1 IP every 4 games)
+
+OUTPUT_COLS = [
+    'Rank', 'Name', 'Team', 'Player_Type', 'Position',
+    # Salary
+    'Salary_2026_M', 'Salary_2027_M', 'Salary_2028_M', 'Dollar_Per_Score', 'Rostered_By',
+    # Batter stats
+    'HR', 'R', 'RBI', 'SB', 'AVG', 'OBP', 'SLG',
+    # Pitcher stats
+    'W', 'QS', 'SO', 'ERA', 'WHIP', 'IP', 'SV', 'HLD',
+    # Scores and value
+    'Strategy_Score', 'Replacement', 'Score_Above_Replacement', 'FPTS', 'WAR',
+    # Z-scores
+    'z_HR', 'z_R', 'z_RBI', 'z_QS', 'z_K', 'z_ERA', 'z_WHIP',
+    # SGP (--sgp boards)
+    'sgp_HR', 'sgp_R', 'sgp_RBI', 'sgp_QS', 'sgp_K', 'sgp_ERA', 'sgp_WHIP',
+    # Block info
+    'Block_Type', 'Blocking_Franchise',
+    # Tier
+    'Tier'
+]
 
-print(f"Strategy: {STRATEGY['name']}")
-print(f"{STRATEGY['description']}")
+# Player-table columns the boards read: exports, valuation inputs (z-score
+# and SGP components), eligibility and identity keys
+TABLE_COLUMNS = list(dict.fromkeys(OUTPUT_COLS + roto.BATTING_COMPONENTS + roto.PITCHING_COMPONENTS + [
+    'PlayerId', 'MLBAMID', 'NameASCII', 'GS', 'ADP', 'Salary_2026', 'Salary_2027', 'Salary_2028',
+]))
 
 # =============================================================================
 # LOAD DATA
 # =============================================================================
 
-print("Loading data...")
-df = pd.read_csv('all_players.csv')
-
-# Split into batters and pitchers
-batters = df[df['Player_Type'] == 'Batter'].copy()
-pitchers = df[df['Player_Type'] == 'Pitcher'].copy()
-
-print(f"Total players: {len(df)} ({len(batters)} batters + {len(pitchers)} pitchers)")
+def load_players(columns=None, rebuild=True):
+    """Load the master player table and split it into batters and pitchers.
+
+    columns limits the load (TABLE_COLUMNS is enough for boards). The table
+    lists batters before pitchers, so the split is two row slices that share
+    the cached columns instead of two boolean-mask copies. rebuild is passed
+    to player_cache.load_player_table.
+    """
+    df = player_cache.load_player_table(columns, rebuild=rebuild)
+    is_batter = (df['Player_Type'] == 'Batter').to_numpy()
+    n = int(is_batter.sum())
+    if is_batter[:n].all():
+        return df.iloc[:n], df.iloc[n:]
+    return df[is_batter], df[~is_batter]
 
 # =============================================================================
 # FILTER TO MEANINGFUL PLAYING TIME
 # =============================================================================
 
-MIN_PA = 400  # Minimum plate appearances for batters
-
-# For reliever-focused strategies, use lower IP threshold to include actual relievers
-RELIEVER_STRATEGIES = ['power_rp', 'elite_bullpen']
-if STRATEGY_KEY in RELIEVER_STRATEGIES:
-    MIN_IP_SP = 100  # Starters still need 100 IP
-    MIN_IP_RP = 40   # Relievers need 40 IP (about 1 IP every 4 games)
-    print(f"Reliever-focused strategy: Using split IP thresholds (SP>={MIN_IP_SP}, RP>={MIN_IP_RP})")
-
-    # Classify pitchers by GS ratio
-    pitchers['is_SP'] = pitchers['GS'].fillna(0) > 5
-    sp = pitchers[(pitchers['is_SP']) & (pitchers['IP'] >= MIN_IP_SP)].copy()
-    rp = pitchers[(~pitchers['is_SP']) & (pitchers['IP'] >= MIN_IP_RP)].copy()
-    pitchers = pd.concat([sp, rp], ignore_index=True)
-    pitchers = pitchers.drop(columns=['is_SP'])
-else:
-    MIN_IP = 100  # Minimum innings pitched for pitchers
-    pitchers = pitchers[pitchers['IP'] >= MIN_IP].copy()
-
-batters = batters[batters['PA'] >= MIN_PA].copy()
+@tracing.traced('filter')
+def filter_playing_time(batters, pitchers, reliever_split=False):
+    """Drop players below the PA/IP thresholds.
+
+    With reliever_split, starters (GS > 5) keep the 100 IP bar and relievers
+    only need 40 IP, so actual closers and setup men make the pool. The
+    pools are small, so they are copied: that also consolidates the cache's
+    one-block-per-column layout before z-score columns are added.
+    """
+    if reliever_split:
+        is_sp = pitchers['GS'].fillna(0) > 5
+        sp = pitchers[is_sp & (pitchers['IP'] >= MIN_IP_SP)]
+        rp = pitchers[~is_sp & (pitchers['IP'] >= MIN_IP_RP)]
+        pitchers = pd.concat([sp, rp], ignore_index=True).copy()
+    else:
+        pitchers = pitchers[pitchers['IP'] >= MIN_IP].copy()
 
-print(f"After filtering: {len(batters)} batters + {len(pitchers)} pitchers")
+    batters = batters[batters['PA'] >= MIN_PA].copy()
+    return batters, pitchers
 
 # =============================================================================
 # CALCULATE Z-SCORES
@@ -155,255 +194,317 @@ def calc_zscore(series):
         return pd.Series(0, index=series.index)
     return (series - mean) / std
 
-print("Calculating z-scores...")
-
-# Batter z-scores (all categories)
-batters['z_HR'] = calc_zscore(batters['HR'])
-batters['z_R'] = calc_zscore(batters['R'])
-batters['z_RBI'] = calc_zscore(batters['RBI'])
-batters['z_SB'] = calc_zscore(batters['SB'])
-batters['z_AVG'] = calc_zscore(batters['AVG'])
-batters['z_OBP'] = calc_zscore(batters['OBP'])
-batters['z_SLG'] = calc_zscore(batters['SLG'])
 
-# Pitcher z-scores (all categories)
-pitchers['z_QS'] = calc_zscore(pitchers['QS'])
-pitchers['z_K'] = calc_zscore(pitchers['SO'])  # SO column is K
-pitchers['z_SV'] = calc_zscore(pitchers['SV'].fillna(0))
-pitchers['z_HLD'] = calc_zscore(pitchers['HLD'].fillna(0))
-
-# For ERA and WHIP, lower is better - invert the z-score
-pitchers['z_ERA'] = -calc_zscore(pitchers['ERA'])
-pitchers['z_WHIP'] = -calc_zscore(pitchers['WHIP'])
+@tracing.traced('zscore')
+def add_zscores(batters, pitchers):
+    """Add z_* category columns to the filtered batter and pitcher pools."""
+    # Batter z-scores (all categories)
+    batters['z_HR'] = calc_zscore(batters['HR'])
+    batters['z_R'] = calc_zscore(batters['R'])
+    batters['z_RBI'] = calc_zscore(batters['RBI'])
+    batters['z_SB'] = calc_zscore(batters['SB'])
+    batters['z_AVG'] = calc_zscore(batters['AVG'])
+    batters['z_OBP'] = calc_zscore(batters['OBP'])
+    batters['z_SLG'] = calc_zscore(batters['SLG'])
+
+    # Pitcher z-scores (all categories)
+    pitchers['z_QS'] = calc_zscore(pitchers['QS'])
+    pitchers['z_K'] = calc_zscore(pitchers['SO'])  # SO column is K
+    pitchers['z_SV'] = calc_zscore(pitchers['SV'].fillna(0))
+    pitchers['z_HLD'] = calc_zscore(pitchers['HLD'].fillna(0))
+
+    # For ERA and WHIP, lower is better - invert the z-score
+    pitchers['z_ERA'] = -calc_zscore(pitchers['ERA'])
+    pitchers['z_WHIP'] = -calc_zscore(pitchers['WHIP'])
+    return batters, pitchers
+
+
+def category_columns(categories, valuation='z'):
+    """Pool columns holding the valuation of z_* weight categories."""
+    if valuation == 'sgp':
+        return [col.replace('z_', 'sgp_', 1) for col in categories]
+    return categories
 
 # =============================================================================
 # CALCULATE STRATEGY SCORES
 # =============================================================================
 
-print("Calculating Strategy Scores...")
-
-# Batter Strategy Score - apply weights from strategy
-batters['Strategy_Score'] = sum(
-    BATTER_WEIGHTS.get(col, 0) * batters[col]
-    for col in ['z_HR', 'z_R', 'z_RBI', 'z_SB', 'z_AVG', 'z_OBP', 'z_SLG']
-)
+def weight_matrix(strategy_keys, side, categories):
+    """Stack strategy weights into a categories x strategies matrix.
 
-# Pitcher Strategy Score - apply weights from strategy
-pitchers['Strategy_Score'] = sum(
-    PITCHER_WEIGHTS.get(col, 0) * pitchers[col]
-    for col in ['z_QS', 'z_K', 'z_ERA', 'z_WHIP', 'z_SV', 'z_HLD']
-)
+    side is 'batter' or 'pitcher'; categories missing from a strategy get 0.
+    """
+    weights = np.zeros((len(categories), len(strategy_keys)))
+    for j, key in enumerate(strategy_keys):
+        side_weights = STRATEGIES[key][side]
+        for i, col in enumerate(categories):
+            weights[i, j] = side_weights.get(col, 0)
+    return weights
 
-# =============================================================================
-# FILTER BLOCKED PLAYERS
-# =============================================================================
 
-print("Filtering blocked players...")
+@tracing.traced('scoring')
+def score_matrix(z, weights):
+    """Players x categories z-scores times categories x strategies weights.
 
-# Exclude fully blocked players
-batters_available = batters[batters['Block_Type'] != 'Full'].copy()
-pitchers_available = pitchers[pitchers['Block_Type'] != 'Full'].copy()
-
-print(f"After removing full blocks: {len(batters_available)} batters, {len(pitchers_available)} pitchers")
-
-# Flag partial blocks
-batters_available['Is_Partial_Block'] = batters_available['Block_Type'] == 'Partial'
-pitchers_available['Is_Partial_Block'] = pitchers_available['Block_Type'] == 'Partial'
+    The product is accumulated one category at a time (in category order) so
+    every column matches the single-strategy weighted sum bit for bit.
+    """
+    scores = np.zeros((z.shape[0], weights.shape[1]))
+    for i in range(z.shape[1]):
+        scores += z[:, i, None] * weights[i]
+    return scores
 
 # =============================================================================
 # ASSIGN TIERS
 # =============================================================================
 
-print("Assigning tiers...")
-
-def assign_tier(score, thresholds):
-    """Assign tier based on score percentile thresholds."""
-    if pd.isna(score):
-        return 'Tier 4 - Depth'
-    if score >= thresholds['elite']:
-        return 'Tier 1 - Elite'
-    elif score >= thresholds['strong']:
-        return 'Tier 2 - Strong'
-    elif score >= thresholds['solid']:
-        return 'Tier 3 - Solid'
-    else:
-        return 'Tier 4 - Depth'
+TIER_LABELS = ['Tier 1 - Elite', 'Tier 2 - Strong', 'Tier 3 - Solid']
+TIER_DEPTH = 'Tier 4 - Depth'
 
-# Calculate thresholds
-batter_thresholds = {
-    'elite': batters_available['Strategy_Score'].quantile(0.90),
-    'strong': batters_available['Strategy_Score'].quantile(0.70),
-    'solid': batters_available['Strategy_Score'].quantile(0.50),
-}
 
-pitcher_thresholds = {
-    'elite': pitchers_available['Strategy_Score'].quantile(0.90),
-    'strong': pitchers_available['Strategy_Score'].quantile(0.70),
-    'solid': pitchers_available['Strategy_Score'].quantile(0.50),
-}
-
-batters_available['Tier'] = batters_available['Strategy_Score'].apply(
-    lambda x: assign_tier(x, batter_thresholds)
-)
-pitchers_available['Tier'] = pitchers_available['Strategy_Score'].apply(
-    lambda x: assign_tier(x, pitcher_thresholds)
-)
+@tracing.traced('tiering')
+def assign_tiers(scores):
+    """Tier players by score percentile (top 10% / 30% / 50% / rest)."""
+    thresholds = [scores.quantile(0.90), scores.quantile(0.70), scores.quantile(0.50)]
+    tiers = np.select([scores >= t for t in thresholds], TIER_LABELS, default=TIER_DEPTH)
+    return pd.Series(tiers, index=scores.index)
 
 # =============================================================================
-# ASSIGN POSITIONS
+# BUILD BOARD
 # =============================================================================
 
-# Batter positions not available - mark as Unknown
-batters_available['Position'] = 'Batter'
-
-# Pitcher position based on GS
-pitchers_available['Position'] = pitchers_available.apply(
-    lambda row: 'SP' if pd.notna(row['GS']) and row['GS'] > 5 else 'RP',
-    axis=1
-)
+@tracing.traced('board')
+def build_board(batters, pitchers, batter_scores, pitcher_scores, positional=False):
+    """Turn scored batter/pitcher pools into a ranked, tiered draft board.
+
+    With positional, Rank and Tier come from Score_Above_Replacement instead
+    of Strategy_Score, so scarce positions move up the board.
+    """
+    batters = batters.assign(Strategy_Score=batter_scores)
+    pitchers = pitchers.assign(Strategy_Score=pitcher_scores)
+
+    # Exclude fully blocked players
+    batters_available = batters[batters['Block_Type'] != 'Full']
+    pitchers_available = pitchers[pitchers['Block_Type'] != 'Full']
+
+    # Flag partial blocks
+    batters_available['Is_Partial_Block'] = batters_available['Block_Type'] == 'Partial'
+    pitchers_available['Is_Partial_Block'] = pitchers_available['Block_Type'] == 'Partial'
+
+    batters_available['Tier'] = assign_tiers(batters_available['Strategy_Score'])
+    pitchers_available['Tier'] = assign_tiers(pitchers_available['Strategy_Score'])
+
+    # Positions from eligibility.csv when present; otherwise batters stay
+    # 'Batter' (any batting slot) and pitchers are SP/RP by GS > 5 (see positions.py)
+    batters_available['Position'] = positions.position_labels(batters_available)
+    pitchers_available['Position'] = positions.position_labels(pitchers_available)
+
+    # Combine into single draft board, sorted by Strategy Score descending
+    draft_board = pd.concat([batters_available, pitchers_available], ignore_index=True)
+    draft_board = draft_board.sort_values('Strategy_Score', ascending=False)
+    draft_board['Rank'] = range(1, len(draft_board) + 1)
+
+    # Replacement level at each player's scarcest lineup slot, league-wide
+    draft_board = positions.add_replacement(draft_board)
+    if positional:
+        draft_board = draft_board.sort_values('Score_Above_Replacement', ascending=False,
+                                              na_position='last', kind='stable')
+        draft_board['Rank'] = range(1, len(draft_board) + 1)
+        for _, rows in draft_board.groupby('Player_Type').groups.items():
+            draft_board.loc[rows, 'Tier'] = assign_tiers(draft_board.loc[rows, 'Score_Above_Replacement'])
+
+    # Salary in millions for display
+    # (salaries are cached as float32; divide in float64)
+    draft_board['Salary_2026_M'] = draft_board['Salary_2026'].astype(float) / 1_000_000
+    draft_board['Salary_2027_M'] = draft_board['Salary_2027'].astype(float) / 1_000_000
+    draft_board['Salary_2028_M'] = draft_board['Salary_2028'].astype(float) / 1_000_000
+
+    # Backwards compat
+    draft_board['Salary_M'] = draft_board['Salary_2026_M']
+
+    # $ per Strategy Score point (lower = better value)
+    # Only calculate for players with salary and positive score
+    draft_board['Dollar_Per_Score'] = (
+        draft_board['Salary_M'] / draft_board['Strategy_Score']
+    ).where(draft_board['Salary_M'].notna() & (draft_board['Strategy_Score'] > 0))
+
+    return draft_board
+
+
+def build_boards(batters, pitchers, strategy_keys, valuation='z', positional=False):
+    """Score every strategy against shared z-score (or SGP) matrices.
+
+    Strategies are grouped by pitcher pool (standard vs. reliever split), so
+    filtering and valuation run once per pool no matter how many strategies
+    there are. positional ranks on score above replacement (see build_board).
+    Returns {strategy_key: draft_board}.
+    """
+    pools = {}
+    for key in strategy_keys:
+        pools.setdefault(key in RELIEVER_STRATEGIES, []).append(key)
+
+    boards = {}
+    for reliever_split, keys in pools.items():
+        pool_batters, pool_pitchers = filter_playing_time(batters, pitchers, reliever_split)
+        if valuation == 'sgp':
+            pool_batters, pool_pitchers = sgp.add_sgp(pool_batters, pool_pitchers)
+        else:
+            pool_batters, pool_pitchers = add_zscores(pool_batters, pool_pitchers)
+
+        batter_scores = score_matrix(
+            pool_batters[category_columns(BATTER_CATEGORIES, valuation)].to_numpy(dtype=float),
+            weight_matrix(keys, 'batter', BATTER_CATEGORIES),
+        )
+        pitcher_scores = score_matrix(
+            pool_pitchers[category_columns(PITCHER_CATEGORIES, valuation)].to_numpy(dtype=float),
+            weight_matrix(keys, 'pitcher', PITCHER_CATEGORIES),
+        )
+        for j, key in enumerate(keys):
+            boards[key] = build_board(pool_batters, pool_pitchers,
+                                      batter_scores[:, j], pitcher_scores[:, j], positional)
+
+    return {key: boards[key] for key in strategy_keys}
 
 # =============================================================================
-# COMBINE AND RANK
+# EXPORT CSV
 # =============================================================================
 
-print("Combining and ranking...")
-
-# Combine into single draft board
-draft_board = pd.concat([batters_available, pitchers_available], ignore_index=True)
+@tracing.traced('export')
+def export_board(draft_board, strategy_key, directory=''):
+    """Write draft_board_<key>.csv into directory and return its path."""
+    # Only include columns that exist
+    output_cols = [c for c in OUTPUT_COLS if c in draft_board.columns]
+    output_file = os.path.join(directory, f'draft_board_{strategy_key}.csv')
+    draft_board[output_cols].to_csv(output_file, index=False)
+    return output_file
 
-# Sort by Strategy Score descending
-draft_board = draft_board.sort_values('Strategy_Score', ascending=False)
+# =============================================================================
+# SUMMARY REPORTS
+# =============================================================================
 
-# Add overall rank
-draft_board['Rank'] = range(1, len(draft_board) + 1)
+def print_report(draft_board, strategy):
+    """Print the top-of-board summary for one strategy."""
+    print("\n" + "=" * 80)
+    print(f"DRAFT BOARD ANALYSIS - {strategy['name']}")
+    print("=" * 80)
+    print(f"{strategy['description']}")
+
+    # Top 25 Batters
+    print("\n" + "=" * 100)
+    print("TOP 25 BATTERS BY STRATEGY SCORE")
+    print("=" * 100)
+    top_batters = draft_board[draft_board['Player_Type'] == 'Batter'].head(25)
+    for _, row in top_batters.iterrows():
+        block = f"[PARTIAL]" if row['Block_Type'] == 'Partial' else ""
+        rostered = f"({row['Rostered_By']})" if pd.notna(row['Rostered_By']) else "(FA)"
+        hr = row['HR'] if pd.notna(row['HR']) else 0
+        r = row['R'] if pd.notna(row['R']) else 0
+        rbi = row['RBI'] if pd.notna(row['RBI']) else 0
+        sal = f"${row['Salary_M']:.1f}M" if pd.notna(row['Salary_M']) else "FA"
+        dps = f"${row['Dollar_Per_Score']:.2f}/pt" if pd.notna(row['Dollar_Per_Score']) else ""
+        print(f"{row['Rank']:4}. {row['Name']:<22} {sal:>8} Score:{row['Strategy_Score']:>5.2f} {dps:>10} "
+              f"HR:{hr:>3.0f} R:{r:>3.0f} RBI:{rbi:>3.0f} {block} {rostered}")
+
+    # Top 25 Pitchers
+    print("\n" + "=" * 100)
+    print("TOP 25 PITCHERS BY STRATEGY SCORE (Starting Pitchers)")
+    print("=" * 100)
+    top_pitchers = draft_board[(draft_board['Player_Type'] == 'Pitcher') & draft_board['Position'].str.contains('SP')].head(25)
+    for _, row in top_pitchers.iterrows():
+        block = f"[PARTIAL]" if row['Block_Type'] == 'Partial' else ""
+        rostered = f"({row['Rostered_By']})" if pd.notna(row['Rostered_By']) else "(FA)"
+        qs = row['QS'] if pd.notna(row['QS']) else 0
+        k = row['SO'] if pd.notna(row['SO']) else 0
+        era = row['ERA'] if pd.notna(row['ERA']) else 0
+        sal = f"${row['Salary_M']:.1f}M" if pd.notna(row['Salary_M']) else "FA"
+        dps = f"${row['Dollar_Per_Score']:.2f}/pt" if pd.notna(row['Dollar_Per_Score']) else ""
+        print(f"{row['Rank']:4}. {row['Name']:<22} {sal:>8} Score:{row['Strategy_Score']:>5.2f} {dps:>10} "
+              f"QS:{qs:>3.0f} K:{k:>3.0f} ERA:{era:>4.2f} {block} {rostered}")
+
+    # Best FPTS Value (high Strategy Score relative to raw FPTS)
+    print("\n" + "=" * 100)
+    print("STRATEGY SCORE LEADERS (Pure Projection Value)")
+    print("=" * 100)
+    top_overall = draft_board.nlargest(20, 'Strategy_Score')
+    for _, row in top_overall.iterrows():
+        block = f"[PARTIAL]" if row['Block_Type'] == 'Partial' else ""
+        rostered = f"({row['Rostered_By']})" if pd.notna(row['Rostered_By']) else "(FA)"
+        sal = f"${row['Salary_M']:.1f}M" if pd.notna(row['Salary_M']) else "FA"
+        dps = f"${row['Dollar_Per_Score']:.2f}/pt" if pd.notna(row['Dollar_Per_Score']) else ""
+        print(f"{row['Rank']:4}. {row['Name']:<22} {row['Player_Type']:<7} {sal:>8} Score:{row['Strategy_Score']:>5.2f} {dps:>10} {block} {rostered}")
+
+    # Partial Block Targets Worth Monitoring
+    print("\n" + "=" * 100)
+    print("PARTIAL BLOCK TARGETS WORTH MONITORING")
+    print("=" * 100)
+    partial_blocks = draft_board[draft_board['Block_Type'] == 'Partial'].nlargest(15, 'Strategy_Score')
+    for _, row in partial_blocks.iterrows():
+        sal = f"${row['Salary_M']:.1f}M" if pd.notna(row['Salary_M']) else "FA"
+        dps = f"${row['Dollar_Per_Score']:.2f}/pt" if pd.notna(row['Dollar_Per_Score']) else ""
+        print(f"{row['Name']:<22} {row['Player_Type']:<7} {sal:>8} Score:{row['Strategy_Score']:>5.2f} {dps:>10} Blocker: {row['Blocking_Franchise']}")
+
+    # Tier Distribution
+    print("\n" + "=" * 80)
+    print("TIER DISTRIBUTION")
+    print("=" * 80)
+    tier_counts = draft_board.groupby(['Player_Type', 'Tier']).size().unstack(fill_value=0)
+    print(tier_counts)
+
+    # Top picks by tier for quick reference
+    print("\n" + "=" * 80)
+    print("TOP 10 TIER 1 (ELITE) PICKS - MUST TARGET")
+    print("=" * 80)
+    elite = draft_board[draft_board['Tier'] == 'Tier 1 - Elite'].head(10)
+    for _, row in elite.iterrows():
+        block = f"[PARTIAL]" if row['Block_Type'] == 'Partial' else ""
+        rostered = f"({row['Rostered_By']})" if pd.notna(row['Rostered_By']) else "(FA)"
+        print(f"{row['Rank']:4}. {row['Name']:<25} {row['Player_Type']:<7} "
+              f"Score:{row['Strategy_Score']:>6.2f} {block} {rostered}")
 
 # =============================================================================
-# CALCULATE SALARY VALUE
+# MAIN
 # =============================================================================
 
-# Salary in millions for display
-draft_board['Salary_2026_M'] = draft_board['Salary_2026'] / 1_000_000
-draft_board['Salary_2027_M'] = draft_board['Salary_2027'] / 1_000_000
-draft_board['Salary_2028_M'] = draft_board['Salary_2028'] / 1_000_000
+def main(argv):
+    argv = tracing.enable_from_argv(argv)
+    valuation = 'sgp' if '--sgp' in argv else 'z'
+    positional = '--positional' in argv
+    argv = [arg for arg in argv if arg not in ('--sgp', '--positional')]
 
-# Backwards compat
-draft_board['Salary_M'] = draft_board['Salary_2026_M']
+    # Default strategy or get from command line; --all scores every strategy
+    if '--all' in argv:
+        strategy_keys = list(STRATEGIES)
+    else:
+        strategy_keys = argv or ['volume_power']
 
-# $ per Strategy Score point (lower = better value)
-# Only calculate for players with salary and positive score
-draft_board['Dollar_Per_Score'] = draft_board.apply(
-    lambda row: row['Salary_M'] / row['Strategy_Score']
-    if pd.notna(row['Salary_M']) and row['Strategy_Score'] > 0 else None,
-    axis=1
-)
+    unknown = [key for key in strategy_keys if key not in STRATEGIES]
+    if unknown:
+        print(f"Unknown strategy: {', '.join(unknown)}")
+        print(f"Available strategies: {', '.join(STRATEGIES.keys())}")
+        sys.exit(1)
 
-# =============================================================================
-# EXPORT CSV
-# =============================================================================
+    if len(strategy_keys) == 1:
+        strategy = STRATEGIES[strategy_keys[0]]
+        print(f"Strategy: {strategy['name']}")
+        print(f"{strategy['description']}")
 
-output_cols = [
-    'Rank', 'Name', 'Team', 'Player_Type', 'Position',
-    # Salary
-    'Salary_2026_M', 'Salary_2027_M', 'Salary_2028_M', 'Dollar_Per_Score', 'Rostered_By',
-    # Batter stats
-    'HR', 'R', 'RBI', 'SB', 'AVG', 'OBP', 'SLG',
-    # Pitcher stats
-    'W', 'QS', 'SO', 'ERA', 'WHIP', 'IP', 'SV', 'HLD',
-    # Scores and value
-    'Strategy_Score', 'FPTS', 'WAR',
-    # Z-scores
-    'z_HR', 'z_R', 'z_RBI', 'z_QS', 'z_K', 'z_ERA', 'z_WHIP',
-    # Block info
-    'Block_Type', 'Blocking_Franchise',
-    # Tier
-    'Tier'
-]
+    print("Loading data...")
+    batters, pitchers = load_players(TABLE_COLUMNS)
+    print(f"Total players: {len(batters) + len(pitchers)} ({len(batters)} batters + {len(pitchers)} pitchers)")
 
-# Only include columns that exist
-output_cols = [c for c in output_cols if c in draft_board.columns]
+    print(f"Scoring {len(strategy_keys)} strateg{'y' if len(strategy_keys) == 1 else 'ies'}"
+          f"{' by SGP' if valuation == 'sgp' else ''}...")
+    boards = build_boards(batters, pitchers, strategy_keys, valuation, positional)
 
-output_file = f'draft_board_{STRATEGY_KEY}.csv'
-draft_board[output_cols].to_csv(output_file, index=False)
-print(f"\nSaved draft board to {output_file}")
+    suffix = ('_sgp' if valuation == 'sgp' else '') + ('_positional' if positional else '')
+    for key, draft_board in boards.items():
+        output_file = export_board(draft_board, f'{key}{suffix}')
+        print(f"Saved draft board to {output_file} ({len(draft_board)} players)")
+
+    if len(strategy_keys) == 1:
+        key = strategy_keys[0]
+        print_report(boards[key], STRATEGIES[key])
 
-# =============================================================================
-# SUMMARY REPORTS
-# =============================================================================
 
-print("\n" + "=" * 80)
-print(f"DRAFT BOARD ANALYSIS - {STRATEGY['name']}")
-print("=" * 80)
-print(f"{STRATEGY['description']}")
-
-# Top 25 Batters
-print("\n" + "=" * 100)
-print("TOP 25 BATTERS BY STRATEGY SCORE")
-print("=" * 100)
-top_batters = draft_board[draft_board['Player_Type'] == 'Batter'].head(25)
-for _, row in top_batters.iterrows():
-    block = f"[PARTIAL]" if row['Block_Type'] == 'Partial' else ""
-    rostered = f"({row['Rostered_By']})" if pd.notna(row['Rostered_By']) else "(FA)"
-    hr = row['HR'] if pd.notna(row['HR']) else 0
-    r = row['R'] if pd.notna(row['R']) else 0
-    rbi = row['RBI'] if pd.notna(row['RBI']) else 0
-    sal = f"${row['Salary_M']:.1f}M" if pd.notna(row['Salary_M']) else "FA"
-    dps = f"${row['Dollar_Per_Score']:.2f}/pt" if pd.notna(row['Dollar_Per_Score']) else ""
-    print(f"{row['Rank']:4}. {row['Name']:<22} {sal:>8} Score:{row['Strategy_Score']:>5.2f} {dps:>10} "
-          f"HR:{hr:>3.0f} R:{r:>3.0f} RBI:{rbi:>3.0f} {block} {rostered}")
-
-# Top 25 Pitchers
-print("\n" + "=" * 100)
-print("TOP 25 PITCHERS BY STRATEGY SCORE (Starting Pitchers)")
-print("=" * 100)
-top_pitchers = draft_board[(draft_board['Player_Type'] == 'Pitcher') & (draft_board['Position'] == 'SP')].head(25)
-for _, row in top_pitchers.iterrows():
-    block = f"[PARTIAL]" if row['Block_Type'] == 'Partial' else ""
-    rostered = f"({row['Rostered_By']})" if pd.notna(row['Rostered_By']) else "(FA)"
-    qs = row['QS'] if pd.notna(row['QS']) else 0
-    k = row['SO'] if pd.notna(row['SO']) else 0
-    era = row['ERA'] if pd.notna(row['ERA']) else 0
-    sal = f"${row['Salary_M']:.1f}M" if pd.notna(row['Salary_M']) else "FA"
-    dps = f"${row['Dollar_Per_Score']:.2f}/pt" if pd.notna(row['Dollar_Per_Score']) else ""
-    print(f"{row['Rank']:4}. {row['Name']:<22} {sal:>8} Score:{row['Strategy_Score']:>5.2f} {dps:>10} "
-          f"QS:{qs:>3.0f} K:{k:>3.0f} ERA:{era:>4.2f} {block} {rostered}")
-
-# Best FPTS Value (high Strategy Score relative to raw FPTS)
-print("\n" + "=" * 100)
-print("STRATEGY SCORE LEADERS (Pure Projection Value)")
-print("=" * 100)
-top_overall = draft_board.nlargest(20, 'Strategy_Score')
-for _, row in top_overall.iterrows():
-    block = f"[PARTIAL]" if row['Block_Type'] == 'Partial' else ""
-    rostered = f"({row['Rostered_By']})" if pd.notna(row['Rostered_By']) else "(FA)"
-    fpts = row['FPTS'] if pd.notna(row['FPTS']) else 0
-    sal = f"${row['Salary_M']:.1f}M" if pd.notna(row['Salary_M']) else "FA"
-    dps = f"${row['Dollar_Per_Score']:.2f}/pt" if pd.notna(row['Dollar_Per_Score']) else ""
-    print(f"{row['Rank']:4}. {row['Name']:<22} {row['Player_Type']:<7} {sal:>8} Score:{row['Strategy_Score']:>5.2f} {dps:>10} {block} {rostered}")
-
-# Partial Block Targets Worth Monitoring
-print("\n" + "=" * 100)
-print("PARTIAL BLOCK TARGETS WORTH MONITORING")
-print("=" * 100)
-partial_blocks = draft_board[draft_board['Block_Type'] == 'Partial'].nlargest(15, 'Strategy_Score')
-for _, row in partial_blocks.iterrows():
-    sal = f"${row['Salary_M']:.1f}M" if pd.notna(row['Salary_M']) else "FA"
-    dps = f"${row['Dollar_Per_Score']:.2f}/pt" if pd.notna(row['Dollar_Per_Score']) else ""
-    print(f"{row['Name']:<22} {row['Player_Type']:<7} {sal:>8} Score:{row['Strategy_Score']:>5.2f} {dps:>10} Blocker: {row['Blocking_Franchise']}")
-
-# Tier Distribution
-print("\n" + "=" * 80)
-print("TIER DISTRIBUTION")
-print("=" * 80)
-tier_counts = draft_board.groupby(['Player_Type', 'Tier']).size().unstack(fill_value=0)
-print(tier_counts)
-
-# Top picks by tier for quick reference
-print("\n" + "=" * 80)
-print("TOP 10 TIER 1 (ELITE) PICKS - MUST TARGET")
-print("=" * 80)
-elite = draft_board[draft_board['Tier'] == 'Tier 1 - Elite'].head(10)
-for _, row in elite.iterrows():
-    block = f"[PARTIAL]" if row['Block_Type'] == 'Partial' else ""
-    rostered = f"({row['Rostered_By']})" if pd.notna(row['Rostered_By']) else "(FA)"
-    print(f"{row['Rank']:4}. {row['Name']:<25} {row['Player_Type']:<7} "
-          f"Score:{row['Strategy_Score']:>6.2f} {block} {rostered}")
+if __name__ == '__main__':
+    main(sys.argv[1:])
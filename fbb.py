@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+fbb - one entry point for the fantasy baseball pipeline.
+
+Each subcommand imports its module only when it runs, so nothing pays for
+pandas/NumPy unless it needs them. `query` reads the exported board CSVs with
+the csv module alone, which makes a rank lookup start several times faster
+than any script that imports pandas.
+
+Usage:
+    python fbb.py ingest [--strict]              # match_players.py: rebuild the player table
+    python fbb.py board [strategy ...|--all]     # draft_board_analysis.py
+    python fbb.py analyze                        # analyze_fantasy.py standings report
+    python fbb.py page                           # generate_fbb_page.py
+    python fbb.py standings [--csv]              # franchises.py: projected standings
+    python fbb.py build [target ...]             # build.py: incremental rebuild
+    python fbb.py serve [--port 8765]            # server.py: local rankings server
+    python fbb.py query "Juan Soto" [--strategy volume_power]
+
+Every subcommand takes the same arguments as the script it runs, plus
+--trace (see tracing.py).
+"""
+
+import csv
+import glob
+import os
+import sys
+import unicodedata
+
+COMMANDS = {
+    'ingest': 'match_players',
+    'board': 'draft_board_analysis',
+    'analyze': 'analyze_fantasy',
+    'page': 'generate_fbb_page',
+    'standings': 'franchises',
+    'build': 'build',
+    'serve': 'server',
+}
+BOARD_GLOB = 'draft_board_*.csv'
+
+
+# =============================================================================
+# QUERY
+# =============================================================================
+
+def fold(name):
+    """Lowercase, accent-free name for substring matching."""
+    decomposed = unicodedata.normalize('NFKD', name)
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).lower().strip()
+
+
+def board_files(strategy=None, directory='.'):
+    """{strategy key: path} of the exported draft boards in directory."""
+    paths = sorted(glob.glob(os.path.join(directory, BOARD_GLOB)))
+    boards = {os.path.basename(p)[len('draft_board_'):-len('.csv')]: p for p in paths}
+    if strategy is not None:
+        return {strategy: boards[strategy]} if strategy in boards else {}
+    return boards
+
+
+def query(name, boards):
+    """Board rows whose Name contains name, as (strategy, row dict) pairs."""
+    needle = fold(name)
+    matches = []
+    for key, path in boards.items():
+        with open(path, newline='') as f:
+            for row in csv.DictReader(f):
+                if needle in fold(row['Name']):
+                    matches.append((key, row))
+    return matches
+
+
+def run_query(argv):
+    strategy = None
+    if '--strategy' in argv:
+        i = argv.index('--strategy')
+        strategy = argv[i + 1] if i + 1 < len(argv) else None
+        argv = argv[:i] + argv[i + 2:]
+    if not argv or strategy == '':
+        print('Usage: fbb.py query NAME [--strategy KEY]')
+        sys.exit(1)
+
+    boards = board_files(strategy)
+    if not boards:
+        print(f"No {BOARD_GLOB if strategy is None else f'draft_board_{strategy}.csv'} here; "
+              f"run `fbb.py board --all` or `fbb.py build` first")
+        sys.exit(1)
+
+    matches = query(' '.join(argv), boards)
+    if not matches:
+        print(f"No player matching {' '.join(argv)!r} on {len(boards)} board(s)")
+        sys.exit(1)
+
+    print(f"{'Player':<25} {'Strategy':<20} {'Rank':>5} {'Score':>7} {'Pos':<8} {'$2026':>6}  Tier")
+    for key, row in sorted(matches, key=lambda m: (m[1]['Name'], int(m[1]['Rank']))):
+        salary = f"{float(row['Salary_2026_M']):.1f}" if row.get('Salary_2026_M') else ''
+        print(f"{row['Name']:<25} {key:<20} {row['Rank']:>5} {float(row['Strategy_Score']):>7.2f} "
+              f"{row.get('Position', ''):<8} {salary:>6}  {row.get('Tier', '')}")
+
+
+def main(argv):
+    if not argv or argv[0] in ('-h', '--help') or argv[0] not in set(COMMANDS) | {'query'}:
+        print(__doc__)
+        sys.exit(0 if argv and argv[0] in ('-h', '--help') else 1)
+
+    command, rest = argv[0], argv[1:]
+    if command == 'query':
+        run_query(rest)
+        return
+
+    import importlib
+    module = importlib.import_module(COMMANDS[command])
+    sys.argv = [f'fbb.py {command}'] + rest
+    module.main(rest)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Projected roto standings: rosters.csv rolled up through the projection join.
+
+Every rostered player (Rostered_By) adds their projected stat components to
+their franchise. Franchises are integer-coded once, and all components are
+summed per franchise in one bincount over (franchise, component) cells,
+which is a groupby-sum without pandas' per-group overhead. Rate stats are
+recomputed from the summed components (roto.category_values), so AVG, OBP
+and SLG are weighted by each player's AB/PA and ERA, WHIP and BB9 by IP.
+The franchises are then ranked against each other into roto points with
+ties split (roto.league_points). The whole pass takes a few milliseconds,
+so it can be rerun on every roster change.
+
+Usage:
+    python franchises.py          # projected standings, every category
+    python franchises.py --csv    # also write projected_standings.csv
+    python franchises.py --trace  # see tracing.py
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import player_cache
+import roto
+import tracing
+
+OUTPUT_PATH = 'projected_standings.csv'
+COUNTING_COMPONENTS = {'PA': 'bat', 'AB': 'bat', 'IP': 'pit'}
+
+
+def group_sum(codes, values, n_groups):
+    """(n_groups x columns) sums of the rows of values per integer code."""
+    n_cols = values.shape[1]
+    cells = (codes[:, None] * n_cols + np.arange(n_cols)).ravel()
+    sums = np.bincount(cells, weights=values.ravel(), minlength=n_groups * n_cols)
+    return sums.reshape(n_groups, n_cols)
+
+
+def franchise_rollup(table):
+    """Rostered players and their franchises' component totals.
+
+    Returns a dict: 'players' (rostered rows), 'teams' (names), 'codes'
+    (team index per player), 'bat'/'pit' (players x components) and
+    'team_bat'/'team_pit' (teams x components).
+    """
+    players = table[table['Rostered_By'].notna()].reset_index(drop=True)
+    teams, codes = np.unique(players['Rostered_By'].astype(str), return_inverse=True)
+    is_batter = (players['Player_Type'] == 'Batter').to_numpy()
+    bat = roto.batting_components(players) * is_batter[:, None]
+    pit = roto.pitching_components(players) * ~is_batter[:, None]
+    return {'players': players, 'teams': list(teams), 'codes': codes, 'bat': bat, 'pit': pit,
+            'team_bat': group_sum(codes, bat, len(teams)),
+            'team_pit': group_sum(codes, pit, len(teams))}
+
+
+def projected_standings(table):
+    """One row per franchise: category values, roto points and rank, best first."""
+    rollup = franchise_rollup(table)
+    values = roto.category_values(rollup['team_bat'], rollup['team_pit'])
+    points = roto.league_points(values)
+    totals = points.sum(axis=1)
+
+    standings = pd.DataFrame({
+        'Franchise': rollup['teams'],
+        'Players': np.bincount(rollup['codes'], minlength=len(rollup['teams'])),
+    })
+    for name, side in COUNTING_COMPONENTS.items():
+        components = roto.BATTING_COMPONENTS if side == 'bat' else roto.PITCHING_COMPONENTS
+        standings[name] = rollup[f'team_{side}'][:, components.index(name)]
+    standings[roto.CATEGORIES] = values
+    standings[[f'Pts_{cat}' for cat in roto.CATEGORIES]] = points
+    standings['Points'] = totals
+    standings['Rank'] = 1 + (totals[None, :] > totals[:, None]).sum(axis=1)
+    return standings.sort_values(['Points', 'Franchise'], ascending=[False, True], ignore_index=True)
+
+
+def print_standings(standings):
+    print("\n" + "=" * 80)
+    print("PROJECTED STANDINGS (rostered players)")
+    print("=" * 80)
+    print(f"{'#':>2} {'Franchise':<30} {'Points':>6} " + ' '.join(f'{c:>5}' for c in roto.CATEGORIES))
+    for _, row in standings.iterrows():
+        print(f"{row['Rank']:>2} {row['Franchise']:<30} {row['Points']:>6.1f} "
+              + ' '.join(f"{row[f'Pts_{c}']:>5.1f}" for c in roto.CATEGORIES))
+
+    print("\nProjected category values:")
+    formats = {cat: '.3f' if cat in ('AVG', 'OBP', 'SLG') else '.2f' if cat in roto.LOWER_IS_BETTER else '.0f'
+               for cat in roto.CATEGORIES}
+    print(f"{'Franchise':<30} {'PA':>6} {'IP':>6} " + ' '.join(f'{c:>6}' for c in roto.CATEGORIES))
+    for _, row in standings.iterrows():
+        print(f"{row['Franchise']:<30} {row['PA']:>6.0f} {row['IP']:>6.0f} "
+              + ' '.join(f"{row[c]:>6{formats[c]}}" for c in roto.CATEGORIES))
+
+
+def main(argv):
+    argv = tracing.enable_from_argv(argv)
+    if any(arg not in ('--csv',) for arg in argv):
+        print(__doc__)
+        sys.exit(1)
+
+    table = player_cache.load_player_table()
+    start = time.perf_counter()
+    standings = projected_standings(table)
+    elapsed = time.perf_counter() - start
+
+    print_standings(standings)
+    print(f"\nRolled up {int(standings['Players'].sum())} rostered players into "
+          f"{len(standings)} franchises in {elapsed * 1000:.1f} ms")
+    if '--csv' in argv:
+        standings.to_csv(OUTPUT_PATH, index=False)
+        print(f"Saved projected standings to {OUTPUT_PATH}")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
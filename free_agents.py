@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Free-agent impact: my projected roto points for every add/drop pair.
+
+My roster is my_players.csv (names resolved with player_identity). The
+other franchises are rosters.csv rolled up by franchises.franchise_rollup,
+less any of my players (they can only be on one roster) and less --me if
+it names the franchise my_players.csv replaces. Free agents are players on
+no roster and not blocked (Block_Type empty) with projected PA or IP.
+
+Swapping a free agent in for a drop candidate changes my summed stat
+components by (add - drop), so the whole free agents x drops grid is one
+broadcast: (adds x drops x components) totals -> roto.category_values ->
+roto.points_against the other franchises' values. Adds are processed
+CHUNK_ADDS at a time, which keeps memory flat for any number of free agents.
+
+Usage:
+    python free_agents.py                           # best 25 add/drop pairs
+    python free_agents.py --me "Tyler Hart" --top 40
+    python free_agents.py --type pitcher --csv      # pitcher adds; write free_agent_impact.csv
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import franchises
+import player_cache
+import player_identity
+import roto
+
+MY_PLAYERS_PATH = 'my_players.csv'
+OUTPUT_PATH = 'free_agent_impact.csv'
+CHUNK_ADDS = 1024
+
+
+def components(players):
+    """(bat, pit) component arrays, zero on the side a player doesn't play."""
+    is_batter = (players['Player_Type'] == 'Batter').to_numpy()
+    return (roto.batting_components(players) * is_batter[:, None],
+            roto.pitching_components(players) * ~is_batter[:, None])
+
+
+def my_roster_mask(table, path=MY_PLAYERS_PATH):
+    """Boolean mask of table rows on my roster, plus the names that did not resolve."""
+    names = pd.read_csv(path)['Player']
+    report = player_identity.PlayerIndex(table).resolve(names, 'my_players')
+    ids = set(report['PlayerId'].dropna().astype(str))
+    unresolved = report.loc[report['PlayerId'].isna(), 'Input_Name'].tolist()
+    return table['PlayerId'].astype(str).isin(ids).to_numpy(), unresolved
+
+
+def impact_arrays(table, mine, me=None):
+    """Drops, free agents and league values for impact_matrix.
+
+    Returns a dict: 'drops'/'adds' (player rows), 'drop_bat'/'drop_pit' and
+    'add_bat'/'add_pit' (players x components), 'my_bat'/'my_pit' (my
+    component totals) and 'league' (other franchises x CATEGORIES values).
+    """
+    rostered = table['Rostered_By'].notna().to_numpy()
+    rollup = franchises.franchise_rollup(table[~mine])
+    others = [t for t, name in enumerate(rollup['teams']) if name != me]
+    league = roto.category_values(rollup['team_bat'][others], rollup['team_pit'][others])
+
+    drops = table[mine].reset_index(drop=True)
+    drop_bat, drop_pit = components(drops)
+    free = ~rostered & ~mine & table['Block_Type'].isna().to_numpy()
+    active = (table['PA'].fillna(0) > 0).to_numpy() | (table['IP'].fillna(0) > 0).to_numpy()
+    adds = table[free & active].reset_index(drop=True)
+    add_bat, add_pit = components(adds)
+    return {'drops': drops, 'drop_bat': drop_bat, 'drop_pit': drop_pit,
+            'adds': adds, 'add_bat': add_bat, 'add_pit': add_pit,
+            'my_bat': drop_bat.sum(axis=0), 'my_pit': drop_pit.sum(axis=0), 'league': league}
+
+
+def swap_points(arrays, add, drop):
+    """My category points (... x CATEGORIES) after adding rows `add` for rows `drop`.
+
+    add and drop index the adds/drops arrays and broadcast against each other.
+    """
+    bat = arrays['my_bat'] + arrays['add_bat'][add] - arrays['drop_bat'][drop]
+    pit = arrays['my_pit'] + arrays['add_pit'][add] - arrays['drop_pit'][drop]
+    return roto.points_against(roto.category_values(bat, pit), arrays['league'])
+
+
+def impact_matrix(arrays, chunk=CHUNK_ADDS):
+    """(adds x drops) change in my total roto points, and my current points."""
+    base = roto.points_against(roto.category_values(arrays['my_bat'], arrays['my_pit']), arrays['league'])
+    drops = np.arange(len(arrays['drops']))[None, :]
+    gain = np.empty((len(arrays['adds']), len(arrays['drops'])))
+    for start in range(0, len(gain), chunk):
+        add = np.arange(start, min(start + chunk, len(gain)))[:, None]
+        gain[start:start + chunk] = swap_points(arrays, add, drops).sum(axis=-1) - base.sum()
+    return gain, base
+
+
+def best_pairs(gain, top):
+    """(add, drop) indices of the top gains, best first (ties in add, drop order)."""
+    flat = gain.ravel()
+    top = min(top, len(flat))
+    if not top:
+        return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+    candidates = np.argpartition(-flat, top - 1)[:top] if top < len(flat) else np.arange(len(flat))
+    cut = flat[candidates].min()
+    candidates = np.flatnonzero(flat >= cut)
+    order = candidates[np.lexsort((candidates, -flat[candidates]))][:top]
+    return np.unravel_index(order, gain.shape)
+
+
+def impact_table(arrays, gain, base):
+    """Best drop for each free agent, as a DataFrame sorted by gain."""
+    drop = gain.argmax(axis=1)
+    add = np.arange(len(gain))
+    after = swap_points(arrays, add, drop)
+    table = pd.DataFrame({
+        'Add': arrays['adds']['Name'].to_numpy(),
+        'Add_Type': arrays['adds']['Player_Type'].to_numpy(),
+        'Add_Team': arrays['adds']['Team'].to_numpy(),
+        'Drop': arrays['drops']['Name'].to_numpy()[drop],
+        'Gain': gain[add, drop],
+    })
+    table[[f'd_{cat}' for cat in roto.CATEGORIES]] = after - base
+    return table.sort_values('Gain', ascending=False, kind='stable', ignore_index=True)
+
+# =============================================================================
+# REPORT
+# =============================================================================
+
+def print_pairs(arrays, gain, base, top):
+    add, drop = best_pairs(gain, top)
+    after = swap_points(arrays, add, drop)
+    print("\n" + "=" * 80)
+    print(f"BEST ADD/DROP PAIRS (my projected points: {base.sum():.1f})")
+    print("=" * 80)
+    print(f"{'Add':<25} {'Drop':<25} {'Gain':>5}  Category changes")
+    for a, d, points in zip(add, drop, after):
+        moved = [f"{c} {p - b:+.1f}" for c, p, b in zip(roto.CATEGORIES, points, base) if p != b]
+        print(f"{arrays['adds'].at[a, 'Name']:<25} {arrays['drops'].at[d, 'Name']:<25} "
+              f"{gain[a, d]:>+5.1f}  {', '.join(moved)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--me', help='franchise my_players.csv replaces (left out of the league)')
+    parser.add_argument('--type', choices=['batter', 'pitcher'], help='only consider adds of this type')
+    parser.add_argument('--top', type=int, default=25)
+    parser.add_argument('--chunk', type=int, default=CHUNK_ADDS)
+    parser.add_argument('--csv', action='store_true', help=f'write the best drop per free agent to {OUTPUT_PATH}')
+    args = parser.parse_args()
+
+    table = player_cache.load_player_table()
+    if args.me is not None and args.me not in set(table['Rostered_By'].dropna().astype(str)):
+        print(f"Unknown franchise: {args.me}")
+        print(f"Available: {', '.join(sorted(table['Rostered_By'].dropna().astype(str).unique()))}")
+        sys.exit(1)
+    mine, unresolved = my_roster_mask(table)
+    if unresolved:
+        print(f"Not found in the projections: {', '.join(map(str, unresolved))}")
+
+    start = time.perf_counter()
+    arrays = impact_arrays(table, mine, args.me)
+    if args.type is not None:
+        typed = (arrays['adds']['Player_Type'] == args.type.capitalize()).to_numpy()
+        arrays['adds'] = arrays['adds'][typed].reset_index(drop=True)
+        arrays['add_bat'], arrays['add_pit'] = arrays['add_bat'][typed], arrays['add_pit'][typed]
+    gain, base = impact_matrix(arrays, args.chunk)
+    elapsed = time.perf_counter() - start
+
+    print_pairs(arrays, gain, base, args.top)
+    print(f"\n{gain.shape[0]:,} free agents x {gain.shape[1]} drops = {gain.size:,} pairs "
+          f"against {len(arrays['league'])} franchises in {elapsed:.2f}s")
+    if args.csv:
+        impact_table(arrays, gain, base).to_csv(OUTPUT_PATH, index=False)
+        print(f"Saved best drop per free agent to {OUTPUT_PATH}")
+
+
+if __name__ == '__main__':
+    main()
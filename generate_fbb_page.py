@@ -6,6 +6,12 @@ Generate interactive fantasy baseball draft board HTML page.
 import pandas as pd
 import json
 import os
+import sys
+
+import draft_board_analysis
+import tracing
+
+OUTPUT_PATH = os.path.expanduser('~/catalyst/catalyst/public/fbb/index.html')
 
 # Strategy definitions
 STRATEGIES = {
@@ -52,12 +58,20 @@ LEAGUE_RESULTS = [
     {'place': 12, 'team': 'Nolan Chidester', 'points': 30.5, 'strategy': 'Rebuild', 'power': 1.8, 'speed': 2.3, 'volsp': 1.0, 'relief': 4.5, 'rates': 1.0},
 ]
 
-def load_strategy_data():
-    """Load all strategy CSVs and convert to JSON-friendly format."""
+def build_strategy_boards():
+    """Score every strategy in memory from the cached player table."""
+    batters, pitchers = draft_board_analysis.load_players(draft_board_analysis.TABLE_COLUMNS)
+    return draft_board_analysis.build_boards(batters, pitchers, list(STRATEGIES))
+
+
+@tracing.traced('records')
+def load_strategy_data(boards):
+    """Convert strategy boards to JSON-friendly format."""
     data = {}
 
     for key, info in STRATEGIES.items():
-        df = pd.read_csv(info['file'])
+        df = boards[key]
+        df = df.astype({col: object for col in df.columns if isinstance(df[col].dtype, pd.CategoricalDtype)})
 
         # Select columns for batters
         batter_cols = ['Rank', 'Name', 'Team', 'Salary_2026_M', 'Salary_2027_M', 'Salary_2028_M',
@@ -92,6 +106,7 @@ def load_strategy_data():
 
     return data
 
+@tracing.traced('render')
 def generate_html(data):
     """Generate the full HTML page."""
 
@@ -467,31 +482,40 @@ def generate_html(data):
 
     return html
 
-def main():
-    print("Loading strategy data...")
-    data = load_strategy_data()
+def write_page(boards, output_path=OUTPUT_PATH, verbose=True):
+    """Render boards to output_path and write the board CSVs alongside it."""
+    data = load_strategy_data(boards)
 
-    print("Generating HTML...")
+    if verbose:
+        print("Generating HTML...")
     html = generate_html(data)
 
-    output_path = os.path.expanduser('~/catalyst/catalyst/public/fbb/index.html')
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
-    with open(output_path, 'w') as f:
-        f.write(html)
+    with tracing.span('write', bytes=len(html)):
+        with open(output_path, 'w') as f:
+            f.write(html)
 
-    print(f"Saved to {output_path}")
+    if verbose:
+        print(f"Saved to {output_path}")
 
-    # Also copy CSVs
-    import shutil
+    # Also write the board CSVs alongside the page
     for key, info in STRATEGIES.items():
-        src = info['file']
-        dst = os.path.expanduser(f"~/catalyst/catalyst/public/fbb/{info['file']}")
-        shutil.copy(src, dst)
-        print(f"Copied {src}")
+        dst = draft_board_analysis.export_board(boards[key], key, os.path.dirname(output_path))
+        if verbose:
+            print(f"Wrote {dst}")
+    return output_path
+
+
+def main(argv):
+    tracing.enable_from_argv(argv)
+
+    print("Loading strategy data...")
+    boards = build_strategy_boards()
+    write_page(boards)
 
     print("\nDone! Deploy with:")
     print("  cd ~/catalyst/catalyst && npm run build && npx netlify deploy --prod")
 
 if __name__ == '__main__':
-    main()
+    main(sys.argv[1:])
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Weekly head-to-head matchup simulator for the rostered franchises.
+
+Every franchise plays one opponent a week on a round-robin schedule (circle
+method, repeated until --weeks is filled). A week is played out from
+per-game rates:
+
+    games       each rostered player's games that week are Poisson with mean
+                G / SEASON_WEEKS (appearances for pitchers)
+    volume      PA and AB (batters) and IP (pitchers) are the player's
+                per-game rate times games; FPTS is FPTS/G x games for
+                batters and FPTS/IP x IP for pitchers
+    events      1B, 2B, 3B, HR, R, RBI, SB, BB, HBP, SF and ER, H, BB, SO,
+                QS, SV, HLD are Poisson around the franchise's games-weighted
+                expectation; batting H is 1B + 2B + 3B + HR
+
+Category values come from the summed weekly components (roto.category_values),
+so AVG, OBP, SLG, ERA, WHIP and BB9 aggregate as rate stats rather than as
+averages of player rates. A matchup is won on categories: each one is a win,
+loss or tie (ERA, WHIP and BB9 rank low to high), and the side with more
+category wins takes the week. Only each franchise's active lineup plays:
+the positions.LINEUP_SLOTS (14 batters, 7 SP, 3 RP) filled by
+positions.fill_slots with the rostered players of highest expected weekly
+FPTS. The rest of the roster is bench and does not count.
+
+Seasons are simulated in chunks of (seasons x weeks x players) arrays, so the
+only Python loop is over franchises.
+
+Usage:
+    python h2h.py                                  # 5,000 seasons, 22 weeks
+    python h2h.py --sims 20000 --seed 1
+    python h2h.py --team "Tyler Hart" --csv        # one schedule; write h2h_*.csv
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+import player_cache
+import positions
+import roto
+
+N_SIMS = 5_000
+CHUNK_SIMS = 250
+WEEKS = 22
+SEASON_WEEKS = 26   # MLB weeks the projected G are spread over
+
+BATTING_VOLUME = ['PA', 'AB']
+BATTING_HITS = ['1B', '2B', '3B', 'HR']
+PITCHING_VOLUME = ['IP']
+
+# =============================================================================
+# SCHEDULE
+# =============================================================================
+
+def round_robin(n_teams, weeks=WEEKS):
+    """(weeks x n_teams/2 x 2) home/away team indices, circle method."""
+    if n_teams % 2:
+        raise ValueError(f"Round-robin needs an even number of teams, got {n_teams}")
+    rounds = []
+    order = list(range(n_teams))
+    for _ in range(n_teams - 1):
+        rounds.append([(order[i], order[n_teams - 1 - i]) for i in range(n_teams // 2)])
+        order = [order[0], order[-1]] + order[1:-1]
+    return np.array([rounds[w % len(rounds)] for w in range(weeks)])
+
+# =============================================================================
+# WEEKLY RATES
+# =============================================================================
+
+def active_lineups(players, codes, n_teams, scores):
+    """Boolean mask of the players in each franchise's active lineup (best scores first)."""
+    eligible = positions.eligibility_matrix(players)
+    capacity = positions.slot_capacity()
+    active = np.zeros(len(players), dtype=bool)
+    for t in range(n_teams):
+        members = np.flatnonzero(codes == t)
+        active[members[positions.fill_slots(scores[members], eligible[members], capacity) >= 0]] = True
+    return active
+
+
+def weekly_rates(table):
+    """Active-lineup players' per-game component rates.
+
+    Returns a dict: 'teams' (names), 'codes' (team index per player),
+    'games' (expected games per week), 'bat'/'pit' (players x components
+    per game) and 'fpts' (fantasy points per game).
+    """
+    players = table[table['Rostered_By'].notna() & (table['G'] > 0)].reset_index(drop=True)
+    teams, codes = np.unique(players['Rostered_By'].astype(str), return_inverse=True)
+    is_batter = (players['Player_Type'] == 'Batter').to_numpy()
+    games = players['G'].to_numpy(dtype=float)
+
+    bat = roto.batting_components(players) * is_batter[:, None] / games[:, None]
+    pit = roto.pitching_components(players) * ~is_batter[:, None] / games[:, None]
+    ip = pit[:, roto.PITCHING_COMPONENTS.index('IP')]
+    fpts = np.nan_to_num(np.where(is_batter, players['FPTS/G'].to_numpy(dtype=float),
+                                  players['FPTS/IP'].to_numpy(dtype=float) * ip))
+    games = games / SEASON_WEEKS
+    active = active_lineups(players, codes, len(teams), fpts * games)
+    return {'teams': list(teams), 'codes': codes[active], 'games': games[active],
+            'bat': bat[active], 'pit': pit[active], 'fpts': fpts[active]}
+
+
+def simulate_weeks(rates, n_sims, weeks, rng):
+    """Sampled (bat, pit, fpts) franchise totals, each (n_sims x weeks x teams [x components])."""
+    n_teams = len(rates['teams'])
+    games = rng.poisson(rates['games'], size=(n_sims, weeks, len(rates['games']))).astype(float)
+    per_game = np.column_stack([rates['bat'], rates['pit'], rates['fpts']])
+    expected = np.empty((n_sims, weeks, n_teams, per_game.shape[1]))
+    for t in range(n_teams):
+        members = rates['codes'] == t
+        expected[:, :, t] = games[:, :, members] @ per_game[members]
+
+    nb = len(roto.BATTING_COMPONENTS)
+    bat, pit, fpts = expected[..., :nb], expected[..., nb:-1], expected[..., -1]
+    bat_events = ~np.isin(roto.BATTING_COMPONENTS, BATTING_VOLUME + ['H'])
+    pit_events = ~np.isin(roto.PITCHING_COMPONENTS, PITCHING_VOLUME)
+    bat[..., bat_events] = rng.poisson(bat[..., bat_events])
+    pit[..., pit_events] = rng.poisson(pit[..., pit_events])
+    hits = np.isin(roto.BATTING_COMPONENTS, BATTING_HITS)
+    bat[..., roto.BATTING_COMPONENTS.index('H')] = bat[..., hits].sum(axis=-1)
+    return bat, pit, fpts
+
+# =============================================================================
+# SEASONS
+# =============================================================================
+
+def simulate_seasons(table, n_sims=N_SIMS, weeks=WEEKS, chunk=CHUNK_SIMS, seed=0):
+    """Matchup, category and record probabilities over n_sims H2H seasons.
+
+    Returns a dict: 'schedule' (weeks x pairs x 2), 'teams', 'matchups'
+    (one row per scheduled game: home win/tie/away win probabilities and
+    expected category wins), 'categories' (teams x CATEGORIES weekly category
+    win probability, ties counting half) and 'summary' (expected matchup and
+    category record, weekly FPTS and the probability of the best record, ties
+    split).
+    """
+    rates = weekly_rates(table)
+    teams = rates['teams']
+    n_teams = len(teams)
+    schedule = round_robin(n_teams, weeks)
+    home, away = schedule[..., 0], schedule[..., 1]
+    week = np.arange(weeks)[:, None]
+    sign = roto.direction()
+
+    cat_wins = np.zeros(home.shape + (len(roto.CATEGORIES),))     # home wins per game/category
+    cat_ties = np.zeros_like(cat_wins)
+    results = np.zeros(home.shape + (3,))                          # home win / tie / away win
+    record = np.zeros(n_teams)
+    best = np.zeros(n_teams)
+    fpts_sum = np.zeros(n_teams)
+    fpts_sumsq = np.zeros(n_teams)
+    rng = np.random.default_rng(seed)
+    for start in range(0, n_sims, chunk):
+        n = min(chunk, n_sims - start)
+        bat, pit, fpts = simulate_weeks(rates, n, weeks, rng)
+        values = np.nan_to_num(roto.category_values(bat, pit) * sign, nan=-np.inf)
+        mine, theirs = values[:, week, home], values[:, week, away]   # n x weeks x pairs x C
+        won, tied = mine > theirs, mine == theirs
+        cat_wins += won.sum(axis=0)
+        cat_ties += tied.sum(axis=0)
+
+        margin = won.sum(axis=-1) - (~won & ~tied).sum(axis=-1)
+        outcome = np.stack([margin > 0, margin == 0, margin < 0], axis=-1)
+        results += outcome.sum(axis=0)
+
+        score = np.zeros((n, n_teams))
+        points = outcome[..., 0] + 0.5 * outcome[..., 1]
+        np.add.at(score.T, home.ravel(), points.reshape(n, -1).T)
+        np.add.at(score.T, away.ravel(), (1 - points).reshape(n, -1).T)
+        record += score.sum(axis=0)
+        top = score == score.max(axis=1, keepdims=True)
+        best += (top / top.sum(axis=1, keepdims=True)).sum(axis=0)
+        fpts_sum += fpts.sum(axis=(0, 1))
+        fpts_sumsq += (fpts ** 2).sum(axis=(0, 1))
+
+    cat_losses = n_sims - cat_wins - cat_ties
+    category = np.zeros((n_teams, len(roto.CATEGORIES)))
+    np.add.at(category, home.ravel(), (cat_wins + 0.5 * cat_ties).reshape(-1, len(roto.CATEGORIES)))
+    np.add.at(category, away.ravel(), (cat_losses + 0.5 * cat_ties).reshape(-1, len(roto.CATEGORIES)))
+    games_played = np.bincount(schedule.ravel(), minlength=n_teams)
+    category /= (games_played * n_sims)[:, None]
+
+    p = results / n_sims
+    matchups = pd.DataFrame({
+        'Week': np.repeat(np.arange(1, weeks + 1), home.shape[1]),
+        'Home': [teams[t] for t in home.ravel()],
+        'Away': [teams[t] for t in away.ravel()],
+        'Home_Win': p[..., 0].ravel(),
+        'Tie': p[..., 1].ravel(),
+        'Away_Win': p[..., 2].ravel(),
+        'Home_Cats': (cat_wins.sum(axis=-1) / n_sims).ravel(),
+        'Away_Cats': (cat_losses.sum(axis=-1) / n_sims).ravel(),
+    })
+    weeks_played = games_played * n_sims
+    fpts_mean = fpts_sum / weeks_played
+    summary = pd.DataFrame({
+        'Franchise': teams,
+        'Players': np.bincount(rates['codes'], minlength=n_teams),
+        'Wins': record / n_sims,
+        'Cat_Win': category.mean(axis=1),
+        'FPTS_Week': fpts_mean,
+        'FPTS_SD': np.sqrt(np.maximum(fpts_sumsq / weeks_played - fpts_mean ** 2, 0)),
+        'Best_Record': best / n_sims,
+    })
+    order = np.argsort(-summary['Wins'].to_numpy(), kind='stable')
+    return {
+        'schedule': schedule,
+        'teams': teams,
+        'matchups': matchups,
+        'categories': pd.DataFrame(category, index=teams, columns=roto.CATEGORIES).iloc[order],
+        'summary': summary.iloc[order].reset_index(drop=True),
+    }
+
+# =============================================================================
+# REPORT
+# =============================================================================
+
+def print_summary(result, weeks):
+    print("\n" + "=" * 80)
+    print(f"HEAD-TO-HEAD SEASON ({weeks} weeks, category majority wins the week)")
+    print("=" * 80)
+    print(f"{'Franchise':<30} {'Plyr':>4} {'Wins':>5} {'Cat%':>6} {'FPTS/wk':>8} {'SD':>5} {'Best%':>6}")
+    for _, row in result['summary'].iterrows():
+        print(f"{row['Franchise']:<30} {row['Players']:>4} {row['Wins']:>5.1f} {row['Cat_Win']:>6.1%} "
+              f"{row['FPTS_Week']:>8.1f} {row['FPTS_SD']:>5.1f} {row['Best_Record']:>6.1%}")
+    print("\nWeekly category win probability (ties count half):")
+    print((result['categories'] * 100).round(0).astype(int).to_string())
+
+
+def print_matchups(matchups, title):
+    print("\n" + "=" * 80)
+    print(title)
+    print("=" * 80)
+    print(f"{'Wk':>3} {'Home':<28} {'Away':<28} {'Home%':>6} {'Tie%':>5} {'Away%':>6}  Cats")
+    for _, row in matchups.iterrows():
+        print(f"{row['Week']:>3} {row['Home']:<28} {row['Away']:<28} {row['Home_Win']:>6.1%} "
+              f"{row['Tie']:>5.1%} {row['Away_Win']:>6.1%}  {row['Home_Cats']:.1f}-{row['Away_Cats']:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sims', type=int, default=N_SIMS)
+    parser.add_argument('--weeks', type=int, default=WEEKS)
+    parser.add_argument('--chunk', type=int, default=CHUNK_SIMS)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--team', help='print this franchise\'s schedule instead of week 1')
+    parser.add_argument('--csv', action='store_true', help='write h2h_matchups.csv and h2h_teams.csv')
+    args = parser.parse_args()
+
+    table = player_cache.load_player_table()
+    start = time.perf_counter()
+    result = simulate_seasons(table, args.sims, args.weeks, args.chunk, args.seed)
+    elapsed = time.perf_counter() - start
+
+    if args.team is not None and args.team not in result['teams']:
+        print(f"Unknown franchise: {args.team}")
+        print(f"Available: {', '.join(result['teams'])}")
+        raise SystemExit(1)
+
+    print_summary(result, args.weeks)
+    matchups = result['matchups']
+    if args.team is None:
+        print_matchups(matchups[matchups['Week'] == 1], "WEEK 1 MATCHUPS")
+    else:
+        mine = matchups[(matchups['Home'] == args.team) | (matchups['Away'] == args.team)]
+        print_matchups(mine, f"SCHEDULE: {args.team}")
+    print(f"\n{args.sims:,} seasons x {args.weeks} weeks x {len(result['teams'])} franchises "
+          f"in {elapsed:.2f}s")
+
+    if args.csv:
+        matchups.to_csv('h2h_matchups.csv', index=False)
+        result['summary'].to_csv('h2h_teams.csv', index=False)
+
+
+if __name__ == '__main__':
+    main()
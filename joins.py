@@ -0,0 +1,54 @@
+"""
+Guarded left joins for the projection merge.
+
+A plain DataFrame.merge silently turns many-to-many when the right-hand key
+repeats, multiplying rows. guarded_left_join instead builds a hash index on
+the right-hand key, reports the fan-out each duplicate key would cause before
+joining, and then either keeps one row per key or (strict mode) raises.
+"""
+
+import pandas as pd
+
+
+class JoinFanOutError(ValueError):
+    """Raised in strict mode when a join key repeats on the right-hand side."""
+
+
+def fan_out_report(left, right, on):
+    """Per duplicated right-hand key: right rows, left rows hit, extra rows a merge would add."""
+    right_counts = right[on].value_counts()
+    duplicated = right_counts[right_counts > 1]
+    left_counts = left[on].value_counts().reindex(duplicated.index, fill_value=0)
+    report = pd.DataFrame({
+        'Right_Rows': duplicated,
+        'Left_Rows': left_counts,
+        'Extra_Rows': left_counts * (duplicated - 1),
+    })
+    report.index.name = on
+    return report.sort_values('Extra_Rows', ascending=False)
+
+
+def guarded_left_join(left, right, on, name, strict=False):
+    """Left-join right onto left by a key that must be unique on the right.
+
+    Rows with a null key on the right never match. When keys repeat, the
+    fan-out is printed and the first row per key wins (order the right-hand
+    frame by preference beforehand); with strict=True a JoinFanOutError is
+    raised instead. The result always has exactly len(left) rows.
+    """
+    right = right[right[on].notna()]
+    report = fan_out_report(left, right, on)
+    if len(report):
+        extra = int(report['Extra_Rows'].sum())
+        print(f"{name} join: {len(report)} duplicate {on} keys would add {extra} rows")
+        for key, row in report.head(10).iterrows():
+            print(f"  {key}: {row['Right_Rows']} {name} rows x {row['Left_Rows']} projection rows")
+        if strict:
+            raise JoinFanOutError(f"{name} join on {on} is not one-to-one ({len(report)} duplicate keys)")
+        print(f"  keeping the first {name} row per key")
+        right = right.drop_duplicates(on, keep='first')
+
+    # Hash lookup of every left key in the (now unique) right-hand index
+    matched = right.set_index(on).reindex(left[on])
+    matched.index = left.index
+    return pd.concat([left, matched], axis=1)
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Keeper valuation: discounted surplus of every contract in rosters.csv.
+
+Each roster row carries salary hits for 2024-2030. A player's projected
+dollar value is the player's standings gain points above replacement (see
+sgp.py) priced at the league's own rate: the 2026 payroll of all franchises
+spread over the positive value of the players a 12-team league would
+roster. For every remaining contract year the surplus is value minus hit;
+future years lose --decline of the value (the projections carry no ages)
+and are discounted at --discount per season. Value is floored at $0: a
+player below replacement can sit on the bench. Dropped rows are dead money:
+hits with no value, which cannot be released.
+
+All roster rows are valued at once as a rows x years array, and keeper
+deadline what-ifs are boolean scenarios x rows keep masks, so a whole
+league's alternatives are a couple of matrix products. Releasing a player
+still counts --release-cost of the remaining hits (the constitution's
+buyout rule is not machine-readable; set it to the league's rule).
+
+Usage:
+    python keepers.py                                   # league keeper report
+    python keepers.py --franchise "Tyler Hart"          # one franchise, row by row
+    python keepers.py --franchise "Tyler Hart" --release "Matt Olson" --release "Manny Machado"
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import match_players
+import player_cache
+import player_identity
+import roto
+import sgp
+
+HIT_YEARS = np.arange(2024, 2031)
+HIT_COLUMNS = [f'{year} Salary Hit' for year in HIT_YEARS]
+CURRENT_SEASON = 2026
+DISCOUNT = 0.10        # per season
+DECLINE = 0.05         # share of value lost per season
+RELEASE_COST = 0.5     # share of remaining hits still owed after a release
+
+
+# =============================================================================
+# INPUTS
+# =============================================================================
+
+def load_contracts(index, path='rosters.csv'):
+    """Roster rows and rows x HIT_YEARS hits in $M (NaN = no contract year).
+
+    Roster names are resolved to PlayerId with index, a PlayerIndex.
+    """
+    rosters = pd.read_csv(path, skiprows=2)
+    rosters.columns = rosters.columns.str.strip()
+    rosters = rosters[rosters['Player Name'].notna()].reset_index(drop=True)
+    rosters['Contract Type'] = rosters['Contract Type'].str.strip()
+    rosters['PlayerId'] = index.resolve(rosters['Player Name'], 'rosters')['PlayerId'].to_numpy()
+
+    # ' $ -   ' is a $0 contract year (minor leaguers); blank is no contract
+    hits = np.column_stack([match_players.parse_salary(rosters[col]) for col in HIT_COLUMNS]) / 1_000_000
+    dash = np.column_stack([rosters[col].astype('string').str.contains('-', regex=False).fillna(False)
+                            for col in HIT_COLUMNS])
+    hits[dash & np.isnan(hits)] = 0.0
+    return rosters, hits
+
+
+def dollar_values(table, league_size=roto.LEAGUE_SIZE,
+                  n_batters=roto.ROSTER_BATTERS, n_pitchers=roto.ROSTER_PITCHERS):
+    """Total SGP above the replacement player of each type, per PlayerId."""
+    batters = table[table['Player_Type'] == 'Batter']
+    pitchers = table[table['Player_Type'] == 'Pitcher']
+    base_bat, base_pit = sgp.average_team(batters, pitchers)
+    total = pd.Series(np.nansum(sgp.sgp_matrix(table, base_bat, base_pit, sgp.denominators()), axis=1),
+                      index=table.index)
+    above = pd.Series(np.nan, index=table.index)
+    for player_type, slots in (('Batter', n_batters), ('Pitcher', n_pitchers)):
+        rows = table['Player_Type'] == player_type
+        replacement = total[rows].nlargest(league_size * slots + 1).iloc[-1]
+        above[rows] = total[rows] - replacement
+    return above.groupby(table['PlayerId'].astype(str)).max()
+
+
+def price_values(above, rosters, hits):
+    """$M per player: SGP above replacement times the league's $ per SGP."""
+    on_roster = rosters['Franchise'].notna().to_numpy()
+    payroll = np.nansum(hits[on_roster, HIT_YEARS == CURRENT_SEASON])
+    pool = above.clip(lower=0).nlargest(roto.LEAGUE_SIZE * (roto.ROSTER_BATTERS + roto.ROSTER_PITCHERS)).sum()
+    return above * payroll / pool, payroll / pool
+
+
+# =============================================================================
+# VALUATION
+# =============================================================================
+
+def keeper_values(values, hits, dropped, discount=DISCOUNT, decline=DECLINE, season=CURRENT_SEASON):
+    """Per-row, per-year surplus arrays for seasons >= season.
+
+    values (rows,) is each row's current $M value, hits (rows, years) the
+    contract hits. Returns a dict of rows x years arrays: 'value', 'hit',
+    'surplus' and 'discounted_hit' (both discounted) plus 'years' and
+    'dropped'.
+    """
+    future = HIT_YEARS >= season
+    years = HIT_YEARS[future]
+    hit = hits[:, future]
+    active = ~np.isnan(hit)
+    ahead = years - season
+    value = np.where(active & ~dropped[:, None],
+                     np.clip(np.nan_to_num(values), 0, None)[:, None] * (1 - decline) ** ahead, 0.0)
+    hit = np.nan_to_num(hit)
+    factor = (1 + discount) ** -ahead.astype(float)
+    return {'years': years, 'value': value, 'hit': hit, 'surplus': (value - hit) * factor,
+            'discounted_hit': hit * factor, 'dropped': dropped}
+
+
+def scenario_totals(valuation, franchise_codes, n_franchises, keep, release_cost=RELEASE_COST):
+    """Franchise totals for keep masks.
+
+    keep is (scenarios, rows) boolean. Kept rows count their discounted
+    surplus and hits; released rows count -release_cost of their discounted
+    hits. Returns (surplus (scenarios, franchises), hits (scenarios, franchises, years)).
+    """
+    keep = np.atleast_2d(keep).astype(float)
+    release = 1.0 - keep
+    onehot = np.zeros((len(franchise_codes), n_franchises))
+    valid = franchise_codes >= 0
+    onehot[np.flatnonzero(valid), franchise_codes[valid]] = 1.0
+
+    row_surplus = valuation['surplus'].sum(axis=1)
+    row_release = -release_cost * valuation['discounted_hit'].sum(axis=1)
+    surplus = (keep * row_surplus + release * row_release) @ onehot
+    owed = keep[:, :, None] * valuation['hit'] + release_cost * release[:, :, None] * valuation['hit']
+    committed = np.einsum('srt,rf->sft', owed, onehot)
+    return surplus, committed
+
+
+def best_keeps(valuation, release_cost=RELEASE_COST):
+    """Keep a row unless releasing it costs less than its (negative) surplus; dead money stays."""
+    keep_value = valuation['surplus'].sum(axis=1)
+    release_value = -release_cost * valuation['discounted_hit'].sum(axis=1)
+    return (keep_value >= release_value) | valuation['dropped']
+
+
+# =============================================================================
+# REPORT
+# =============================================================================
+
+def print_league(rosters, valuation, franchises, codes, release_cost):
+    n = len(franchises)
+    under = rosters['Franchise'].notna().to_numpy()
+    keep_all = under[None, :]
+    optimal = (best_keeps(valuation, release_cost) & under)[None, :]
+    start = time.perf_counter()
+    current, committed = scenario_totals(valuation, codes, n, keep_all, release_cost)
+    best, best_committed = scenario_totals(valuation, codes, n, optimal, release_cost)
+    elapsed = time.perf_counter() - start
+
+    years = valuation['years']
+    print("\n" + "=" * 80)
+    print("FRANCHISE KEEPER SURPLUS (discounted $M; hits in $M)")
+    print("=" * 80)
+    print(f"{'Franchise':<30} {'Keep all':>9} {'Best':>8} {'Cuts':>5} "
+          + ' '.join(f"{y:>6}" for y in years[:3]))
+    order = np.argsort(-best[0])
+    cuts = np.bincount(codes[under & ~optimal[0]], minlength=n)
+    for f in order:
+        print(f"{franchises[f]:<30} {current[0, f]:>9.1f} {best[0, f]:>8.1f} {cuts[f]:>5} "
+              + ' '.join(f"{h:>6.1f}" for h in best_committed[0, f, :3]))
+    print(f"\nScored 2 scenarios x {len(rosters):,} roster rows in {elapsed * 1000:.2f} ms")
+
+
+def print_franchise(rosters, valuation, values, franchise, releases, franchises, codes, release_cost):
+    """Row-by-row contracts, then the what-if for releases (a PlayerIndex.resolve report)."""
+    rows = np.flatnonzero(rosters['Franchise'].to_numpy() == franchise)
+    surplus = valuation['surplus'].sum(axis=1)
+    print("\n" + "=" * 80)
+    print(f"{franchise.upper()}: CONTRACTS BY DISCOUNTED SURPLUS")
+    print("=" * 80)
+    years = valuation['years']
+    print(f"{'Player':<25} {'Contract':<12} {'Value':>6} " + ' '.join(f"{y:>6}" for y in years[:3])
+          + f" {'Surplus':>8}")
+    for row in rows[np.argsort(-surplus[rows])]:
+        kind = rosters.at[row, 'Contract Type']
+        print(f"{rosters.at[row, 'Player Name']:<25} {kind if isinstance(kind, str) else '':<12} "
+              f"{np.nan_to_num(values[row]):>6.1f} "
+              + ' '.join(f"{h:>6.1f}" for h in valuation['hit'][row, :3]) + f" {surplus[row]:>8.1f}")
+
+    if not len(releases):
+        return
+    keep = rosters['Franchise'].notna().to_numpy().copy()
+    names = rosters['Player Name'].to_numpy()
+    ids = rosters['PlayerId'].to_numpy()
+    baseline = keep.copy()
+    for name, player_id in zip(releases['Input_Name'], releases['PlayerId']):
+        # Roster rows that did not resolve can still be released by their exact name
+        same = (names == name) | (ids == player_id) if player_id is not None else names == name
+        match = np.flatnonzero(same & (rosters['Franchise'].to_numpy() == franchise))
+        if not len(match):
+            print(f"{name} is not on {franchise}'s roster")
+            sys.exit(1)
+        keep[match] = False
+    f = franchises.index(franchise)
+    surplus, committed = scenario_totals(valuation, codes, len(franchises), np.stack([baseline, keep]),
+                                         release_cost)
+    print(f"\nWhat-if: release {', '.join(releases['Input_Name'])}")
+    print(f"  Surplus  {surplus[0, f]:>8.1f} -> {surplus[1, f]:>8.1f}  ({surplus[1, f] - surplus[0, f]:+.1f})")
+    for i, year in enumerate(years):
+        print(f"  {year} hits {committed[0, f, i]:>7.1f} -> {committed[1, f, i]:>7.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--franchise', help='show one franchise row by row')
+    parser.add_argument('--release', action='append', default=[],
+                        help='what-if: release this player from --franchise (repeatable)')
+    parser.add_argument('--discount', type=float, default=DISCOUNT)
+    parser.add_argument('--decline', type=float, default=DECLINE)
+    parser.add_argument('--release-cost', type=float, default=RELEASE_COST)
+    args = parser.parse_args()
+
+    table = player_cache.load_player_table()
+    index = player_identity.PlayerIndex(table)
+    rosters, hits = load_contracts(index)
+    above = dollar_values(table)
+    dollars, per_sgp = price_values(above, rosters, hits)
+    values = rosters['PlayerId'].astype(str).map(dollars).to_numpy(dtype=float)
+    dropped = (rosters['Contract Type'] == 'Dropped').to_numpy()
+
+    franchises = sorted(rosters['Franchise'].dropna().unique())
+    if args.franchise and args.franchise not in franchises:
+        print(f"Unknown franchise: {args.franchise}")
+        print(f"Available: {', '.join(franchises)}")
+        sys.exit(1)
+    codes = rosters['Franchise'].map({f: i for i, f in enumerate(franchises)}).fillna(-1).to_numpy(dtype=int)
+
+    start = time.perf_counter()
+    valuation = keeper_values(values, hits, dropped, args.discount, args.decline)
+    elapsed = time.perf_counter() - start
+    print(f"\nValued {len(rosters):,} roster rows x {len(valuation['years'])} seasons in {elapsed * 1000:.2f} ms "
+          f"(${per_sgp:.2f}M per SGP above replacement)")
+
+    if args.franchise:
+        releases = index.resolve(pd.Series(args.release, dtype=object), 'release')
+        print_franchise(rosters, valuation, values, args.franchise, releases, franchises, codes,
+                        args.release_cost)
+    else:
+        print_league(rosters, valuation, franchises, codes, args.release_cost)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+"""
+Live draft mode: mark picks as they happen and query the best available.
+
+Every strategy board is built once at startup. For each strategy and
+position (Batter / SP / RP, plus all batters / all pitchers for tiers) the
+players are kept in score order behind a Fenwick tree of availability bits,
+so marking a pick, undoing it, or asking for the k-th best available player
+is O(log n). Replacement levels (the best player left once every team has
+filled its slots at a position) and tier cut lines (the 90/70/50th percentile
+of available scores) are order-statistic lookups on the same trees, so they
+stay current after every pick without recomputing the board.
+
+Commands (type `help` at the prompt):
+    take Juan Soto @ Tyler Hart   another franchise drafts a player
+    mine Pete Alonso              we draft a player
+    undo                          revert the last pick
+    best [batter|sp|rp|p] [n]     best available for the current strategy
+    next                          best available per strategy and position
+    repl                          replacement levels and tier cut lines
+    strategy [key]                show or switch the current strategy
+    roster / log                  our picks / every pick so far
+
+Usage:
+    python live_draft.py                         # start with volume_power
+    python live_draft.py balanced --picks draft_picks.csv   # resume and append picks
+    python live_draft.py --bench                 # time picks and queries over the full boards
+"""
+
+import argparse
+import cmd
+import csv
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+import draft_board_analysis as dba
+import positions
+import roto
+from player_identity import PlayerIndex
+
+LEAGUE_SIZE = roto.LEAGUE_SIZE
+ROSTER_SLOTS = {'Batter': roto.ROSTER_BATTERS,
+                'SP': positions.LINEUP_SLOTS['SP'], 'RP': positions.LINEUP_SLOTS['RP']}
+MY_FRANCHISE = 'Me'
+TIER_QUANTILES = [0.90, 0.70, 0.50]
+LOG_COLUMNS = ['Pick', 'Name', 'PlayerId', 'Player_Type', 'Franchise']
+
+POSITION_ALIASES = {
+    'b': 'Batter', 'batter': 'Batter', 'h': 'Batter', 'hitter': 'Batter',
+    'sp': 'SP', 'rp': 'RP', 'p': 'Pitcher', 'pitcher': 'Pitcher',
+}
+SIDES = {'Batter': 'Batter', 'SP': 'Pitcher', 'RP': 'Pitcher'}
+
+# =============================================================================
+# ORDER-STATISTIC INDEX
+# =============================================================================
+
+class RankedPool:
+    """Players in descending score order with O(log n) take/restore/k-th available."""
+
+    def __init__(self, players, scores, universe_size):
+        self.players = np.asarray(players)
+        self.scores = np.asarray(scores, dtype=float)
+        self.size = len(self.players)
+        self.available = self.size
+        self.slot = np.full(universe_size, -1)
+        self.slot[self.players] = np.arange(self.size)
+
+        # Fenwick tree over all-ones, built in O(n)
+        self.tree = np.zeros(self.size + 1, dtype=np.int64)
+        self.tree[1:] = 1
+        for i in range(1, self.size + 1):
+            parent = i + (i & -i)
+            if parent <= self.size:
+                self.tree[parent] += self.tree[i]
+        self.top_bit = 1 << self.size.bit_length() if self.size else 0
+
+    def __contains__(self, player):
+        return self.slot[player] >= 0
+
+    def _update(self, i, delta):
+        i += 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+        self.available += delta
+
+    def take(self, player):
+        self._update(self.slot[player], -1)
+
+    def restore(self, player):
+        self._update(self.slot[player], 1)
+
+    def kth(self, k):
+        """Index (into players/scores) of the k-th best available, 1-based, or -1."""
+        if k < 1 or k > self.available:
+            return -1
+        pos, step = 0, self.top_bit
+        while step:
+            nxt = pos + step
+            if nxt <= self.size and self.tree[nxt] < k:
+                pos = nxt
+                k -= self.tree[nxt]
+            step >>= 1
+        return pos
+
+    def top(self, n):
+        """[(player, score)] for the n best available."""
+        found = []
+        for k in range(1, min(n, self.available) + 1):
+            i = self.kth(k)
+            found.append((self.players[i], self.scores[i]))
+        return found
+
+    def score_at(self, k):
+        i = self.kth(k)
+        return self.scores[i] if i >= 0 else np.nan
+
+    def quantile(self, q):
+        """Linear-interpolated quantile of available scores (pandas' default)."""
+        n = self.available
+        if n == 0:
+            return np.nan
+        pos = q * (n - 1)            # ascending position
+        lo, frac = int(np.floor(pos)), pos - np.floor(pos)
+        low = self.score_at(n - lo)  # k-th best counts from the top
+        high = self.score_at(n - min(lo + 1, n - 1))
+        return low + (high - low) * frac
+
+# =============================================================================
+# DRAFT STATE
+# =============================================================================
+
+class LiveDraft:
+    """Draft boards for every strategy plus the picks made so far."""
+
+    def __init__(self, boards, league_size=LEAGUE_SIZE, roster_slots=ROSTER_SLOTS):
+        self.league_size = league_size
+        self.roster_slots = dict(roster_slots)
+
+        # One row per player across all boards (reliever boards add RPs)
+        frames = pd.concat(list(boards.values()), ignore_index=True)
+        self.players = frames.drop_duplicates(['PlayerId', 'Player_Type']).reset_index(drop=True)
+        key = pd.MultiIndex.from_frame(self.players[['PlayerId', 'Player_Type']])
+        self.names = self.players['Name'].to_numpy(dtype=object)
+        self.teams = self.players['Team'].astype(str).to_numpy(dtype=object)
+        self.positions = positions.roster_groups(self.players)
+        self.index = PlayerIndex(self.players)
+        n = len(self.players)
+
+        self.pools = {}
+        for strategy, board in boards.items():
+            ids = key.get_indexer(pd.MultiIndex.from_frame(board[['PlayerId', 'Player_Type']]))
+            scores = board['Strategy_Score'].to_numpy(dtype=float)
+            groups_of = positions.roster_groups(board)
+            groups = {pos: groups_of == pos for pos in ROSTER_SLOTS}
+            groups['Pitcher'] = groups_of != 'Batter'
+            groups['All'] = np.ones(len(board), dtype=bool)
+            self.pools[strategy] = {name: RankedPool(ids[mask], scores[mask], n)
+                                    for name, mask in groups.items()}
+
+        self.taken = np.zeros(n, dtype=bool)
+        self.picks = []  # [(player, franchise)]
+        self.drafted_at = {pos: 0 for pos in ROSTER_SLOTS}
+
+    def _pools_with(self, player):
+        for pools in self.pools.values():
+            for pool in pools.values():
+                if player in pool:
+                    yield pool
+
+    def find(self, name):
+        """(player, match) for a typed name; player is -1 when unresolved."""
+        match = self.index.lookup(name)
+        return (-1 if match.row is None else match.row), match
+
+    def pick(self, player, franchise):
+        if self.taken[player]:
+            raise ValueError(f"{self.names[player]} is already taken")
+        for pool in self._pools_with(player):
+            pool.take(player)
+        self.taken[player] = True
+        self.picks.append((player, franchise))
+        self.drafted_at[self.positions[player]] += 1
+
+    def undo(self):
+        """Revert the last pick; returns it, or None when no picks remain."""
+        if not self.picks:
+            return None
+        player, franchise = self.picks.pop()
+        for pool in self._pools_with(player):
+            pool.restore(player)
+        self.taken[player] = False
+        self.drafted_at[self.positions[player]] -= 1
+        return player, franchise
+
+    def mine(self):
+        return [player for player, franchise in self.picks if franchise == MY_FRANCHISE]
+
+    def remaining_demand(self, position):
+        """Slots still open league-wide at a position."""
+        return max(self.league_size * self.roster_slots[position] - self.drafted_at[position], 0)
+
+    def replacement_level(self, strategy, position):
+        """Score of the best player left after every open slot at the position is filled."""
+        return self.pools[strategy][position].score_at(self.remaining_demand(position) + 1)
+
+    def tier_cuts(self, strategy, side):
+        """Current Tier 1/2/3 score thresholds among available batters or pitchers."""
+        pool = self.pools[strategy][side]
+        return [pool.quantile(q) for q in TIER_QUANTILES]
+
+    def tier(self, strategy, player, score):
+        cuts = self.tier_cuts(strategy, SIDES[self.positions[player]])
+        for label, cut in zip(dba.TIER_LABELS, cuts):
+            if score >= cut:
+                return label
+        return dba.TIER_DEPTH
+
+# =============================================================================
+# REPL
+# =============================================================================
+
+class DraftShell(cmd.Cmd):
+    intro = "Live draft mode. Type help or ? to list commands."
+
+    def __init__(self, draft, strategy, log_path=None):
+        super().__init__()
+        self.draft = draft
+        self.strategy = strategy
+        self.log_path = log_path
+        self._update_prompt()
+
+    def _update_prompt(self):
+        self.prompt = f"[{self.strategy} | pick {len(self.draft.picks) + 1}] > "
+
+    def _resolve(self, name):
+        player, match = self.draft.find(name)
+        if player < 0:
+            print(f"No player found for '{name}'")
+            return -1
+        if match.method != 'exact':
+            print(f"  matched '{name}' -> {self.draft.names[player]} ({match.method}, "
+                  f"conf={match.confidence:.2f})")
+        return player
+
+    def _record(self, name, franchise):
+        player = self._resolve(name)
+        if player < 0:
+            return
+        try:
+            self.draft.pick(player, franchise)
+        except ValueError as e:
+            print(e)
+            return
+        d = self.draft
+        print(f"  #{len(d.picks)} {d.names[player]} ({d.teams[player]}, {d.positions[player]}) -> {franchise}")
+        self._write_log(append=True)
+        self._update_prompt()
+
+    def _write_log(self, append):
+        """Append the newest pick to the --picks log, or rewrite it after an undo."""
+        if not self.log_path:
+            return
+        d = self.draft
+        picks = d.picks[-1:] if append else d.picks
+        first = len(d.picks) - len(picks) + 1
+        write_header = not append or not os.path.exists(self.log_path)
+        with open(self.log_path, 'a' if append else 'w', newline='') as f:
+            writer = csv.writer(f)
+            if write_header:
+                writer.writerow(LOG_COLUMNS)
+            for k, (player, franchise) in enumerate(picks, first):
+                writer.writerow([k, d.names[player], d.players['PlayerId'].iat[player],
+                                 d.players['Player_Type'].iat[player], franchise])
+
+    def do_take(self, arg):
+        """take NAME [@ FRANCHISE]: another franchise drafts a player"""
+        name, _, franchise = arg.partition('@')
+        self._record(name.strip(), franchise.strip() or 'Other')
+
+    def do_mine(self, arg):
+        """mine NAME: we draft a player"""
+        self._record(arg.strip(), MY_FRANCHISE)
+
+    def do_undo(self, arg):
+        """undo: revert the last pick"""
+        last = self.draft.undo()
+        if last is None:
+            print("No picks to undo")
+            return
+        print(f"  undid {self.draft.names[last[0]]} -> {last[1]}")
+        self._write_log(append=False)
+        self._update_prompt()
+
+    def do_best(self, arg):
+        """best [batter|sp|rp|p] [N]: best available for the current strategy"""
+        position, n = 'All', 15
+        for token in arg.split():
+            if token.isdigit():
+                n = int(token)
+            elif token.lower() in POSITION_ALIASES:
+                position = POSITION_ALIASES[token.lower()]
+            else:
+                print(f"Unknown position '{token}'")
+                return
+        d = self.draft
+        print(f"{'#':>3} {'Name':<25} {'Team':<5} {'Pos':<7} {'Score':>6} {'VOR':>6}  Tier")
+        for k, (player, score) in enumerate(d.pools[self.strategy][position].top(n), 1):
+            pos = d.positions[player]
+            vor = score - d.replacement_level(self.strategy, pos)
+            print(f"{k:>3} {d.names[player]:<25} {d.teams[player]:<5} {pos:<7} {score:>6.2f} "
+                  f"{vor:>6.2f}  {d.tier(self.strategy, player, score)}")
+
+    def do_next(self, arg):
+        """next: best available player per strategy and position"""
+        d = self.draft
+        print(f"{'Strategy':<15} " + ' '.join(f'{pos:<28}' for pos in ROSTER_SLOTS))
+        for strategy, pools in d.pools.items():
+            cells = []
+            for pos in ROSTER_SLOTS:
+                best = pools[pos].top(1)
+                cells.append(f'{d.names[best[0][0]]} ({best[0][1]:.2f})' if best else '-')
+            print(f"{strategy:<15} " + ' '.join(f'{cell:<28}' for cell in cells))
+
+    def do_repl(self, arg):
+        """repl: replacement levels and tier cut lines for the current strategy"""
+        d = self.draft
+        print(f"{'Position':<8} {'Drafted':>7} {'Open':>5} {'Left':>5} {'Replacement':>12}")
+        for pos in ROSTER_SLOTS:
+            print(f"{pos:<8} {d.drafted_at[pos]:>7} {d.remaining_demand(pos):>5} "
+                  f"{d.pools[self.strategy][pos].available:>5} {d.replacement_level(self.strategy, pos):>12.2f}")
+        for side in ('Batter', 'Pitcher'):
+            cuts = ', '.join(f'{label.split(" - ")[0]} >= {cut:.2f}'
+                             for label, cut in zip(dba.TIER_LABELS, d.tier_cuts(self.strategy, side)))
+            print(f"{side} tiers: {cuts}")
+
+    def do_strategy(self, arg):
+        """strategy [KEY]: show or switch the current strategy"""
+        key = arg.strip()
+        if not key:
+            print(f"Current: {self.strategy}. Available: {', '.join(self.draft.pools)}")
+        elif key not in self.draft.pools:
+            print(f"Unknown strategy: {key}")
+        else:
+            self.strategy = key
+            self._update_prompt()
+
+    def do_roster(self, arg):
+        """roster: our picks"""
+        d = self.draft
+        mine = d.mine()
+        counts = {pos: sum(d.positions[p] == pos for p in mine) for pos in ROSTER_SLOTS}
+        print(', '.join(f'{pos} {counts[pos]}/{d.roster_slots[pos]}' for pos in ROSTER_SLOTS))
+        for player in mine:
+            print(f"  {d.names[player]:<25} {d.teams[player]:<5} {d.positions[player]}")
+
+    def do_log(self, arg):
+        """log: every pick so far"""
+        for k, (player, franchise) in enumerate(self.draft.picks, 1):
+            print(f"{k:>3} {self.draft.names[player]:<25} {self.draft.positions[player]:<7} {franchise}")
+
+    def do_quit(self, arg):
+        """quit: leave live draft mode"""
+        return True
+
+    do_EOF = do_quit
+
+    def emptyline(self):
+        pass
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def load_picks(draft, path):
+    """Replay a --picks log written by an earlier session."""
+    if not os.path.exists(path):
+        return
+    log = pd.read_csv(path, dtype={'PlayerId': str})
+    key = pd.MultiIndex.from_frame(draft.players[['PlayerId', 'Player_Type']])
+    rows = key.get_indexer(pd.MultiIndex.from_frame(log[['PlayerId', 'Player_Type']]))
+    for row, name, franchise in zip(rows, log['Name'], log['Franchise']):
+        if row < 0:
+            print(f"Skipping {name}: not on the current boards")
+        elif not draft.taken[row]:
+            draft.pick(row, franchise)
+    print(f"Replayed {len(draft.picks)} picks from {path}")
+
+
+def bench(draft):
+    """Time every pick of an ADP-order draft plus best/replacement/tier queries."""
+    strategy = next(iter(draft.pools))
+    order = np.argsort(draft.players['ADP'].to_numpy(dtype=float), kind='stable')
+    pick_times, query_times = [], []
+    for player in order:
+        start = time.perf_counter()
+        draft.pick(player, 'Other')
+        pick_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for pos in ROSTER_SLOTS:
+            draft.pools[strategy][pos].top(1)
+            draft.replacement_level(strategy, pos)
+        draft.tier_cuts(strategy, 'Batter')
+        draft.tier_cuts(strategy, 'Pitcher')
+        query_times.append(time.perf_counter() - start)
+
+    print(f"{len(order)} picks across {len(draft.pools)} strategies")
+    print(f"  pick:  median {np.median(pick_times) * 1e6:.1f} us, max {max(pick_times) * 1e6:.1f} us")
+    print(f"  best + replacement + tiers:  median {np.median(query_times) * 1e6:.1f} us, "
+          f"max {max(query_times) * 1e6:.1f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('strategy', nargs='?', default='volume_power')
+    parser.add_argument('--picks', help='CSV log of picks to replay at start and append to')
+    parser.add_argument('--bench', action='store_true', help='time picks and queries, then exit')
+    args = parser.parse_args()
+
+    if args.strategy not in dba.STRATEGIES:
+        print(f"Unknown strategy: {args.strategy}")
+        print(f"Available: {', '.join(dba.STRATEGIES)}")
+        raise SystemExit(1)
+
+    batters, pitchers = dba.load_players()
+    boards = dba.build_boards(batters, pitchers, list(dba.STRATEGIES))
+    draft = LiveDraft(boards)
+
+    if args.bench:
+        bench(draft)
+        return
+    if args.picks:
+        load_picks(draft, args.picks)
+    DraftShell(draft, args.strategy, args.picks).cmdloop()
+
+
+if __name__ == '__main__':
+    main()
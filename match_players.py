@@ -3,14 +3,33 @@
 Master player database: FanGraphs projections + blocked status + roster/contract info.
 """
 
+import sys
+
+import numpy as np
 import pandas as pd
 
-# Load data sources
-batters = pd.read_csv('fangraphs-leaderboard-projections.csv')
-pitchers = pd.read_csv('pitchers.csv')
-blocked = pd.read_csv('blocked_players.csv')
-rosters = pd.read_csv('rosters.csv', skiprows=2)
-rosters.columns = rosters.columns.str.strip()
+import joins
+import player_cache
+import player_identity
+import tracing
+
+# Roster salary columns and the names they get on the player table
+SALARY_COLUMNS = {
+    'Salary': 'Salary_Clean',
+    '2025 Salary Hit': 'Salary_2025',
+    '2026 Salary Hit': 'Salary_2026',
+    '2027 Salary Hit': 'Salary_2027',
+    '2028 Salary Hit': 'Salary_2028',
+}
+
+# Counting stats summed per player type
+# Batters: HR + R + RBI + SB
+# Pitchers: W + QS + SV + HLD + SO
+COUNTING_STATS = {
+    'Batter': ['HR', 'R', 'RBI', 'SB'],
+    'Pitcher': ['W', 'QS', 'SV', 'HLD', 'SO'],
+}
+
 
 # Normalize names for matching
 def normalize(name):
@@ -18,138 +37,219 @@ def normalize(name):
         return ''
     return name.lower().strip().replace('.', '').replace("'", "").replace(' jr', '').replace(' sr', '')
 
-# Add player type
-batters['Player_Type'] = 'Batter'
-pitchers['Player_Type'] = 'Pitcher'
-
-# Clean up duplicates/bad data:
-# - Remove Ohtani from pitchers (keep as batter)
-# - Remove Juan Soto from pitchers
-# - Remove Dodgers Max Muncy (keep A's Max Muncy)
-# - Remove Edwin Diaz from batters (keep as pitcher)
-pitchers = pitchers[~pitchers['NameASCII'].isin(['Shohei Ohtani', 'Juan Soto'])]
-batters = batters[~((batters['NameASCII'] == 'Max Muncy') & (batters['Team'] == 'LAD'))]
-batters = batters[~(batters['NameASCII'] == 'Edwin Diaz')]
-
-# Add name_norm for matching
-batters['name_norm'] = batters['NameASCII'].apply(normalize)
-pitchers['name_norm'] = pitchers['NameASCII'].apply(normalize)
-blocked['name_norm'] = blocked['Player'].apply(normalize)
-rosters['name_norm'] = rosters['Player Name'].apply(normalize)
-
-# Union batters and pitchers (keep all columns)
-projections = pd.concat([batters, pitchers], ignore_index=True)
-
-print(f"Total projections: {len(projections)} ({len(batters)} batters + {len(pitchers)} pitchers)")
-
-# Left join blocked status
-blocked_cols = ['name_norm', 'Player', 'Franchise', 'Block_Type']
-blocked = blocked.rename(columns={'Franchise': 'Blocking_Franchise', 'Player': 'Blocked_Player'})
-projections = projections.merge(
-    blocked[['name_norm', 'Blocking_Franchise', 'Block_Type']],
-    on='name_norm',
-    how='left'
-)
-
-# Left join roster/contract info
-roster_cols = ['name_norm', 'Franchise', 'Contract Type', 'Salary',
-               'Contract Length', 'Contract Starts', 'Contract Ends',
-               '2025 Salary Hit', '2026 Salary Hit', '2027 Salary Hit', '2028 Salary Hit']
-projections = projections.merge(
-    rosters[roster_cols],
-    on='name_norm',
-    how='left'
-)
-
-# Rename for clarity
-projections = projections.rename(columns={'Franchise': 'Rostered_By'})
-
-# Clean salary columns (remove $ and commas, convert to numeric)
-def clean_salary(val):
-    if pd.isna(val) or val == '' or val == ' $ -   ':
-        return None
-    val_str = str(val).replace('$', '').replace(',', '').strip()
-    if val_str == '' or val_str == 'YP' or val_str == '-':
-        return None
+
+@tracing.traced('load.sources')
+def load_sources():
+    """Read the projection, block and roster CSVs."""
+    batters = pd.read_csv('fangraphs-leaderboard-projections.csv')
+    pitchers = pd.read_csv('pitchers.csv')
+    blocked = pd.read_csv('blocked_players.csv')
+    rosters = pd.read_csv('rosters.csv', skiprows=2)
+    rosters.columns = rosters.columns.str.strip()
+    return batters, pitchers, blocked, rosters
+
+
+@tracing.traced('merge')
+def merge_sources(batters, pitchers, blocked, rosters, strict=False, extra_names=None):
+    """Union batters and pitchers, then attach block status and contracts.
+
+    Block and roster rows are joined on the PlayerId that player_identity
+    resolves for them, through joins.guarded_left_join so a repeated PlayerId
+    cannot multiply projection rows (strict=True raises instead).
+    extra_names ({source: names}) are resolved into the report with the same
+    index. Returns (projections, identity match report).
+    """
+    # Add player type
+    batters['Player_Type'] = 'Batter'
+    pitchers['Player_Type'] = 'Pitcher'
+
+    # Clean up duplicates/bad data:
+    # - Remove Ohtani from pitchers (keep as batter)
+    # - Remove Juan Soto from pitchers
+    # - Remove Dodgers Max Muncy (keep A's Max Muncy)
+    # - Remove Edwin Diaz from batters (keep as pitcher)
+    pitchers = pitchers[~pitchers['NameASCII'].isin(['Shohei Ohtani', 'Juan Soto'])]
+    batters = batters[~((batters['NameASCII'] == 'Max Muncy') & (batters['Team'] == 'LAD'))
+                      & ~(batters['NameASCII'] == 'Edwin Diaz')]
+
+    # Add name_norm for matching
+    batters['name_norm'] = batters['NameASCII'].apply(normalize)
+    pitchers['name_norm'] = pitchers['NameASCII'].apply(normalize)
+
+    # Union batters and pitchers (keep all columns)
+    projections = pd.concat([batters, pitchers], ignore_index=True)
+
+    print(f"Total projections: {len(projections)} ({len(batters)} batters + {len(pitchers)} pitchers)")
+
+    # Resolve block and roster names to FanGraphs PlayerIds
+    index = player_identity.PlayerIndex(projections)
+    blocked_ids = index.resolve(blocked['Player'], 'blocked')
+    roster_ids = index.resolve(rosters['Player Name'], 'rosters')
+    blocked['PlayerId'] = blocked_ids['PlayerId']
+    rosters['PlayerId'] = roster_ids['PlayerId']
+    report = pd.concat([blocked_ids, roster_ids[rosters['Player Name'].notna()]]
+                       + [index.resolve(names, source) for source, names in (extra_names or {}).items()])
+
+    # Left join blocked status
+    blocked = blocked.rename(columns={'Franchise': 'Blocking_Franchise', 'Player': 'Blocked_Player'})
+    projections = joins.guarded_left_join(
+        projections,
+        blocked[['PlayerId', 'Blocking_Franchise', 'Block_Type']],
+        on='PlayerId', name='blocked', strict=strict
+    )
+
+    # Left join roster/contract info; current contracts win over the
+    # transaction-history rows (no Franchise) when a player appears in both
+    roster_cols = ['PlayerId', 'Franchise', 'Contract Type', 'Salary',
+                   'Contract Length', 'Contract Starts', 'Contract Ends',
+                   '2025 Salary Hit', '2026 Salary Hit', '2027 Salary Hit', '2028 Salary Hit']
+    rosters = rosters.sort_values('Franchise', key=lambda f: f.isna(), kind='stable')
+    projections = joins.guarded_left_join(
+        projections, rosters[roster_cols],
+        on='PlayerId', name='rosters', strict=strict
+    )
+
+    # Rename for clarity
+    return projections.rename(columns={'Franchise': 'Rostered_By'}), report
+
+
+def parse_salary(values):
+    """Vectorized salary parsing: ' $ 34,500,000 ' -> 34500000.0.
+
+    Blanks, ' $ -   ', 'YP' and anything else non-numeric become NaN. Salary
+    strings repeat heavily, so only the distinct values are parsed.
+    """
+    codes, uniques = pd.factorize(values)
+    cleaned = pd.Series(uniques).astype('string').str.replace(r'[$,]', '', regex=True).str.strip()
+    parsed = np.append(pd.to_numeric(cleaned, errors='coerce').to_numpy(dtype=float), np.nan)
+    return pd.Series(parsed[codes], index=values.index)
+
+
+def counting_stats(projections):
+    """Sum the counting categories for each row's Player_Type.
+
+    Columns are added left to right, so a missing stat leaves the total NaN
+    just as the per-row version did.
+    """
+    total = pd.Series(np.nan, index=projections.index)
+    for player_type, cols in COUNTING_STATS.items():
+        mask = (projections['Player_Type'] == player_type).to_numpy()
+        stats = projections.loc[mask, cols].apply(pd.to_numeric, errors='coerce')
+        type_total = stats[cols[0]]
+        for col in cols[1:]:
+            type_total = type_total + stats[col]
+        total[mask] = type_total
+    return total
+
+
+@tracing.traced('derive')
+def derive_columns(projections):
+    """Add cleaned salaries, counting stats and value ratios as new columns."""
+    derived = {}
+
+    # Clean salary columns (remove $ and commas, convert to numeric)
+    for source, target in SALARY_COLUMNS.items():
+        derived[target] = parse_salary(projections[source])
+
+    derived['Counting_Stats'] = counting_stats(projections)
+
+    # Value calculations (per million dollars)
+    salary_m = derived['Salary_2026'] / 1_000_000
+    derived['FPTS_per_M'] = projections['FPTS'] / salary_m
+    derived['Counting_per_M'] = derived['Counting_Stats'] / salary_m
+    derived['WAR_per_M'] = projections['WAR'] / salary_m
+
+    # Value calculations (per ADP - lower ADP is better, so FPTS/ADP shows value)
+    derived['FPTS_per_ADP'] = projections['FPTS'] / projections['ADP']
+    derived['Counting_per_ADP'] = derived['Counting_Stats'] / projections['ADP']
+    derived['WAR_per_ADP'] = projections['WAR'] / projections['ADP']
+
+    # ADP per salary (how much ADP you get per dollar - higher = better value in draft)
+    derived['ADP_per_M'] = projections['ADP'] / salary_m
+
+    return pd.concat([projections, pd.DataFrame(derived, index=projections.index)], axis=1)
+
+
+def build_player_table(strict=False):
+    """Load, merge and derive the full master player table."""
+    batters, pitchers, blocked, rosters = load_sources()
+    projections, _ = merge_sources(batters, pitchers, blocked, rosters, strict=strict)
+    return derive_columns(projections)
+
+
+def print_summary(projections):
+    print(f"Players with block status: {projections['Block_Type'].notna().sum()}")
+    print(f"Players on rosters: {projections['Rostered_By'].notna().sum()}")
+    print(f"Full blocks: {(projections['Block_Type'] == 'Full').sum()}")
+    print(f"Partial blocks: {(projections['Block_Type'] == 'Partial').sum()}")
+
+
+def print_reports(projections):
+    # Show top available players (not full blocked, sorted by FPTS)
+    print("\n" + "="*80)
+    print("TOP 25 AVAILABLE PLAYERS (not full-blocked, by FPTS)")
+    print("="*80)
+    available = projections[projections['Block_Type'] != 'Full'].sort_values('FPTS', ascending=False).head(25)
+    for _, row in available.iterrows():
+        block = row['Block_Type'] if pd.notna(row['Block_Type']) else '-'
+        rostered = row['Rostered_By'] if pd.notna(row['Rostered_By']) else 'Free Agent'
+        print(f"{row['Name']:<25} {row['Player_Type']:<7} FPTS: {row['FPTS']:>7.0f}  Block: {block:<7}  Roster: {rostered}")
+
+    # Show best value by FPTS per dollar (rostered players only)
+    print("\n" + "="*80)
+    print("TOP 20 VALUE PLAYS (FPTS per $M, rostered players with 2026 salary)")
+    print("="*80)
+    has_salary = projections[(projections['Salary_2026'].notna()) & (projections['Salary_2026'] > 0)]
+    best_value = has_salary.sort_values('FPTS_per_M', ascending=False).head(20)
+    for _, row in best_value.iterrows():
+        sal_m = row['Salary_2026'] / 1_000_000
+        print(f"{row['Name']:<25} {row['Player_Type']:<7} FPTS: {row['FPTS']:>6.0f}  ${sal_m:>5.1f}M  FPTS/$M: {row['FPTS_per_M']:>6.1f}")
+
+    # Show best value by FPTS per ADP
+    print("\n" + "="*80)
+    print("TOP 20 DRAFT VALUE (FPTS per ADP)")
+    print("="*80)
+    has_adp = projections[(projections['ADP'].notna()) & (projections['ADP'] > 0)]
+    best_draft = has_adp.sort_values('FPTS_per_ADP', ascending=False).head(20)
+    for _, row in best_draft.iterrows():
+        block = row['Block_Type'] if pd.notna(row['Block_Type']) else '-'
+        print(f"{row['Name']:<25} {row['Player_Type']:<7} FPTS: {row['FPTS']:>6.0f}  ADP: {row['ADP']:>6.1f}  FPTS/ADP: {row['FPTS_per_ADP']:>6.1f}  Block: {block}")
+
+
+def main(argv):
+    argv = tracing.enable_from_argv(argv)
+
+    # --strict: fail if a block/roster PlayerId repeats instead of keeping one row
+    strict = '--strict' in argv
+
+    batters, pitchers, blocked, rosters = load_sources()
+    # Resolve our own roster too, so the report covers every name source
+    my_players = pd.read_csv('my_players.csv')
     try:
-        return float(val_str)
-    except ValueError:
-        return None
+        projections, report = merge_sources(batters, pitchers, blocked, rosters, strict=strict,
+                                            extra_names={'my_players': my_players['Player']})
+    except joins.JoinFanOutError as e:
+        print(f"Strict merge failed: {e}")
+        sys.exit(1)
 
-projections['Salary_Clean'] = projections['Salary'].apply(clean_salary)
-projections['Salary_2025'] = projections['2025 Salary Hit'].apply(clean_salary)
-projections['Salary_2026'] = projections['2026 Salary Hit'].apply(clean_salary)
-projections['Salary_2027'] = projections['2027 Salary Hit'].apply(clean_salary)
-projections['Salary_2028'] = projections['2028 Salary Hit'].apply(clean_salary)
+    report.to_csv('identity_report.csv', index=False)
+    player_identity.print_report_summary(report)
+    print(f"Saved match report to identity_report.csv")
 
-# Calculate counting stats
-# Batters: HR + R + RBI + SB
-# Pitchers: W + QS + SV + HLD + SO (handle NaN with fillna)
-def calc_counting(row):
-    if row['Player_Type'] == 'Batter':
-        return (pd.to_numeric(row['HR'], errors='coerce') or 0) + \
-               (pd.to_numeric(row['R'], errors='coerce') or 0) + \
-               (pd.to_numeric(row['RBI'], errors='coerce') or 0) + \
-               (pd.to_numeric(row['SB'], errors='coerce') or 0)
-    elif row['Player_Type'] == 'Pitcher':
-        return (pd.to_numeric(row['W'], errors='coerce') or 0) + \
-               (pd.to_numeric(row['QS'], errors='coerce') or 0) + \
-               (pd.to_numeric(row['SV'], errors='coerce') or 0) + \
-               (pd.to_numeric(row['HLD'], errors='coerce') or 0) + \
-               (pd.to_numeric(row['SO'], errors='coerce') or 0)
-    return None
-
-projections['Counting_Stats'] = projections.apply(calc_counting, axis=1)
-
-# Value calculations (per million dollars)
-projections['FPTS_per_M'] = projections['FPTS'] / (projections['Salary_2026'] / 1_000_000)
-projections['Counting_per_M'] = projections['Counting_Stats'] / (projections['Salary_2026'] / 1_000_000)
-projections['WAR_per_M'] = projections['WAR'] / (projections['Salary_2026'] / 1_000_000)
-
-# Value calculations (per ADP - lower ADP is better, so FPTS/ADP shows value)
-projections['FPTS_per_ADP'] = projections['FPTS'] / projections['ADP']
-projections['Counting_per_ADP'] = projections['Counting_Stats'] / projections['ADP']
-projections['WAR_per_ADP'] = projections['WAR'] / projections['ADP']
-
-# ADP per salary (how much ADP you get per dollar - higher = better value in draft)
-projections['ADP_per_M'] = projections['ADP'] / (projections['Salary_2026'] / 1_000_000)
-
-# Summary stats
-print(f"Players with block status: {projections['Block_Type'].notna().sum()}")
-print(f"Players on rosters: {projections['Rostered_By'].notna().sum()}")
-print(f"Full blocks: {(projections['Block_Type'] == 'Full').sum()}")
-print(f"Partial blocks: {(projections['Block_Type'] == 'Partial').sum()}")
-
-# Save full dataset
-projections.to_csv('all_players.csv', index=False)
-print(f"\nSaved to all_players.csv")
-
-# Show top available players (not full blocked, sorted by FPTS)
-print("\n" + "="*80)
-print("TOP 25 AVAILABLE PLAYERS (not full-blocked, by FPTS)")
-print("="*80)
-available = projections[projections['Block_Type'] != 'Full'].sort_values('FPTS', ascending=False).head(25)
-for _, row in available.iterrows():
-    block = row['Block_Type'] if pd.notna(row['Block_Type']) else '-'
-    rostered = row['Rostered_By'] if pd.notna(row['Rostered_By']) else 'Free Agent'
-    print(f"{row['Name']:<25} {row['Player_Type']:<7} FPTS: {row['FPTS']:>7.0f}  Block: {block:<7}  Roster: {rostered}")
-
-# Show best value by FPTS per dollar (rostered players only)
-print("\n" + "="*80)
-print("TOP 20 VALUE PLAYS (FPTS per $M, rostered players with 2026 salary)")
-print("="*80)
-has_salary = projections[(projections['Salary_2026'].notna()) & (projections['Salary_2026'] > 0)]
-best_value = has_salary.sort_values('FPTS_per_M', ascending=False).head(20)
-for _, row in best_value.iterrows():
-    sal_m = row['Salary_2026'] / 1_000_000
-    print(f"{row['Name']:<25} {row['Player_Type']:<7} FPTS: {row['FPTS']:>6.0f}  ${sal_m:>5.1f}M  FPTS/$M: {row['FPTS_per_M']:>6.1f}")
-
-# Show best value by FPTS per ADP
-print("\n" + "="*80)
-print("TOP 20 DRAFT VALUE (FPTS per ADP)")
-print("="*80)
-has_adp = projections[(projections['ADP'].notna()) & (projections['ADP'] > 0)]
-best_draft = has_adp.sort_values('FPTS_per_ADP', ascending=False).head(20)
-for _, row in best_draft.iterrows():
-    block = row['Block_Type'] if pd.notna(row['Block_Type']) else '-'
-    print(f"{row['Name']:<25} {row['Player_Type']:<7} FPTS: {row['FPTS']:>6.0f}  ADP: {row['ADP']:>6.1f}  FPTS/ADP: {row['FPTS_per_ADP']:>6.1f}  Block: {block}")
+    projections = derive_columns(projections)
+    print_summary(projections)
+
+    # Save full dataset
+    projections.to_csv('all_players.csv', index=False)
+    print(f"\nSaved to all_players.csv")
+
+    # Refresh the binary cache that downstream scripts load from
+    key = player_cache.cache_key()
+    player_cache.store(projections, key)
+    print(f"Cached player table as {key}")
+
+    print_reports(projections)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
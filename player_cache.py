@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Content-addressed binary cache for the merged player table.
+
+The table built by match_players.py is stored as one .npy file per column
+under .fbb_cache/<key>/, where <key> hashes the source CSVs together with
+RULES_FILES (the code that cleans, matches and merges them). Numeric
+columns keep their dtype; string columns are stored as int32 category codes
+with the categories in manifest.json. Loads memory-map the column files instead of parsing CSV.
+
+Tables are stored compact (see compact()): float columns whose every value
+is exactly representable in float32 (salaries, ids, whole-number counts)
+are kept as float32, strings as categoricals. Projection stats carry more
+digits than float32 holds, so they stay float64 and boards are unchanged.
+Pass columns= to load only what a stage needs.
+
+Usage:
+    python player_cache.py    # rebuild the cache and report cold/warm load times
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import tracing
+
+CACHE_DIR = '.fbb_cache'
+LOCK_FILE = '.lock'
+CACHE_VERSION = 2
+
+SOURCE_FILES = [
+    'fangraphs-leaderboard-projections.csv',
+    'pitchers.csv',
+    'blocked_players.csv',
+    'rosters.csv',
+]
+RULES_FILES = ['match_players.py', 'player_identity.py', 'joins.py']
+
+
+def cache_key():
+    """Hash the source CSVs plus the cleaning rules that turn them into the table."""
+    digest = hashlib.sha256(f'fbb-player-cache-v{CACHE_VERSION}'.encode())
+    here = os.path.dirname(os.path.abspath(__file__))
+    for path in SOURCE_FILES + [os.path.join(here, name) for name in RULES_FILES]:
+        digest.update(os.path.basename(path).encode())
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def compact(df):
+    """df with lossless float32 columns and categorical strings (no values change)."""
+    converted = {}
+    for name in df.columns:
+        series = df[name]
+        if series.dtype == np.float64:
+            values = series.to_numpy()
+            narrow = values.astype(np.float32)
+            if np.array_equal(narrow, values, equal_nan=True):
+                converted[name] = pd.Series(narrow, index=df.index)
+        elif pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+            converted[name] = series.astype('category')
+    return df.assign(**converted) if converted else df
+
+
+def store(df, key):
+    """Write compact(df) under CACHE_DIR/<key>, replacing any older finished entries."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    df = compact(df)
+    tmp_dir = tempfile.mkdtemp(prefix='tmp-', dir=CACHE_DIR)
+
+    manifest = {'version': CACHE_VERSION, 'rows': len(df), 'columns': []}
+    for i, name in enumerate(df.columns):
+        series = df[name]
+        entry = {'name': name, 'file': f'col_{i:03d}.npy'}
+        if pd.api.types.is_bool_dtype(series) or pd.api.types.is_numeric_dtype(series):
+            entry['kind'] = 'numeric'
+            values = series.to_numpy()
+        else:
+            entry['kind'] = 'category'
+            codes, categories = pd.factorize(series)
+            entry['categories'] = [str(c) for c in categories]
+            values = codes.astype(np.int32)
+        np.save(os.path.join(tmp_dir, entry['file']), values)
+        manifest['columns'].append(entry)
+
+    with open(os.path.join(tmp_dir, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f)
+
+    # Concurrent writers (parallel build stages) take turns publishing and
+    # pruning; each one's tmp- directory is its own until it is renamed
+    with open(os.path.join(CACHE_DIR, LOCK_FILE), 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        target = os.path.join(CACHE_DIR, key)
+        shutil.rmtree(target, ignore_errors=True)
+        os.replace(tmp_dir, target)
+
+        # Content-addressed: any other finished entry is stale
+        for entry in os.listdir(CACHE_DIR):
+            if entry not in (key, LOCK_FILE) and not entry.startswith('tmp-'):
+                shutil.rmtree(os.path.join(CACHE_DIR, entry), ignore_errors=True)
+
+
+def load(key, columns=None):
+    """Memory-map a cached table, or return None if key is not cached.
+
+    columns limits the load to the named columns (in table order).
+    """
+    manifest_path = os.path.join(CACHE_DIR, key, 'manifest.json')
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    if manifest['version'] != CACHE_VERSION:
+        return None
+
+    wanted = set(columns) if columns is not None else None
+    data = {}
+    for entry in manifest['columns']:
+        if wanted is not None and entry['name'] not in wanted:
+            continue
+        values = np.load(os.path.join(CACHE_DIR, key, entry['file']), mmap_mode='r')
+        if entry['kind'] == 'category':
+            values = pd.Categorical.from_codes(values, categories=entry['categories'])
+        data[entry['name']] = values
+    return pd.DataFrame(data, copy=False)
+
+
+@tracing.traced('load')
+def load_player_table(columns=None, verbose=True, rebuild=True):
+    """Load the merged player table, rebuilding the cache if sources changed.
+
+    With rebuild=False a missing cache entry raises FileNotFoundError
+    instead (build.py's board stages, which rely on the table stage).
+    """
+    start = time.perf_counter()
+    key = cache_key()
+    df = load(key, columns)
+    if df is not None:
+        if verbose:
+            print(f"Loaded player table from cache {key} ({time.perf_counter() - start:.3f}s)")
+        return df
+    if not rebuild:
+        raise FileNotFoundError(f"No player table cached as {key}; run match_players.py first")
+
+    import match_players
+    store(match_players.build_player_table(), key)
+    if verbose:
+        print(f"Built player table and cached as {key} ({time.perf_counter() - start:.3f}s)")
+    # Reload from disk so cold and warm callers see identical dtypes
+    return load(key, columns)
+
+
+def main():
+    print("Timing player table loads...")
+
+    csv_time = None
+    if os.path.exists('all_players.csv'):
+        start = time.perf_counter()
+        pd.read_csv('all_players.csv', low_memory=False)
+        csv_time = time.perf_counter() - start
+
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
+    start = time.perf_counter()
+    load_player_table(verbose=False)
+    cold_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    df = load_player_table(verbose=False)
+    warm_time = time.perf_counter() - start
+
+    if csv_time is not None:
+        print(f"  all_players.csv parse:     {csv_time:.3f}s")
+    print(f"  cold (rebuild + store):    {cold_time:.3f}s")
+    print(f"  warm (memory-mapped load): {warm_time:.3f}s")
+    print(f"Cached {len(df)} rows x {len(df.columns)} columns as {cache_key()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Player identity resolution: map free-text player names to FanGraphs PlayerId/MLBAMID.
+
+Names from blocked_players.csv, rosters.csv and my_players.csv are resolved
+against the projection pool in two steps:
+
+1. Exact match on a normalized key (accents folded, punctuation and Jr/Sr/II
+   suffixes dropped). A key shared by several PlayerIds is disambiguated by a
+   team hint such as "Max Muncy (A's)", else by projected FPTS.
+2. Otherwise, fuzzy match through a character trigram inverted index. Only
+   the rarest trigrams of the query are looked up (prefix filtering), so the
+   candidate set stays small as the pool grows; candidates are then scored by
+   Dice similarity.
+
+Usage:
+    python player_identity.py    # print the match report for all name sources
+"""
+
+import math
+import re
+import unicodedata
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+NGRAM = 3
+MIN_CONFIDENCE = 0.7  # Minimum Dice similarity for a fuzzy match
+AMBIGUOUS_MARGIN = 0.05  # Runner-up this close to the best fuzzy match -> ambiguous
+
+# Hints written in roster names, e.g. "Max Muncy (A's)" or "Will Smith (RP)"
+TEAM_ALIASES = {"a's": 'ATH', 'as': 'ATH', 'oak': 'ATH'}
+POSITION_HINTS = {
+    'c': 'Batter', '1b': 'Batter', '2b': 'Batter', '3b': 'Batter', 'ss': 'Batter',
+    'of': 'Batter', 'dh': 'Batter', 'sp': 'Pitcher', 'rp': 'Pitcher', 'p': 'Pitcher',
+}
+
+# Nicknames used in league files -> FanGraphs first names
+NICKNAMES = {'kike': 'enrique', 'mike': 'michael', 'peter': 'pete', 'louie': 'louis'}
+
+Match = namedtuple('Match', ['row', 'confidence', 'method', 'candidates'])
+
+REPORT_COLUMNS = ['Source', 'Input_Name', 'PlayerId', 'MLBAMID', 'Matched_Name',
+                  'Match_Method', 'Match_Confidence', 'Candidates']
+
+
+def fold_accents(name):
+    return unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii')
+
+
+def identity_key(name):
+    """Normalized matching key: 'José Leclerc Jr.' -> 'jose leclerc'."""
+    key = fold_accents(name).lower().replace('.', '').replace("'", '')
+    key = re.sub(r'[^a-z0-9]+', ' ', key)
+    key = re.sub(r' (jr|sr|ii|iii|iv)\b', '', ' ' + key)
+    return ' '.join(key.split())
+
+
+def parse_name(raw):
+    """Split a roster-style name into (key, hint, dropped).
+
+    Handles annotations like "Max Muncy (A's)", "Will Smith (RP)" and
+    "Bailey Ober - Dropped". hint is ('Team', code), ('Player_Type', type)
+    or None.
+    """
+    name = str(raw)
+    dropped = bool(re.search(r'-\s*dropped\s*$', name, flags=re.IGNORECASE))
+    name = re.sub(r'-\s*dropped\s*$', '', name, flags=re.IGNORECASE)
+
+    hint = None
+    note = re.search(r'\(([^)]*)\)', name)
+    if note:
+        text = note.group(1).strip().lower()
+        if text in POSITION_HINTS:
+            hint = ('Player_Type', POSITION_HINTS[text])
+        else:
+            hint = ('Team', TEAM_ALIASES.get(text, text.upper()))
+        name = name[:note.start()] + name[note.end():]
+
+    return identity_key(name), hint, dropped
+
+
+def nickname_key(key):
+    """Swap a nickname first name for its formal one, or return None."""
+    first, _, rest = key.partition(' ')
+    if first in NICKNAMES and rest:
+        return f'{NICKNAMES[first]} {rest}'
+    return None
+
+
+def ngrams(key):
+    padded = f' {key} '
+    return {padded[i:i + NGRAM] for i in range(len(padded) - NGRAM + 1)}
+
+
+class PlayerIndex:
+    """Exact-key and trigram indexes over a projection table."""
+
+    def __init__(self, projections):
+        self.player_ids = projections['PlayerId'].astype(str).to_numpy()
+        self.mlbam_ids = projections['MLBAMID'].to_numpy()
+        self.names = projections['NameASCII'].astype(str).to_numpy()
+        self.hint_values = {
+            'Team': projections['Team'].astype(str).to_numpy(),
+            'Player_Type': projections['Player_Type'].astype(str).to_numpy(),
+        }
+        self.fpts = projections['FPTS'].fillna(0).to_numpy(dtype=float)
+
+        keys = [identity_key(name) for name in self.names]
+        all_grams = [ngrams(key) for key in keys]
+        self.gram_counts = np.array([len(grams) for grams in all_grams])
+
+        self.exact = {}
+        postings = {}
+        for row, (key, grams) in enumerate(zip(keys, all_grams)):
+            self.exact.setdefault(key, []).append(row)
+            for gram in grams:
+                postings.setdefault(gram, []).append(row)
+        self.postings = {gram: np.array(rows, dtype=np.int32) for gram, rows in postings.items()}
+
+    def _matches_hint(self, row, hint):
+        column, value = hint
+        return self.hint_values[column][row] == value
+
+    def _pick(self, rows, hint):
+        """Choose among rows sharing a key; returns (row, distinct identities)."""
+        if hint is not None:
+            hinted = [row for row in rows if self._matches_hint(row, hint)]
+            rows = hinted or rows
+        identities = {self.player_ids[row] for row in rows}
+        return max(rows, key=lambda row: self.fpts[row]), len(identities)
+
+    def _fuzzy_scores(self, grams):
+        """Dice scores of rows that could reach MIN_CONFIDENCE, as (rows, scores).
+
+        Candidates come only from the rarest query grams; overlaps are then
+        counted against each query gram's sorted posting list.
+        """
+        known = sorted((g for g in grams if g in self.postings), key=lambda g: len(self.postings[g]))
+        if not known:
+            return np.empty(0, dtype=np.int32), np.empty(0)
+
+        # Dice >= t needs an overlap of at least t*|A|/(2-t) grams, so any such
+        # row must share one of the first |A| - overlap + 1 rarest grams
+        t, size = MIN_CONFIDENCE, len(grams)
+        min_overlap = math.ceil(t * size / (2 - t))
+        prefix = max(size - min_overlap + 1, 1)
+        rows = np.unique(np.concatenate([self.postings[g] for g in known[:prefix]]))
+
+        # ...and its own gram count must lie within [t|A|/(2-t), (2-t)|A|/t]
+        counts = self.gram_counts[rows]
+        keep = (counts >= t * size / (2 - t)) & (counts <= (2 - t) * size / t)
+        rows, counts = rows[keep], counts[keep]
+
+        overlap = np.zeros(len(rows), dtype=np.int32)
+        for gram in known:
+            posting = self.postings[gram]
+            pos = np.minimum(np.searchsorted(posting, rows), len(posting) - 1)
+            overlap += posting[pos] == rows
+
+        scores = 2 * overlap / (size + counts)
+        keep = scores >= t
+        return rows[keep], scores[keep]
+
+    def lookup(self, raw_name):
+        """Resolve one name to a Match (row is None when unresolved)."""
+        key, hint, dropped = parse_name(raw_name)
+        if dropped or not key:
+            return Match(None, 0.0, 'dropped' if dropped else 'blank', 0)
+
+        rows = self.exact.get(key) or self.exact.get(nickname_key(key))
+        if rows:
+            row, identities = self._pick(rows, hint)
+            if identities == 1:
+                return Match(row, 1.0, 'exact', 1)
+            return Match(row, 1.0 / identities, 'exact-ambiguous', identities)
+
+        grams = ngrams(key)
+        rows, scores = self._fuzzy_scores(grams)
+        if not len(rows):
+            return Match(None, 0.0, 'unmatched', 0)
+        scored = list(zip(scores.tolist(), rows.tolist()))
+
+        scored.sort(key=lambda item: (-item[0], -self.fpts[item[1]]))
+        best_score, best_row = scored[0]
+        rivals = {self.player_ids[row] for score, row in scored
+                  if score >= best_score - AMBIGUOUS_MARGIN}
+        if hint is not None:
+            hinted = [row for score, row in scored if self._matches_hint(row, hint)]
+            if hinted:
+                best_score, best_row = next(item for item in scored if item[1] == hinted[0])
+                rivals = {self.player_ids[best_row]}
+        method = 'fuzzy' if len(rivals) == 1 else 'fuzzy-ambiguous'
+        return Match(best_row, best_score, method, len(rivals))
+
+    def resolve(self, names, source=''):
+        """Resolve a Series of names; returns a report frame aligned to names.index."""
+        records = []
+        for raw in names:
+            if pd.isna(raw):
+                records.append((source, raw, None, np.nan, None, 'blank', 0.0, 0))
+                continue
+            match = self.lookup(raw)
+            if match.row is None:
+                records.append((source, raw, None, np.nan, None, match.method, 0.0, 0))
+            else:
+                records.append((source, raw, self.player_ids[match.row], self.mlbam_ids[match.row],
+                                self.names[match.row], match.method, round(match.confidence, 3),
+                                match.candidates))
+        return pd.DataFrame(records, columns=REPORT_COLUMNS, index=names.index)
+
+
+def print_report_summary(report):
+    print("\n" + "=" * 80)
+    print("PLAYER IDENTITY MATCH REPORT")
+    print("=" * 80)
+    counts = report.groupby(['Source', 'Match_Method']).size().unstack(fill_value=0)
+    print(counts)
+
+    review = report[report['Match_Method'].isin(['fuzzy', 'fuzzy-ambiguous', 'exact-ambiguous'])]
+    if len(review):
+        print("\nMatches worth reviewing:")
+        for _, row in review.sort_values('Match_Confidence').iterrows():
+            print(f"  {row['Source']:<10} {str(row['Input_Name']).strip():<28} -> {row['Matched_Name']:<25} "
+                  f"{row['Match_Method']:<16} conf={row['Match_Confidence']:.2f}")
+
+    unmatched = report[report['Match_Method'] == 'unmatched']
+    if len(unmatched):
+        print(f"\nUnmatched ({len(unmatched)}): "
+              f"{', '.join(str(n).strip() for n in unmatched['Input_Name'])}")
+
+
+def main():
+    import match_players
+
+    batters, pitchers, blocked, rosters = match_players.load_sources()
+    my_players = pd.read_csv('my_players.csv')
+    _, report = match_players.merge_sources(batters, pitchers, blocked, rosters,
+                                            extra_names={'my_players': my_players['Player']})
+    print_report_summary(report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Positional eligibility, lineup filling and position replacement levels.
+
+Eligibility comes from eligibility.csv when present: one row per player with
+a Player (or Name, or PlayerId) column and a Position column in Fantrax
+form ("SS,OF", "LF/CF", "SP,RP"). LF/CF/RF count as OF and DH as UTIL;
+every batter can play UTIL. Players the file does not list fall back to
+what the projections tell us: batters can fill any batting slot (Position
+'Batter') and pitchers are SP when GS > 5, RP otherwise. Without the file
+the batting slots are one pool of 14 per team, so only the UTIL-as-batter
+and SP/RP replacement levels mean anything.
+
+fill_slots() puts the best players into C/1B/2B/SS/3B/OF/UTIL/SP/RP slots.
+Sets of players that fit into the slots form a transversal matroid, so
+taking players in score order and keeping each one that still fits gives a
+maximum-score lineup. "Still fits" is a bipartite matching check: a
+breadth-first search for an augmenting path over the nine slot types,
+moving already-placed players to other slots they are eligible for. An
+eligibility pattern that fails once can never fit later, so repeats are
+rejected without a search.
+
+The replacement level at a slot type is the best player left out who
+could be added if one more such slot existed (an augmenting path from the
+player reaches it). A player's Score_Above_Replacement is measured against
+the lowest replacement level among the slots the player can fill.
+
+Usage:
+    python positions.py                 # replacement levels for volume_power
+    python positions.py balanced --bench   # re-solve once per pick through a simulated draft
+"""
+
+import argparse
+import functools
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import roto
+import tracing
+
+ELIGIBILITY_PATH = 'eligibility.csv'
+
+# Active lineup slots per team (roto.ROSTER_BATTERS / ROSTER_PITCHERS in total)
+LINEUP_SLOTS = {'C': 1, '1B': 1, '2B': 1, 'SS': 1, '3B': 1, 'OF': 5, 'UTIL': 4, 'SP': 7, 'RP': 3}
+SLOT_TYPES = list(LINEUP_SLOTS)
+BATTING_SLOTS = ['C', '1B', '2B', 'SS', '3B', 'OF', 'UTIL']
+PITCHING_SLOTS = ['SP', 'RP']
+POSITION_ALIASES = {'LF': 'OF', 'CF': 'OF', 'RF': 'OF', 'DH': 'UTIL', 'UT': 'UTIL', 'P': 'SP/RP'}
+
+# =============================================================================
+# ELIGIBILITY
+# =============================================================================
+
+def parse_positions(text):
+    """'SS,LF/CF' -> {'SS', 'OF'}; unknown positions are ignored."""
+    found = set()
+    for token in str(text).replace('/', ',').split(','):
+        token = token.strip().upper()
+        for slot in POSITION_ALIASES.get(token, token).split('/'):
+            if slot in LINEUP_SLOTS:
+                found.add(slot)
+    return found
+
+
+@functools.lru_cache(maxsize=None)
+def load_eligibility(path=ELIGIBILITY_PATH):
+    """{PlayerId: set of slot types} from the eligibility file ({} when there is none)."""
+    if not os.path.exists(path):
+        return {}
+    df = pd.read_csv(path)
+    position_col = next((c for c in ('Position', 'Positions', 'Eligible') if c in df.columns), None)
+    if position_col is None:
+        print(f"{path} has no Position column; ignoring it")
+        return {}
+    if 'PlayerId' in df.columns:
+        ids = df['PlayerId'].astype(str)
+    else:
+        import player_cache
+        import player_identity
+
+        name_col = 'Player' if 'Player' in df.columns else 'Name'
+        index = player_identity.PlayerIndex(player_cache.load_player_table(verbose=False))
+        ids = index.resolve(df[name_col], 'eligibility')['PlayerId']
+    return {pid: parse_positions(text) for pid, text in zip(ids, df[position_col])
+            if isinstance(pid, str) and pid}
+
+
+def eligibility_matrix(players, eligibility=None):
+    """players x SLOT_TYPES boolean eligibility."""
+    eligibility = load_eligibility() if eligibility is None else eligibility
+    is_batter = (players['Player_Type'] == 'Batter').to_numpy()
+    starter = (pd.to_numeric(players['GS'], errors='coerce').fillna(0) > 5).to_numpy() \
+        if 'GS' in players.columns else np.zeros(len(players), dtype=bool)
+    batting = np.isin(SLOT_TYPES, BATTING_SLOTS)
+    matrix = np.zeros((len(players), len(SLOT_TYPES)), dtype=bool)
+    # Unlisted batters could be playing anywhere, so they may fill any batting slot
+    matrix[:, batting] = is_batter[:, None]
+    matrix[:, SLOT_TYPES.index('SP')] = ~is_batter & starter
+    matrix[:, SLOT_TYPES.index('RP')] = ~is_batter & ~starter
+    if eligibility:
+        util = np.array(SLOT_TYPES) == 'UTIL'
+        for row, pid in enumerate(players['PlayerId'].astype(str)):
+            if pid not in eligibility:
+                continue
+            listed = np.isin(SLOT_TYPES, list(eligibility[pid]))
+            if is_batter[row]:
+                matrix[row] = (listed & batting) | util
+            elif (listed & ~batting).any():
+                matrix[row] = listed & ~batting
+    return matrix
+
+
+def position_labels(players, eligibility=None):
+    """Display position per player: 'SS/OF', 'SP', ...; 'Batter' when eligibility is unknown."""
+    matrix = eligibility_matrix(players, eligibility)
+    shown = matrix & ~np.isin(SLOT_TYPES, ['UTIL'])
+    labels = ['/'.join(slot for slot, ok in zip(SLOT_TYPES, row) if ok) for row in shown]
+    is_batter = (players['Player_Type'] == 'Batter').to_numpy()
+    known = set(load_eligibility() if eligibility is None else eligibility)
+    pids = players['PlayerId'].astype(str).to_numpy()
+    return pd.Series([((label or 'UTIL') if pid in known else 'Batter') if batter else label
+                      for label, batter, pid in zip(labels, is_batter, pids)], index=players.index)
+
+
+def roster_groups(players, eligibility=None):
+    """'Batter', 'SP' or 'RP' per player for Batter/SP/RP roster quotas (SP-eligible = SP)."""
+    matrix = eligibility_matrix(players, eligibility)
+    is_batter = (players['Player_Type'] == 'Batter').to_numpy()
+    return np.where(is_batter, 'Batter', np.where(matrix[:, SLOT_TYPES.index('SP')], 'SP', 'RP')).astype(object)
+
+# =============================================================================
+# LINEUP SOLVER
+# =============================================================================
+
+def slot_capacity(teams=1, slots=LINEUP_SLOTS):
+    return np.array([slots[slot] * teams for slot in SLOT_TYPES])
+
+
+def fill_slots(scores, eligible, capacity):
+    """Maximum-score assignment of players to slot types.
+
+    scores (n,), eligible (n, k) boolean, capacity (k,) slots per type.
+    Returns the slot type index per player (-1 = left out).
+    """
+    n, k = eligible.shape
+    slot = np.full(n, -1)
+    load = np.zeros(k, dtype=int)
+    members = [[] for _ in range(k)]
+    movable = np.zeros((k, k), dtype=int)   # [a, b]: players in a also eligible for b
+    failed = set()
+    remaining = int(capacity.sum())
+    patterns = eligible @ (1 << np.arange(k))
+
+    for i in np.argsort(-scores, kind='stable'):
+        if remaining == 0:
+            break
+        if patterns[i] in failed or not patterns[i]:
+            continue
+        start = np.flatnonzero(eligible[i])
+        parent = {int(t): -1 for t in start}
+        queue, end = list(parent), None
+        while queue:
+            t = queue.pop(0)
+            if load[t] < capacity[t]:
+                end = t
+                break
+            for u in np.flatnonzero(movable[t]):
+                if u not in parent:
+                    parent[int(u)] = t
+                    queue.append(int(u))
+        if end is None:
+            failed.add(patterns[i])
+            continue
+
+        # Shift players along the path, last hop first, then place i
+        t = end
+        while parent[t] != -1:
+            src = parent[t]
+            mover = next(p for p in members[src] if eligible[p, t])
+            members[src].remove(mover)
+            members[t].append(mover)
+            movable[src] -= eligible[mover]
+            movable[t] += eligible[mover]
+            slot[mover] = t
+            t = src
+        members[t].append(i)
+        movable[t] += eligible[i]
+        slot[i] = t
+        load[end] += 1
+        remaining -= 1
+    return slot
+
+
+def replacement_levels(scores, eligible, slot, capacity):
+    """Best left-out score that could take one more slot of each type (NaN if none)."""
+    k = eligible.shape[1]
+    movable = np.zeros((k, k), dtype=int)
+    placed = slot >= 0
+    np.add.at(movable, slot[placed], eligible[placed].astype(int))
+    reach = (movable > 0) | np.eye(k, dtype=bool)
+    for _ in range(k):
+        reach = (reach.astype(int) @ reach.astype(int)) > 0
+
+    out = ~placed
+    reaches = (eligible[out].astype(int) @ reach.astype(int)) > 0      # left-out x slot types
+    levels = np.where(reaches, scores[out][:, None], -np.inf).max(axis=0, initial=-np.inf)
+    return np.where(np.isfinite(levels), levels, np.nan)
+
+
+def score_above_replacement(scores, eligible, levels):
+    """Score minus the lowest replacement level among each player's slot types."""
+    floor = np.where(eligible & ~np.isnan(levels), levels, np.inf).min(axis=1)
+    return np.where(np.isfinite(floor), scores - floor, np.nan), np.where(np.isfinite(floor), floor, np.nan)
+
+
+@tracing.traced('replacement')
+def add_replacement(board, teams=roto.LEAGUE_SIZE, eligibility=None):
+    """Add Replacement and Score_Above_Replacement columns for a league of `teams` lineups."""
+    scores = board['Strategy_Score'].to_numpy(dtype=float)
+    eligible = eligibility_matrix(board, eligibility)
+    capacity = slot_capacity(teams)
+    slot = fill_slots(scores, eligible, capacity)
+    levels = replacement_levels(scores, eligible, slot, capacity)
+    above, floor = score_above_replacement(scores, eligible, levels)
+    return board.assign(Replacement=floor, Score_Above_Replacement=above)
+
+# =============================================================================
+# REPORT
+# =============================================================================
+
+def bench(board, teams=roto.LEAGUE_SIZE):
+    """Simulate an ADP-order draft, re-solving the league's open slots after every pick."""
+    order = np.argsort(board['ADP'].to_numpy(dtype=float), kind='stable')
+    scores = board['Strategy_Score'].to_numpy(dtype=float)
+    eligible = eligibility_matrix(board)
+    capacity = slot_capacity(teams)
+    available = np.ones(len(board), dtype=bool)
+    times = []
+    for player in order[:int(capacity.sum())]:
+        available[player] = False
+        start = time.perf_counter()
+        rows = np.flatnonzero(available)
+        slot = fill_slots(scores[rows], eligible[rows], capacity)
+        replacement_levels(scores[rows], eligible[rows], slot, capacity)
+        times.append(time.perf_counter() - start)
+        filled = slot_of(eligible[player], capacity)
+        if filled is not None:
+            capacity[filled] -= 1
+    times = np.array(times) * 1000
+    print(f"\n{len(times)} picks: {times.mean():.2f} ms mean, {np.percentile(times, 99):.2f} ms p99 per re-solve")
+
+
+def slot_of(eligible_row, capacity):
+    """First open slot type a drafted player takes, in SLOT_TYPES order (UTIL after fielders)."""
+    for t in np.flatnonzero(eligible_row):
+        if capacity[t] > 0:
+            return t
+    return None
+
+
+def main():
+    import draft_board_analysis as dba
+
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('strategy', nargs='?', default='volume_power')
+    parser.add_argument('--teams', type=int, default=roto.LEAGUE_SIZE)
+    parser.add_argument('--bench', action='store_true', help='time one re-solve per pick')
+    args = parser.parse_args()
+    if args.strategy not in dba.STRATEGIES:
+        print(f"Unknown strategy: {args.strategy}")
+        print(f"Available: {', '.join(dba.STRATEGIES)}")
+        sys.exit(1)
+
+    batters, pitchers = dba.load_players()
+    board = dba.build_boards(batters, pitchers, [args.strategy])[args.strategy]
+    if not load_eligibility():
+        print(f"No {ELIGIBILITY_PATH}: batters fill any batting slot (only UTIL and SP/RP levels are meaningful)")
+
+    scores = board['Strategy_Score'].to_numpy(dtype=float)
+    eligible = eligibility_matrix(board)
+    capacity = slot_capacity(args.teams)
+    start = time.perf_counter()
+    slot = fill_slots(scores, eligible, capacity)
+    levels = replacement_levels(scores, eligible, slot, capacity)
+    elapsed = time.perf_counter() - start
+
+    print("\n" + "=" * 80)
+    print(f"REPLACEMENT LEVELS: {dba.STRATEGIES[args.strategy]['name']} ({args.teams} teams)")
+    print("=" * 80)
+    print(f"{'Slot':<6} {'Slots':>6} {'Filled':>7} {'Replacement':>12}")
+    for t, name in enumerate(SLOT_TYPES):
+        level = f"{levels[t]:>12.2f}" if not np.isnan(levels[t]) else f"{'-':>12}"
+        print(f"{name:<6} {capacity[t]:>6} {(slot == t).sum():>7} {level}")
+    print(f"\nSolved {len(board)} players in {elapsed * 1000:.1f} ms")
+    if args.bench:
+        bench(board, args.teams)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+"""
+Roto category math shared by the optimizer and league tools.
+
+Team category values are built from summed stat components (H, AB, ER, IP,
+...) so rate stats aggregate correctly: AVG = H/AB, ERA = 9*ER/IP, and so on.
+All functions work on arrays with arbitrary leading dimensions, e.g. one row
+per candidate roster.
+"""
+
+import numpy as np
+import pandas as pd
+
+BATTING_CATEGORIES = ['R', 'HR', 'RBI', 'SB', 'AVG', 'OBP', 'SLG']
+PITCHING_CATEGORIES = ['QS', 'SV', 'HLD', 'BB9', 'K', 'ERA', 'WHIP']
+CATEGORIES = BATTING_CATEGORIES + PITCHING_CATEGORIES
+LOWER_IS_BETTER = ['ERA', 'WHIP', 'BB9']
+
+# League shape: 12 teams, active rosters of 14 batters and 10 pitchers
+LEAGUE_SIZE = 12
+ROSTER_BATTERS = 14
+ROSTER_PITCHERS = 10
+
+# Projection columns summed per player type (NaN counts as 0)
+BATTING_COMPONENTS = ['PA', 'AB', 'H', '1B', '2B', '3B', 'HR', 'R', 'RBI', 'SB', 'BB', 'HBP', 'SF']
+PITCHING_COMPONENTS = ['IP', 'ER', 'H', 'BB', 'SO', 'QS', 'SV', 'HLD']
+
+_B = {name: i for i, name in enumerate(BATTING_COMPONENTS)}
+_P = {name: i for i, name in enumerate(PITCHING_COMPONENTS)}
+
+
+def batting_components(batters):
+    """n x len(BATTING_COMPONENTS) float array of projected batting stats."""
+    return np.nan_to_num(batters[BATTING_COMPONENTS].to_numpy(dtype=float))
+
+
+def pitching_components(pitchers):
+    """n x len(PITCHING_COMPONENTS) float array of projected pitching stats."""
+    return np.nan_to_num(pitchers[PITCHING_COMPONENTS].to_numpy(dtype=float))
+
+
+def _ratio(num, den, scale=1.0):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(den > 0, scale * num / np.where(den > 0, den, 1), np.nan)
+
+
+def category_values(bat, pit):
+    """Team category values (..., len(CATEGORIES)) from summed components.
+
+    bat and pit hold summed BATTING_COMPONENTS / PITCHING_COMPONENTS along
+    their last axis.
+    """
+    b = lambda name: bat[..., _B[name]]
+    p = lambda name: pit[..., _P[name]]
+    total_bases = b('1B') + 2 * b('2B') + 3 * b('3B') + 4 * b('HR')
+    values = {
+        'R': b('R'),
+        'HR': b('HR'),
+        'RBI': b('RBI'),
+        'SB': b('SB'),
+        'AVG': _ratio(b('H'), b('AB')),
+        'OBP': _ratio(b('H') + b('BB') + b('HBP'), b('AB') + b('BB') + b('HBP') + b('SF')),
+        'SLG': _ratio(total_bases, b('AB')),
+        'QS': p('QS'),
+        'SV': p('SV'),
+        'HLD': p('HLD'),
+        'BB9': _ratio(p('BB'), p('IP'), 9.0),
+        'K': p('SO'),
+        'ERA': _ratio(p('ER'), p('IP'), 9.0),
+        'WHIP': _ratio(p('BB') + p('H'), p('IP')),
+    }
+    return np.stack([values[cat] for cat in CATEGORIES], axis=-1)
+
+
+def direction(categories=CATEGORIES):
+    """+1 where higher is better, -1 for ERA/WHIP/BB9."""
+    return np.array([-1.0 if cat in LOWER_IS_BETTER else 1.0 for cat in categories])
+
+
+def load_league(path='fantrax_data.csv', ranks=False):
+    """Fantrax standings as (teams, values, points), each teams x CATEGORIES.
+
+    With ranks=True the fantrax Rank array is returned as a fourth element.
+    """
+    df = pd.read_csv(path)
+    pivots = [df.pivot_table(index='Team', columns='Category', values=column, aggfunc='first')
+              for column in ('Value', 'Points') + (('Rank',) if ranks else ())]
+    return (list(pivots[0].index),) + tuple(p[CATEGORIES].to_numpy(dtype=float) for p in pivots)
+
+
+def points_against(values, league_values):
+    """Roto points per category a team would earn if added to the league.
+
+    values is (..., C); league_values is (teams, C). A team scores 1 point
+    plus 1 per league team it beats and 0.5 per tie, so the maximum is
+    teams + 1. Missing values (NaN) score last.
+    """
+    sign = direction()
+    mine = np.nan_to_num(values * sign, nan=-np.inf)
+    # Binary search in each category's sorted league column instead of
+    # comparing against every team: no (..., teams, C) temporaries
+    theirs = np.sort(np.nan_to_num(league_values * sign, nan=-np.inf), axis=0)
+    points = np.empty(mine.shape)
+    for c in range(mine.shape[-1]):
+        beaten = np.searchsorted(theirs[:, c], mine[..., c], side='left')
+        tied = np.searchsorted(theirs[:, c], mine[..., c], side='right') - beaten
+        points[..., c] = 1.0 + beaten + 0.5 * tied
+    return points
+
+
+def _compare(values, tiebreak, categories):
+    """Pairwise (beaten, tied) counts per team, excluding the team itself."""
+    v = np.nan_to_num(values * direction(categories), nan=-np.inf)
+    mine, theirs = v[..., :, None, :], v[..., None, :, :]
+    beats = mine > theirs
+    ties = mine == theirs
+    if tiebreak is not None:
+        # A lower tiebreak (e.g. fantrax Rank) wins a tie on the displayed value
+        t = np.asarray(tiebreak, dtype=float)
+        t_mine, t_theirs = t[..., :, None, :], t[..., None, :, :]
+        beats = beats | (ties & (t_mine < t_theirs))
+        ties = ties & (t_mine == t_theirs)
+    return beats.sum(axis=-2), ties.sum(axis=-2) - 1
+
+
+def league_points(values, tiebreak=None, categories=CATEGORIES):
+    """Roto points per category for teams competing with each other.
+
+    values is (..., teams, C), e.g. sims x teams x C for many leagues at
+    once. The best team scores `teams` points, the worst 1; tied teams split
+    the points of the places they share. ERA, WHIP and BB9 rank low to high.
+    Missing values (NaN) score last. tiebreak, shaped like values, orders
+    teams whose values are equal (lower first): fantrax rounds the values it
+    exports but ranks on the unrounded ones, so league_points(values,
+    tiebreak=ranks) reproduces its Points column exactly.
+    """
+    beaten, tied = _compare(values, tiebreak, categories)
+    return 1.0 + beaten + 0.5 * tied
+
+
+def league_ranks(values, tiebreak=None, categories=CATEGORIES):
+    """Fantrax-style category ranks: 1 is best and tied teams share the higher rank."""
+    beaten, tied = _compare(values, tiebreak, categories)
+    teams = np.shape(values)[-2]
+    return teams - beaten - tied
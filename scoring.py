@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Interactive scoring API: re-rank the draft board for any category weights.
+
+ScoringEngine keeps the filtered, available (not fully blocked) batter and
+pitcher z-score matrices in memory. rank() takes one weight dict over
+z_HR ... z_HLD and returns a RankedBoard in tens of microseconds, so weights
+can be tuned live instead of editing STRATEGIES and rerunning the script.
+
+    >>> engine = ScoringEngine.from_cache()
+    >>> board = engine.rank({'z_HR': 1.0, 'z_SB': 0.5, 'z_ERA': 0.8})
+    >>> board.to_frame().head(10)
+
+Usage:
+    python scoring.py    # time rank() for every strategy and check it against build_boards
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import draft_board_analysis as dba
+import positions
+
+CATEGORIES = dba.BATTER_CATEGORIES + dba.PITCHER_CATEGORIES
+TIER_NAMES = np.array(dba.TIER_LABELS + [dba.TIER_DEPTH])
+
+
+def _sorted_quantiles(sorted_scores, qs):
+    """Linear-interpolated quantiles of an ascending array (pandas' default)."""
+    if len(sorted_scores) == 0:
+        return np.full(len(qs), np.nan)
+    pos = np.asarray(qs) * (len(sorted_scores) - 1)
+    lo = np.floor(pos).astype(int)
+    hi = np.minimum(lo + 1, len(sorted_scores) - 1)
+    return sorted_scores[lo] + (sorted_scores[hi] - sorted_scores[lo]) * (pos - lo)
+
+
+def _tier_codes(scores):
+    """0-3 tier codes matching draft_board_analysis.assign_tiers."""
+    valid = np.sort(scores[~np.isnan(scores)])
+    t90, t70, t50 = _sorted_quantiles(valid, [0.90, 0.70, 0.50])
+    return 3 - ((scores >= t90).astype(np.int8) + (scores >= t70) + (scores >= t50))
+
+
+class RankedBoard:
+    """Result of ScoringEngine.rank(): players in rank order with scores and tiers."""
+
+    def __init__(self, engine, order, scores, tier_codes):
+        self.engine = engine
+        self.order = order            # player rows, best first
+        self.scores = scores          # Strategy_Score per player row
+        self.tier_codes = tier_codes  # 0 = Tier 1 ... 3 = Tier 4, per player row
+
+    def __len__(self):
+        return len(self.order)
+
+    def top(self, n=25):
+        """[(rank, name, player_type, score, tier)] for the top n players."""
+        rows = self.order[:n]
+        e = self.engine
+        return [(rank, e.names[row], e.player_types[row], float(self.scores[row]),
+                 TIER_NAMES[self.tier_codes[row]]) for rank, row in enumerate(rows, 1)]
+
+    def to_frame(self, columns=None):
+        """Materialize the board as a DataFrame in rank order.
+
+        columns adds extra player-table columns (e.g. ['HR', 'Rostered_By']).
+        """
+        e = self.engine
+        frame = pd.DataFrame({
+            'Rank': np.arange(1, len(self.order) + 1),
+            'Name': e.names[self.order],
+            'Team': e.teams[self.order],
+            'Player_Type': e.player_types[self.order],
+            'Position': e.positions[self.order],
+            'Strategy_Score': self.scores[self.order],
+            'Tier': TIER_NAMES[self.tier_codes[self.order]],
+        })
+        for col in columns or []:
+            frame[col] = e.players[col].to_numpy()[self.order]
+        return frame
+
+
+class ScoringEngine:
+    """In-memory z-score matrices for one player pool (standard or reliever split)."""
+
+    def __init__(self, batters, pitchers, reliever_split=False):
+        batters, pitchers = dba.filter_playing_time(batters, pitchers, reliever_split)
+        batters, pitchers = dba.add_zscores(batters, pitchers)
+        batters = batters[batters['Block_Type'] != 'Full']
+        pitchers = pitchers[pitchers['Block_Type'] != 'Full']
+
+        self.reliever_split = reliever_split
+        self.n_batters = len(batters)
+        self.batter_z = np.ascontiguousarray(batters[dba.BATTER_CATEGORIES].to_numpy(dtype=float))
+        self.pitcher_z = np.ascontiguousarray(pitchers[dba.PITCHER_CATEGORIES].to_numpy(dtype=float))
+
+        # Player rows: batters first, then pitchers
+        self.players = pd.concat([batters, pitchers], ignore_index=True)
+        self.names = self.players['Name'].to_numpy(dtype=object)
+        self.teams = self.players['Team'].to_numpy(dtype=object)
+        self.player_types = self.players['Player_Type'].to_numpy(dtype=object)
+        self.positions = positions.position_labels(self.players).to_numpy(dtype=object)
+
+    @classmethod
+    def from_cache(cls, reliever_split=False):
+        """Build an engine from the cached player table."""
+        batters, pitchers = dba.load_players()
+        return cls(batters, pitchers, reliever_split)
+
+    def score(self, weights):
+        """Strategy_Score for every player row under a {z_*: weight} dict."""
+        unknown = set(weights) - set(CATEGORIES)
+        if unknown:
+            raise KeyError(f"Unknown categories: {', '.join(sorted(unknown))}")
+        wb = np.array([[weights.get(col, 0)] for col in dba.BATTER_CATEGORIES], dtype=float)
+        wp = np.array([[weights.get(col, 0)] for col in dba.PITCHER_CATEGORIES], dtype=float)
+        return np.concatenate([
+            dba.score_matrix(self.batter_z, wb)[:, 0],
+            dba.score_matrix(self.pitcher_z, wp)[:, 0],
+        ])
+
+    def rank(self, weights):
+        """Rank and tier every available player under a {z_*: weight} dict."""
+        scores = self.score(weights)
+        nb = self.n_batters
+        tier_codes = np.concatenate([_tier_codes(scores[:nb]), _tier_codes(scores[nb:])])
+        order = np.argsort(-scores, kind='stable')
+        return RankedBoard(self, order, scores, tier_codes)
+
+
+def strategy_weights(key):
+    """Flatten a STRATEGIES entry into one {z_*: weight} dict."""
+    strategy = dba.STRATEGIES[key]
+    return {**strategy['batter'], **strategy['pitcher']}
+
+
+def main(argv):
+    repeats = int(argv[0]) if argv else 1000
+
+    batters, pitchers = dba.load_players()
+    engines = {split: ScoringEngine(batters, pitchers, split) for split in (False, True)}
+    boards = dba.build_boards(batters, pitchers, list(dba.STRATEGIES))
+
+    print("\n" + "=" * 80)
+    print(f"SCORING API TIMING (best of {repeats} rank() calls)")
+    print("=" * 80)
+    for key in dba.STRATEGIES:
+        engine = engines[key in dba.RELIEVER_STRATEGIES]
+        weights = strategy_weights(key)
+
+        best = float('inf')
+        for _ in range(repeats):
+            start = time.perf_counter()
+            ranked = engine.rank(weights)
+            best = min(best, time.perf_counter() - start)
+
+        expected = boards[key]
+        got = ranked.to_frame()
+        same = all(
+            np.array_equal(expected[col].to_numpy(dtype=object), got[col].to_numpy(dtype=object))
+            for col in ['Name', 'Tier']
+        ) and np.array_equal(expected['Strategy_Score'], got['Strategy_Score'], equal_nan=True)
+        print(f"{key:<15} {len(ranked):>4} players  {best * 1e6:>7.1f} us  "
+              f"{'matches' if same else 'DIFFERS FROM'} draft board")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
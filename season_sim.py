@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo season simulator built on the FanGraphs percentile columns.
+
+Each simulated season draws one performance percentile per player and maps
+it through that player's P10-P90 quantiles (wOBA for batters, ERA for
+pitchers; TT10-TT90 true-talent quantiles with --true-talent) to a factor
+relative to the median. Rows without percentiles fall back to a normal
+spread from InterSD/IntraSD, else to the pool's median relative spread.
+
+The factor f scales the stats it drives:
+    batters   H, 1B, 2B, 3B, HR, R, RBI, BB, HBP (so AVG/OBP/SLG) scale with f
+    pitchers  ER (so ERA) scales with f and QS with 1/f
+The pitcher percentiles describe ERA alone, so K, WHIP, BB9, SB, SV, HLD and
+playing time stay at their projections. Because every category is linear in
+f or 1/f, a strategy score is c0 + c1*f + c2/f and a franchise's totals are
+one matrix product per chunk, so seasons are simulated in (chunk x players)
+arrays with no per-player Python loops.
+Results stream into fixed-size histograms, so memory depends on the chunk
+size, not the number of seasons.
+
+Usage:
+    python season_sim.py                          # volume_power, 50,000 seasons
+    python season_sim.py --all --sims 200000 --chunk 20000 --seed 1
+    python season_sim.py balanced --true-talent --top 40 --csv
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+import draft_board_analysis as dba
+import roto
+
+N_SIMS = 50_000
+CHUNK_SIMS = 10_000
+SCORE_BINS = 200
+FACTOR_FLOOR = 0.25  # Lowest factor a tail extrapolation may reach
+PERCENTILES = list(range(10, 100, 10))
+PROBS = np.array(PERCENTILES) / 100
+NORMAL_QUANTILES = np.array([-1.2816, -0.8416, -0.5244, -0.2533, 0.0, 0.2533, 0.5244, 0.8416, 1.2816])
+
+BATTING_SCALED = ['H', '1B', '2B', '3B', 'HR', 'R', 'RBI', 'BB', 'HBP']
+PITCHING_SCALED = ['ER']
+PITCHING_INVERSE = ['QS']
+
+# z column -> (stat, sign, scaling) mirroring draft_board_analysis.add_zscores
+Z_SOURCES = {
+    'z_HR': ('HR', 1, 'f'), 'z_R': ('R', 1, 'f'), 'z_RBI': ('RBI', 1, 'f'),
+    'z_SB': ('SB', 1, None), 'z_AVG': ('AVG', 1, 'f'), 'z_OBP': ('OBP', 1, 'f'),
+    'z_SLG': ('SLG', 1, 'f'), 'z_QS': ('QS', 1, 'inverse'), 'z_K': ('SO', 1, None),
+    'z_ERA': ('ERA', -1, 'f'), 'z_WHIP': ('WHIP', -1, None),
+    'z_SV': ('SV', 1, None), 'z_HLD': ('HLD', 1, None),
+}
+FILLNA_STATS = ['SV', 'HLD']
+
+# =============================================================================
+# PERFORMANCE FACTORS
+# =============================================================================
+
+def relative_quantiles(players, prefix='P'):
+    """players x 9 factors at the 10th..90th performance percentile (median = 1)."""
+    q = players[[f'{prefix}{p}' for p in PERCENTILES]].to_numpy(dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rel = q / q[:, 4:5]
+    have = np.isfinite(rel).all(axis=1) & (q[:, 4] > 0)
+
+    is_batter = (players['Player_Type'] == 'Batter').to_numpy()
+    rate = np.where(is_batter, players['wOBA'].to_numpy(dtype=float), players['ERA'].to_numpy(dtype=float))
+    spread = np.hypot(players['InterSD'].to_numpy(dtype=float), players['IntraSD'].to_numpy(dtype=float))
+    # Higher ERA is a worse season, so pitcher quantiles run the other way
+    direction = np.where(is_batter, 1.0, -1.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        normal = 1 + direction[:, None] * NORMAL_QUANTILES * (spread / rate)[:, None]
+    use_normal = ~have & np.isfinite(normal).all(axis=1)
+    rel[use_normal] = normal[use_normal]
+
+    for side in (is_batter, ~is_batter):
+        known = side & (have | use_normal)
+        default = np.median(rel[known], axis=0) if known.any() else np.ones(len(PERCENTILES))
+        rel[side & ~known] = default
+    return rel
+
+
+def factor_at(rel, u):
+    """Factors for percentiles u (sims x players), linear between deciles and in the tails."""
+    seg = np.clip(np.floor(u * 10).astype(np.int64) - 1, 0, len(PERCENTILES) - 2)
+    t = (u - PROBS[seg]) * 10
+    cols = np.arange(rel.shape[0])
+    lo = rel[cols, seg]
+    hi = rel[cols, seg + 1]
+    return np.maximum(lo + t * (hi - lo), FACTOR_FLOOR)
+
+
+def sample_factors(rel, rng, n_sims):
+    """(n_sims x players) factors from independent uniform percentiles."""
+    return factor_at(rel, rng.random((n_sims, rel.shape[0])))
+
+# =============================================================================
+# STRATEGY SCORE DISTRIBUTIONS
+# =============================================================================
+
+def _stat(frame, stat):
+    values = frame[stat]
+    if stat in FILLNA_STATS:
+        values = values.fillna(0)
+    return values.to_numpy(dtype=float)
+
+
+def score_coefficients(pool, players, weights):
+    """(3 x players) array c with score = c[0] + c[1]*f + c[2]/f.
+
+    z-scores use the mean/std of `pool` (the filtered playing-time pool), so
+    f = 1 reproduces the draft board's Strategy_Score.
+    """
+    c = np.zeros((3, len(players)))
+    for col, w in weights.items():
+        stat, sign, scaling = Z_SOURCES[col]
+        moments = pd.Series(_stat(pool, stat))
+        mean, std = moments.mean(), moments.std()
+        if w == 0 or std == 0:
+            continue
+        k = w * sign / std
+        c[0] -= k * mean
+        c[{None: 0, 'f': 1, 'inverse': 2}[scaling]] += k * _stat(players, stat)
+    return c
+
+
+class ScoreHistogram:
+    """Streaming per-player score histograms over fixed ranges."""
+
+    def __init__(self, lo, hi, bins=SCORE_BINS):
+        self.lo, self.bins = lo, bins
+        self.width = np.maximum(hi - lo, 1e-9) / bins
+        self.counts = np.zeros(len(lo) * bins, dtype=np.int64)
+        self.total = 0
+        self.sum = np.zeros(len(lo))
+        self.sumsq = np.zeros(len(lo))
+
+    def add(self, scores):
+        """Accumulate a (sims x players) chunk."""
+        bins = np.clip(((scores - self.lo) / self.width).astype(np.int64), 0, self.bins - 1)
+        flat = (np.arange(scores.shape[1]) * self.bins + bins).ravel()
+        self.counts += np.bincount(flat, minlength=len(self.counts))
+        self.total += scores.shape[0]
+        self.sum += scores.sum(axis=0)
+        self.sumsq += (scores ** 2).sum(axis=0)
+
+    def mean(self):
+        return self.sum / self.total
+
+    def std(self):
+        return np.sqrt(np.maximum(self.sumsq / self.total - self.mean() ** 2, 0))
+
+    def quantile(self, q):
+        """Per-player quantile, interpolated within the histogram bin."""
+        counts = self.counts.reshape(-1, self.bins)
+        cum = np.cumsum(counts, axis=1)
+        target = q * self.total
+        idx = np.minimum((cum < target).sum(axis=1), self.bins - 1)
+        rows = np.arange(len(idx))
+        before = np.where(idx > 0, cum[rows, idx - 1], 0)
+        inside = np.maximum(counts[rows, idx], 1)
+        frac = np.clip((target - before) / inside, 0, 1)
+        return self.lo + (idx + frac) * self.width
+
+
+def score_range(c, rel):
+    """Lowest and highest score reachable over the factor range of each player."""
+    grid = np.linspace(0, 1, 65)[:, None] * np.ones((1, rel.shape[0]))
+    f = factor_at(rel, grid)
+    scores = c[0] + c[1] * f + c[2] / f
+    return scores.min(axis=0), scores.max(axis=0)
+
+
+def simulate_scores(batters, pitchers, strategy_key, n_sims=N_SIMS, chunk=CHUNK_SIMS,
+                    seed=0, prefix='P'):
+    """Strategy-score distribution per available pool player, as a DataFrame."""
+    reliever_split = strategy_key in dba.RELIEVER_STRATEGIES
+    pool_b, pool_p = dba.filter_playing_time(batters, pitchers, reliever_split)
+    weights = dba.STRATEGIES[strategy_key]
+    players = pd.concat([pool_b[pool_b['Block_Type'] != 'Full'],
+                         pool_p[pool_p['Block_Type'] != 'Full']], ignore_index=True)
+    nb = int((pool_b['Block_Type'] != 'Full').sum())
+
+    c = np.concatenate([score_coefficients(pool_b, players.iloc[:nb], weights['batter']),
+                        score_coefficients(pool_p, players.iloc[nb:], weights['pitcher'])], axis=1)
+    rel = relative_quantiles(players, prefix)
+    projected = c.sum(axis=0)
+    t90 = np.concatenate([np.nanquantile(projected[:nb], 0.9) * np.ones(nb),
+                          np.nanquantile(projected[nb:], 0.9) * np.ones(len(players) - nb)])
+
+    hist = ScoreHistogram(*score_range(c, rel))
+    top_tier = np.zeros(len(players))
+    rng = np.random.default_rng(seed)
+    for start in range(0, n_sims, chunk):
+        f = sample_factors(rel, rng, min(chunk, n_sims - start))
+        scores = c[0] + c[1] * f + c[2] / f
+        hist.add(scores)
+        top_tier += (scores >= t90).sum(axis=0)
+
+    result = players[['Name', 'Team', 'Player_Type']].copy()
+    result['Projected_Score'] = projected
+    result['Mean'] = hist.mean()
+    result['SD'] = hist.std()
+    for q in (0.1, 0.5, 0.9):
+        result[f'P{int(q * 100)}'] = hist.quantile(q)
+    result['Tier1_Prob'] = top_tier / n_sims
+    return result.sort_values('Projected_Score', ascending=False, ignore_index=True)
+
+# =============================================================================
+# FRANCHISE ROTO POINTS
+# =============================================================================
+
+def roster_components(players):
+    """Fixed and factor-scaled batting/pitching component arrays for each player."""
+    is_batter = (players['Player_Type'] == 'Batter').to_numpy()
+    batting = roto.batting_components(players) * is_batter[:, None]
+    pitching = roto.pitching_components(players) * ~is_batter[:, None]
+
+    b_scaled = np.isin(roto.BATTING_COMPONENTS, BATTING_SCALED)
+    p_scaled = np.isin(roto.PITCHING_COMPONENTS, PITCHING_SCALED)
+    p_inverse = np.isin(roto.PITCHING_COMPONENTS, PITCHING_INVERSE)
+    return {
+        'bat_fixed': batting * ~b_scaled,
+        'bat_f': batting * b_scaled,
+        'pit_fixed': pitching * ~(p_scaled | p_inverse),
+        'pit_f': pitching * p_scaled,
+        'pit_inverse': pitching * p_inverse,
+    }
+
+
+def simulate_rosters(table, n_sims=N_SIMS, chunk=CHUNK_SIMS, seed=0, prefix='P'):
+    """Roto points distribution per franchise (Rostered_By) playing each other.
+
+    Returns (summary, category_points): summary has mean/SD/P10/P50/P90 total
+    points and the probability of finishing first (ties split); category
+    points are the per-category means.
+    """
+    rostered = table[table['Rostered_By'].notna()]
+    teams, member = np.unique(rostered['Rostered_By'].astype(str), return_inverse=True)
+    n_teams = len(teams)
+    membership = np.zeros((len(rostered), n_teams))
+    membership[np.arange(len(rostered)), member] = 1
+
+    comps = roster_components(rostered)
+    team = {name: membership.T @ values for name, values in comps.items()}   # teams x components
+    # players x (teams * components): one matmul turns factors into team totals
+    spread = {name: (membership[:, :, None] * values[:, None, :]).reshape(len(rostered), -1)
+              for name, values in comps.items() if name != 'bat_fixed' and name != 'pit_fixed'}
+    rel = relative_quantiles(rostered, prefix)
+
+    max_points = 2 * n_teams * len(roto.CATEGORIES) + 1   # half-point steps
+    counts = np.zeros((n_teams, max_points), dtype=np.int64)
+    category_sum = np.zeros((n_teams, len(roto.CATEGORIES)))
+    wins = np.zeros(n_teams)
+    rng = np.random.default_rng(seed)
+    for start in range(0, n_sims, chunk):
+        f = sample_factors(rel, rng, min(chunk, n_sims - start))
+        shape = (f.shape[0], n_teams, -1)
+        bat = team['bat_fixed'] + (f @ spread['bat_f']).reshape(shape)
+        pit = team['pit_fixed'] + (f @ spread['pit_f']).reshape(shape) \
+            + ((1 / f) @ spread['pit_inverse']).reshape(shape)
+        points = roto.league_points(roto.category_values(bat, pit))   # sims x teams x categories
+        totals = points.sum(axis=-1)
+
+        category_sum += points.sum(axis=0)
+        flat = (np.arange(n_teams) * max_points + np.rint(2 * totals).astype(np.int64)).ravel()
+        counts += np.bincount(flat, minlength=counts.size).reshape(counts.shape)
+        best = totals == totals.max(axis=1, keepdims=True)
+        wins += (best / best.sum(axis=1, keepdims=True)).sum(axis=0)
+
+    grid = np.arange(max_points) / 2
+    mean = counts @ grid / n_sims
+    cum = np.cumsum(counts, axis=1)
+    summary = pd.DataFrame({
+        'Franchise': teams,
+        'Players': np.bincount(member, minlength=n_teams),
+        'Mean_Points': mean,
+        'SD': np.sqrt(np.maximum(counts @ grid ** 2 / n_sims - mean ** 2, 0)),
+        'P10': grid[(cum < 0.1 * n_sims).sum(axis=1)],
+        'P50': grid[(cum < 0.5 * n_sims).sum(axis=1)],
+        'P90': grid[(cum < 0.9 * n_sims).sum(axis=1)],
+        'Win_Prob': wins / n_sims,
+    })
+    category_points = pd.DataFrame(category_sum / n_sims, index=teams, columns=roto.CATEGORIES)
+    order = np.argsort(-mean, kind='stable')
+    return summary.iloc[order].reset_index(drop=True), category_points.iloc[order]
+
+# =============================================================================
+# REPORT
+# =============================================================================
+
+def print_scores(key, result, top):
+    print("\n" + "=" * 80)
+    print(f"STRATEGY SCORE DISTRIBUTIONS: {dba.STRATEGIES[key]['name']}")
+    print("=" * 80)
+    print(f"{'Name':<25} {'Type':<8} {'Proj':>6} {'Mean':>6} {'SD':>5} {'P10':>6} {'P50':>6} {'P90':>6} {'Tier1':>6}")
+    for _, row in result.head(top).iterrows():
+        print(f"{row['Name']:<25} {row['Player_Type']:<8} {row['Projected_Score']:>6.2f} {row['Mean']:>6.2f} "
+              f"{row['SD']:>5.2f} {row['P10']:>6.2f} {row['P50']:>6.2f} {row['P90']:>6.2f} "
+              f"{row['Tier1_Prob']:>6.1%}")
+
+
+def print_rosters(summary, category_points):
+    print("\n" + "=" * 80)
+    print("FRANCHISE ROTO POINTS DISTRIBUTION")
+    print("=" * 80)
+    print(f"{'Franchise':<30} {'Plyr':>4} {'Mean':>6} {'SD':>5} {'P10':>6} {'P50':>6} {'P90':>6} {'Win%':>6}")
+    for _, row in summary.iterrows():
+        print(f"{row['Franchise']:<30} {row['Players']:>4} {row['Mean_Points']:>6.1f} {row['SD']:>5.1f} "
+              f"{row['P10']:>6.1f} {row['P50']:>6.1f} {row['P90']:>6.1f} {row['Win_Prob']:>6.1%}")
+    print("\nMean category points:")
+    print(category_points.round(1).to_string())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('strategies', nargs='*', default=['volume_power'])
+    parser.add_argument('--all', action='store_true', help='simulate every strategy')
+    parser.add_argument('--sims', type=int, default=N_SIMS)
+    parser.add_argument('--chunk', type=int, default=CHUNK_SIMS)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--top', type=int, default=25, help='players to print per strategy')
+    parser.add_argument('--true-talent', action='store_true', help='sample TT10-TT90 instead of P10-P90')
+    parser.add_argument('--csv', action='store_true', help='write sim_scores_<strategy>.csv and sim_rosters.csv')
+    args = parser.parse_args()
+
+    keys = list(dba.STRATEGIES) if args.all else args.strategies
+    unknown = [key for key in keys if key not in dba.STRATEGIES]
+    if unknown:
+        print(f"Unknown strategy: {', '.join(unknown)}")
+        print(f"Available: {', '.join(dba.STRATEGIES)}")
+        raise SystemExit(1)
+    prefix = 'TT' if args.true_talent else 'P'
+
+    batters, pitchers = dba.load_players()
+    for key in keys:
+        start = time.perf_counter()
+        result = simulate_scores(batters, pitchers, key, args.sims, args.chunk, args.seed, prefix)
+        print_scores(key, result, args.top)
+        print(f"\n{args.sims:,} seasons x {len(result)} players in {time.perf_counter() - start:.2f}s")
+        if args.csv:
+            result.to_csv(f'sim_scores_{key}.csv', index=False)
+
+    start = time.perf_counter()
+    table = pd.concat([batters, pitchers])
+    summary, category_points = simulate_rosters(table, args.sims, args.chunk, args.seed, prefix)
+    print_rosters(summary, category_points)
+    print(f"\n{args.sims:,} seasons x {len(summary)} franchises in {time.perf_counter() - start:.2f}s")
+    if args.csv:
+        summary.to_csv('sim_rosters.csv', index=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Local rankings server: draft-night lookups over HTTP/JSON.
+
+The player table, both z-score pools (standard and reliever split, see
+scoring.py) and every strategy's ranking are loaded once at startup, so a
+request is a few NumPy indexing operations plus JSON encoding: single-digit
+milliseconds. ThreadingHTTPServer answers each client on its own thread;
+shared state is read-only apart from the picks file, which is re-read under
+a lock when it changes.
+
+Endpoints (GET; every response is JSON):
+    /strategies                          strategy keys, names and descriptions
+    /board/<strategy>                    ranked board for a strategy
+    /rank?z_HR=1&z_SB=0.5[&split=1]      re-score with custom weights (POST a JSON
+                                         {"weights": {...}, "split": false, ...} also works)
+    /players?q=soto                      name search with every strategy's rank
+    /health                              pool sizes and pick count
+
+Board and rank filters:
+    type=batter|pitcher                  one side only
+    status=all|fa|partial|rostered       fa = unrostered and unblocked (default all)
+    undrafted=1                          drop players in --picks (live_draft.py log)
+    limit=50&offset=0                    page through the board
+
+Usage:
+    python server.py                                  # http://127.0.0.1:8765
+    python server.py --host 0.0.0.0 --port 9000       # reachable from other devices
+    python server.py --picks draft_picks.csv          # honour undrafted=1
+"""
+
+import argparse
+import functools
+import json
+import math
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+import draft_board_analysis as dba
+import scoring
+import tracing
+from player_identity import PlayerIndex, identity_key
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 1000
+LISTEN_BACKLOG = 64    # pending connections; socketserver's default of 5 drops bursts
+STATUSES = ('all', 'fa', 'partial', 'rostered')
+BOARD_PARAMS = ('type', 'status', 'undrafted', 'limit', 'offset')
+RANK_PARAMS = BOARD_PARAMS + ('split',)
+
+
+# =============================================================================
+# WARM STATE
+# =============================================================================
+
+class Pool:
+    """One ScoringEngine plus the per-row columns responses and filters need."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        players = engine.players
+        self.player_ids = players['PlayerId'].astype(str).to_numpy()
+        self.row_of = {pid: row for row, pid in enumerate(self.player_ids)}
+        # Free agents without an MLB team have NaN Team, which is not JSON
+        self.teams = _strings(pd.Series(engine.teams))
+        self.rostered_by = _strings(players['Rostered_By'])
+        self.block_type = _strings(players['Block_Type'])
+        self.salary = players['Salary_2026'].to_numpy(dtype=float) / 1_000_000
+
+        rostered = players['Rostered_By'].notna().to_numpy()
+        blocked = players['Block_Type'].notna().to_numpy()
+        self.status_masks = {
+            'all': np.ones(len(players), dtype=bool),
+            'fa': ~rostered & ~blocked,
+            'partial': (players['Block_Type'] == 'Partial').to_numpy(),
+            'rostered': rostered,
+        }
+        is_batter = (players['Player_Type'] == 'Batter').to_numpy()
+        self.type_masks = {None: self.status_masks['all'], 'batter': is_batter, 'pitcher': ~is_batter}
+
+    def row(self, row, rank, ranked):
+        e = self.engine
+        return {
+            'rank': int(rank),
+            'name': e.names[row],
+            'team': self.teams[row],
+            'player_type': e.player_types[row],
+            'position': e.positions[row],
+            'score': round(float(ranked.scores[row]), 4),
+            'tier': scoring.TIER_NAMES[ranked.tier_codes[row]],
+            'rostered_by': self.rostered_by[row],
+            'block_type': self.block_type[row],
+            'salary_2026_m': None if np.isnan(self.salary[row]) else round(float(self.salary[row]), 2),
+            'player_id': self.player_ids[row],
+        }
+
+
+def _strings(series):
+    """Object array with None for missing values, ready for json.dumps."""
+    values = series.astype(object).to_numpy()
+    return np.where(pd.isna(values), None, values)
+
+
+def parse_weights(raw):
+    """{category: finite float} from a JSON object or query parameters.
+
+    Raises ValueError (a 400 response) for anything else: a non-object,
+    unknown categories, values that are not finite numbers, or no non-zero
+    weight at all (every player would score 0).
+    """
+    if not isinstance(raw, dict):
+        raise ValueError("weights must be a JSON object of category: number")
+    unknown = [str(k) for k in raw if not isinstance(k, str) or k not in scoring.CATEGORIES]
+    if unknown:
+        raise ValueError(f"Unknown categories: {', '.join(sorted(unknown))}")
+    weights = {}
+    for key, value in raw.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            raise ValueError(f"{key} must be a number, not {value!r}")
+        try:
+            weights[key] = float(value)
+        except ValueError:
+            raise ValueError(f"{key} must be a number, not {value!r}") from None
+        if not math.isfinite(weights[key]):
+            raise ValueError(f"{key} must be finite, not {value!r}")
+    if not any(weights.values()):
+        raise ValueError(f"weights need at least one non-zero category, e.g. {scoring.CATEGORIES[0]}")
+    return weights
+
+
+def _count(params, name, default):
+    """Non-negative integer query parameter."""
+    value = int(params.get(name, default))
+    if value < 0:
+        raise ValueError(f"{name} must be >= 0, not {value}")
+    return value
+
+
+def _rank_of(ranked):
+    rank = np.empty(len(ranked.order), dtype=np.int64)
+    rank[ranked.order] = np.arange(1, len(ranked.order) + 1)
+    return rank
+
+
+class RankingState:
+    """Everything the handlers read, built once at startup."""
+
+    def __init__(self, batters, pitchers, picks_path=None):
+        self.pools = {split: Pool(scoring.ScoringEngine(batters, pitchers, split)) for split in (False, True)}
+        self.boards = {}
+        for key in dba.STRATEGIES:
+            ranked = self.pools[key in dba.RELIEVER_STRATEGIES].engine.rank(scoring.strategy_weights(key))
+            self.boards[key] = (ranked, _rank_of(ranked))
+
+        players = pd.concat([batters, pitchers], ignore_index=True)
+        self.index = PlayerIndex(players)
+        self.search_keys = [identity_key(name) for name in self.index.names]
+        self.teams = _strings(pd.Series(self.index.hint_values['Team']))
+
+        self.picks_path = picks_path
+        self.picks_mtime = None
+        self.picked = {split: np.zeros(len(pool.player_ids), dtype=bool) for split, pool in self.pools.items()}
+        self.lock = threading.Lock()
+        self.rank = functools.lru_cache(maxsize=256)(self._rank)
+
+    @classmethod
+    def from_cache(cls, picks_path=None):
+        batters, pitchers = dba.load_players()
+        return cls(batters, pitchers, picks_path)
+
+    def drafted(self, split):
+        """Rows of a pool already taken in the picks file (re-read when it changes)."""
+        if not self.picks_path or not os.path.exists(self.picks_path):
+            return self.picked[split]
+        mtime = os.stat(self.picks_path).st_mtime_ns
+        if mtime != self.picks_mtime:
+            with self.lock:
+                if mtime != self.picks_mtime:
+                    ids = set(pd.read_csv(self.picks_path, dtype={'PlayerId': str})['PlayerId'].dropna())
+                    self.picked = {s: np.isin(pool.player_ids, list(ids)) for s, pool in self.pools.items()}
+                    self.picks_mtime = mtime
+        return self.picked[split]
+
+    def _rank(self, split, weights):
+        ranked = self.pools[split].engine.rank(dict(weights))
+        return ranked, _rank_of(ranked)
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    def board(self, split, ranked, rank_of, params):
+        pool = self.pools[split]
+        side = params.get('type')
+        status = params.get('status', 'all')
+        if side not in pool.type_masks:
+            raise ValueError(f"type must be batter or pitcher, not {side!r}")
+        if status not in STATUSES:
+            raise ValueError(f"status must be one of {', '.join(STATUSES)}, not {status!r}")
+        limit = min(_count(params, 'limit', DEFAULT_LIMIT), MAX_LIMIT)
+        offset = _count(params, 'offset', 0)
+
+        mask = pool.type_masks[side] & pool.status_masks[status]
+        if params.get('undrafted') in ('1', 'true', True):
+            mask = mask & ~self.drafted(split)
+        order = ranked.order[mask[ranked.order]]
+        rows = order[offset:offset + limit]
+        return {'total': int(len(order)), 'offset': offset,
+                'players': [pool.row(row, rank_of[row], ranked) for row in rows]}
+
+    def strategy_board(self, key, params):
+        if key not in self.boards:
+            raise LookupError(f"Unknown strategy: {key}")
+        ranked, rank_of = self.boards[key]
+        result = self.board(key in dba.RELIEVER_STRATEGIES, ranked, rank_of, params)
+        return {'strategy': key, **result}
+
+    def custom_board(self, weights, params):
+        split = params.get('split') in ('1', 'true', True)
+        weights = parse_weights(weights)
+        ranked, rank_of = self.rank(split, tuple(sorted(weights.items())))
+        return {'weights': weights, 'split': split, **self.board(split, ranked, rank_of, params)}
+
+    def players(self, query, limit=10):
+        """Substring matches on the folded name, else the best fuzzy match."""
+        needle = identity_key(query)
+        if not needle:
+            raise ValueError("q is required")
+        rows = [row for row, key in enumerate(self.search_keys) if needle in key]
+        if not rows:
+            match = self.index.lookup(query)
+            rows = [] if match.row is None else [match.row]
+        rows.sort(key=lambda row: -self.index.fpts[row])
+
+        results = []
+        for row in rows[:limit]:
+            player_id = self.index.player_ids[row]
+            entry = {'name': self.index.names[row], 'player_id': player_id,
+                     'team': self.teams[row],
+                     'player_type': self.index.hint_values['Player_Type'][row], 'strategies': {}}
+            for key, (ranked, rank_of) in self.boards.items():
+                pool = self.pools[key in dba.RELIEVER_STRATEGIES]
+                pool_row = pool.row_of.get(player_id)
+                entry['strategies'][key] = None if pool_row is None else {
+                    'rank': int(rank_of[pool_row]),
+                    'score': round(float(ranked.scores[pool_row]), 4),
+                    'tier': scoring.TIER_NAMES[ranked.tier_codes[pool_row]],
+                }
+            results.append(entry)
+        return {'query': query, 'players': results}
+
+    def health(self):
+        return {'pools': {('reliever_split' if split else 'standard'): len(pool.player_ids)
+                          for split, pool in self.pools.items()},
+                'strategies': list(self.boards),
+                'picks': int(self.drafted(False).sum()) if self.picks_path else None}
+
+# =============================================================================
+# HTTP
+# =============================================================================
+
+class Handler(BaseHTTPRequestHandler):
+    state = None
+    verbose = False
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        self.dispatch(url.path.rstrip('/') or '/', params, None)
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            self.send_json(400, {'error': 'body must be JSON'})
+            return
+        if not isinstance(body, dict):
+            self.send_json(400, {'error': 'body must be a JSON object'})
+            return
+        nested = [k for k, v in body.items() if k != 'weights' and isinstance(v, (dict, list))]
+        if nested:
+            self.send_json(400, {'error': f"{', '.join(nested)} must be a string, number or boolean"})
+            return
+        self.dispatch(url.path.rstrip('/') or '/', {k: v for k, v in body.items() if k != 'weights'},
+                      body.get('weights', {}))
+
+    def dispatch(self, path, params, weights):
+        start = time.perf_counter()
+        state = self.state
+        try:
+            if path == '/strategies':
+                result = {key: {'name': s['name'], 'description': s['description']}
+                          for key, s in dba.STRATEGIES.items()}
+            elif path.startswith('/board/'):
+                result = state.strategy_board(path[len('/board/'):], params)
+            elif path == '/rank':
+                query = weights is None
+                if query:
+                    weights = {k: v for k, v in params.items() if k.startswith('z_')}
+                unknown = [k for k in params if k not in RANK_PARAMS and not (query and k.startswith('z_'))]
+                if unknown:
+                    raise ValueError(f"Unknown parameters: {', '.join(sorted(unknown))} "
+                                     f"(weights are z_<category>, e.g. z_HR)")
+                result = state.custom_board(weights, params)
+            elif path == '/players':
+                result = state.players(params.get('q', ''), min(_count(params, 'limit', 10), MAX_LIMIT))
+            elif path == '/health':
+                result = state.health()
+            else:
+                self.send_json(404, {'error': f'no endpoint {path}'})
+                return
+        except LookupError as e:
+            self.send_json(404, {'error': str(e).strip("'")})
+            return
+        except ValueError as e:
+            self.send_json(400, {'error': str(e)})
+            return
+        self.send_json(200, result, time.perf_counter() - start)
+
+    def send_json(self, status, payload, elapsed=None):
+        body = json.dumps(payload, allow_nan=False).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        if elapsed is not None:
+            self.send_header('X-Elapsed-Ms', f'{elapsed * 1000:.2f}')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.verbose:
+            super().log_message(format, *args)
+
+
+class Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = LISTEN_BACKLOG
+
+
+def make_server(state, host=DEFAULT_HOST, port=DEFAULT_PORT, verbose=False):
+    handler = type('BoundHandler', (Handler,), {'state': state, 'verbose': verbose})
+    return Server((host, port), handler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--picks', help='live_draft.py picks CSV; undrafted=1 hides its players')
+    parser.add_argument('--verbose', action='store_true', help='log every request')
+    args = parser.parse_args(tracing.enable_from_argv(sys.argv[1:] if argv is None else argv))
+
+    start = time.perf_counter()
+    state = RankingState.from_cache(args.picks)
+    server = make_server(state, args.host, args.port, args.verbose)
+    sizes = state.health()['pools']
+    print(f"Loaded {sizes['standard']} + {sizes['reliever_split']} pool players and "
+          f"{len(state.boards)} strategy boards in {time.perf_counter() - start:.2f}s")
+    print(f"Serving on http://{args.host}:{server.server_port} (Ctrl-C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Standings gain points (SGP): player value in roto points of this league.
+
+A category's SGP denominator is how much of the stat buys one standings
+point. It is the Theil-Sen slope (median of pairwise slopes, robust to
+outliers such as a forfeited team's 999963 ERA) of Value on Points across
+the 12 teams in fantrax_data.csv.
+
+A player's SGP in a category is the change in an average team's value when
+the player joins it, divided by the denominator. The average team is a
+roster (one player short) of the players a 12-team league would roster,
+so rate stats are weighted by playing time: 600 AB of .300 moves team AVG
+more than 200 AB of .320. Its rates come from the projections rather than
+the league file because fantrax WHIP runs well below projected WHIP. All
+players are valued in one vectorized pass over their summed stat
+components (see roto.category_values).
+
+Usage:
+    python sgp.py    # print denominators and the top players by SGP
+"""
+
+import functools
+import time
+
+import numpy as np
+import pandas as pd
+
+import roto
+import tracing
+
+SGP_COLUMNS = [f'sgp_{cat}' for cat in roto.CATEGORIES]
+
+
+def theil_sen(x, y):
+    """Median pairwise slope of y on x per column; x, y are (teams, C)."""
+    dx = x[:, None, :] - x[None, :, :]
+    dy = y[:, None, :] - y[None, :, :]
+    upper = np.triu(np.ones((len(x), len(x)), dtype=bool), k=1)[:, :, None]
+    valid = upper & (dx != 0) & np.isfinite(dy)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slopes = np.where(valid, dy / dx, np.nan)
+    return np.nanmedian(slopes.reshape(-1, x.shape[1]), axis=0)
+
+
+@functools.lru_cache(maxsize=None)
+def denominators(league_path='fantrax_data.csv'):
+    """Stat per standings point for each category (positive; direction is in roto.direction)."""
+    _, values, points = roto.load_league(league_path)
+    return pd.Series(np.abs(theil_sen(points, values)), index=roto.CATEGORIES)
+
+
+def average_team(batters, pitchers,
+                 league_size=roto.LEAGUE_SIZE, n_batters=roto.ROSTER_BATTERS, n_pitchers=roto.ROSTER_PITCHERS):
+    """Component totals of a team one player short of a full roster.
+
+    The league's rostered pool is the top league_size * roster batters by AB
+    and pitchers by IP; the team holds (roster - 1) of its average players.
+    """
+    ab = batters['AB'].fillna(0)
+    ip = pitchers['IP'].fillna(0)
+    rostered_b = batters.loc[ab.nlargest(league_size * n_batters).index]
+    rostered_p = pitchers.loc[ip.nlargest(league_size * n_pitchers).index]
+    bat = roto.batting_components(rostered_b).mean(axis=0) * (n_batters - 1)
+    pit = roto.pitching_components(rostered_p).mean(axis=0) * (n_pitchers - 1)
+    return bat, pit
+
+
+def sgp_matrix(players, base_bat, base_pit, denoms):
+    """players x CATEGORIES SGP; batters only move batting categories and vice versa."""
+    is_batter = (players['Player_Type'] == 'Batter').to_numpy()
+    bat = roto.batting_components(players) * is_batter[:, None]
+    pit = roto.pitching_components(players) * ~is_batter[:, None]
+    base = roto.category_values(base_bat, base_pit)
+    gain = roto.category_values(base_bat + bat, base_pit + pit) - base
+    return gain * roto.direction() / denoms.to_numpy()
+
+
+@tracing.traced('sgp')
+def add_sgp(batters, pitchers, league_path='fantrax_data.csv'):
+    """Add sgp_* category columns to the batter and pitcher pools.
+
+    The pools set the average team's playing time, like add_zscores uses
+    them for means and standard deviations.
+    """
+    denoms = denominators(league_path)
+    base_bat, base_pit = average_team(batters, pitchers)
+    batters = pd.concat([batters, pd.DataFrame(
+        sgp_matrix(batters, base_bat, base_pit, denoms), columns=SGP_COLUMNS, index=batters.index)], axis=1)
+    pitchers = pd.concat([pitchers, pd.DataFrame(
+        sgp_matrix(pitchers, base_bat, base_pit, denoms), columns=SGP_COLUMNS, index=pitchers.index)], axis=1)
+    return batters, pitchers
+
+
+def main():
+    import player_cache
+
+    table = player_cache.load_player_table()
+    batters = table[table['Player_Type'] == 'Batter']
+    pitchers = table[table['Player_Type'] == 'Pitcher']
+    denoms = denominators()
+
+    print("\n" + "=" * 80)
+    print("SGP DENOMINATORS (stat per standings point, Theil-Sen over the 12-team ladder)")
+    print("=" * 80)
+    for cat in roto.CATEGORIES:
+        print(f"  {cat:<5} {denoms[cat]:>10.4f}")
+
+    start = time.perf_counter()
+    base_bat, base_pit = average_team(batters, pitchers)
+    values = sgp_matrix(table, base_bat, base_pit, denoms)
+    elapsed = time.perf_counter() - start
+    total = pd.Series(np.nansum(values, axis=1), index=table.index)
+
+    print(f"\nValued {len(table):,} players in {elapsed * 1000:.1f} ms")
+    for player_type, cats in (('Batter', roto.BATTING_CATEGORIES), ('Pitcher', roto.PITCHING_CATEGORIES)):
+        print("\n" + "=" * 80)
+        print(f"TOP 15 {player_type.upper()}S BY TOTAL SGP")
+        print("=" * 80)
+        idx = [roto.CATEGORIES.index(c) for c in cats]
+        print(f"{'Name':<25} {'SGP':>6} " + ' '.join(f'{c:>5}' for c in cats))
+        top = total[table['Player_Type'] == player_type].nlargest(15).index
+        for row in top:
+            i = table.index.get_loc(row)
+            print(f"{table.at[row, 'Name']:<25} {total[row]:>6.2f} "
+                  + ' '.join(f'{v:>5.2f}' for v in values[i, idx]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Read-only NumPy arrays shared with worker processes.
+
+The parent copies each array into a multiprocessing.shared_memory block once;
+workers attach by name and get zero-copy, write-protected views. Used by the
+process-pool searches so every worker scores against the same matrices.
+
+    with SharedArrays({'z': z_matrix}) as shared:
+        with ProcessPoolExecutor(initializer=attach_worker, initargs=(shared.specs,)) as pool:
+            ...
+    # in the worker: worker_arrays()['z']
+"""
+
+from multiprocessing import shared_memory
+
+import numpy as np
+
+_worker_blocks = []
+_worker_arrays = {}
+
+
+class SharedArrays:
+    """Context manager owning shared-memory copies of a dict of arrays."""
+
+    def __init__(self, arrays):
+        self.blocks = []
+        self.specs = {}
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+            self.blocks.append(block)
+            self.specs[name] = (block.name, array.shape, array.dtype.str)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+
+
+def attach(specs):
+    """Map shared blocks described by specs to read-only arrays (blocks, arrays)."""
+    blocks, arrays = [], {}
+    for name, (block_name, shape, dtype) in specs.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+        array.flags.writeable = False
+        blocks.append(block)
+        arrays[name] = array
+    return blocks, arrays
+
+
+def attach_worker(specs):
+    """ProcessPoolExecutor initializer: attach once per worker process."""
+    blocks, arrays = attach(specs)
+    _worker_blocks.extend(blocks)
+    _worker_arrays.update(arrays)
+
+
+def worker_arrays():
+    """Arrays attached by attach_worker in this process."""
+    return _worker_arrays
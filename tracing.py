@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Named timing spans around pipeline stages, written out as a JSON trace.
+
+Library code marks its stages with
+
+    with tracing.span('merge', rows=len(df)):
+        ...
+
+or the @tracing.traced('zscore') decorator. Tracing is off by default: a
+disabled span is one flag check, so the hooks stay in place permanently.
+Turn it on without editing any script:
+
+    FBB_TRACE=trace.json python draft_board_analysis.py --all
+    python draft_board_analysis.py --all --trace            # -> fbb_trace.json
+    python generate_fbb_page.py --trace=page.json --trace-profile=cprofile
+
+FBB_TRACE=1 (or a bare --trace) writes fbb_trace.json. The trace is written
+when the process exits, in Chrome trace-event format (open it in
+chrome://tracing, https://ui.perfetto.dev or speedscope). Each span records
+wall time, CPU time and its nesting; FBB_TRACE_PROFILE / --trace-profile adds:
+
+    cprofile     a .prof file per outermost profiled span, in <trace>_profiles/
+                 (python -m pstats <file>); spans nested in a profiled span are
+                 part of its profile
+    tracemalloc  peak and net allocation per span, plus the top allocation
+                 sites it added, in the span's args (slow; for memory hunts)
+
+Usage:
+    python tracing.py fbb_trace.json        # per-span totals of a saved trace
+"""
+
+import atexit
+import cProfile
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+DEFAULT_PATH = 'fbb_trace.json'
+PROFILE_MODES = ('cprofile', 'tracemalloc')
+TOP_ALLOCATIONS = 5
+
+_enabled = False
+_state = None
+
+
+class _Trace:
+    """Finished spans plus the per-thread stack of open ones."""
+
+    def __init__(self, path, profile):
+        self.path = path
+        self.profile = profile
+        self.pid = os.getpid()
+        self.origin = time.perf_counter_ns()
+        self.events = []
+        self.local = threading.local()
+        self.profiling = False
+        self.profiles = 0
+        self.lock = threading.Lock()
+
+    def stack(self):
+        if not hasattr(self.local, 'stack'):
+            self.local.stack = []
+        return self.local.stack
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+def enable(path=DEFAULT_PATH, profile=None):
+    """Start recording spans; the trace is written to path at exit."""
+    global _enabled, _state
+    if profile not in (None, '') + PROFILE_MODES:
+        raise ValueError(f"Unknown trace profile {profile!r}; use one of {', '.join(PROFILE_MODES)}")
+    if _state is None:
+        atexit.register(write)
+    _state = _Trace(path, profile or None)
+    if _state.profile == 'tracemalloc' and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _enabled = True
+
+
+def enabled():
+    return _enabled
+
+
+def enable_from_env():
+    """Honour FBB_TRACE / FBB_TRACE_PROFILE; called once at import."""
+    value = os.environ.get('FBB_TRACE', '')
+    if value and value != '0':
+        enable(DEFAULT_PATH if value == '1' else value, os.environ.get('FBB_TRACE_PROFILE'))
+
+
+def enable_from_argv(argv):
+    """Strip --trace[=PATH] and --trace-profile=MODE from argv, enabling tracing.
+
+    Returns the remaining arguments so scripts can parse them as before.
+    """
+    path, profile, rest = None, None, []
+    for arg in argv:
+        if arg == '--trace':
+            path = DEFAULT_PATH
+        elif arg.startswith('--trace='):
+            path = arg.split('=', 1)[1] or DEFAULT_PATH
+        elif arg.startswith('--trace-profile='):
+            profile = arg.split('=', 1)[1]
+        else:
+            rest.append(arg)
+    if profile and path is None:
+        path = _state.path if _state else DEFAULT_PATH
+    if path is not None:
+        enable(path, profile or (_state.profile if _state else None))
+    return rest
+
+# =============================================================================
+# SPANS
+# =============================================================================
+
+@contextmanager
+def span(name, **args):
+    """Time the enclosed block as a named span.
+
+    Yields the span's args dict, so the block can attach results
+    (rows produced, cache hit) after the fact.
+    """
+    if not _enabled:
+        yield args
+        return
+
+    state = _state
+    stack = state.stack()
+    stack.append(name)
+    profiler = None
+    if state.profile == 'cprofile' and not state.profiling:
+        state.profiling = True
+        profiler = cProfile.Profile()
+    memory = _memory_enter() if state.profile == 'tracemalloc' else None
+
+    cpu = time.process_time_ns()
+    start = time.perf_counter_ns()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield args
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        end = time.perf_counter_ns()
+        args['cpu_ms'] = round((time.process_time_ns() - cpu) / 1e6, 3)
+        if memory is not None:
+            args.update(_memory_exit(memory))
+        if profiler is not None:
+            args['profile'] = _dump_profile(state, profiler, name)
+            state.profiling = False
+        stack.pop()
+        with state.lock:
+            state.events.append({
+                'name': name, 'cat': stack[0] if stack else name, 'ph': 'X',
+                'ts': (start - state.origin) / 1e3, 'dur': (end - start) / 1e3,
+                'pid': state.pid, 'tid': threading.get_ident(), 'args': args,
+            })
+
+
+def traced(name):
+    """Decorator form of span(name) for a whole function."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*a, **kw):
+            if not _enabled:
+                return fn(*a, **kw)
+            with span(name):
+                return fn(*a, **kw)
+        return wrapper
+    return decorator
+
+
+def _memory_enter():
+    current, peak = tracemalloc.get_traced_memory()
+    # reset_peak is global: fold the running peak into the enclosing span first
+    frames = _memory_frames()
+    if frames:
+        frames[-1]['peak'] = max(frames[-1]['peak'], peak)
+    tracemalloc.reset_peak()
+    frame = {'start': current, 'peak': current, 'snapshot': _own_filtered(tracemalloc.take_snapshot())}
+    frames.append(frame)
+    return frame
+
+
+def _memory_exit(frame):
+    current, peak = tracemalloc.get_traced_memory()
+    frame['peak'] = max(frame['peak'], peak)
+    frames = _memory_frames()
+    frames.pop()
+    if frames:
+        frames[-1]['peak'] = max(frames[-1]['peak'], frame['peak'])
+    stats = _own_filtered(tracemalloc.take_snapshot()).compare_to(frame['snapshot'], 'lineno')
+    top = [{'site': f"{s.traceback[0].filename}:{s.traceback[0].lineno}", 'kb': round(s.size_diff / 1024, 1)}
+           for s in stats[:TOP_ALLOCATIONS] if s.size_diff > 0]
+    return {'mem_peak_kb': round((frame['peak'] - frame['start']) / 1024, 1),
+            'mem_net_kb': round((current - frame['start']) / 1024, 1),
+            'top_allocations': top}
+
+
+def _own_filtered(snapshot):
+    return snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__),
+                                   tracemalloc.Filter(False, __file__)])
+
+
+def _memory_frames():
+    local = _state.local
+    if not hasattr(local, 'memory'):
+        local.memory = []
+    return local.memory
+
+
+def _dump_profile(state, profiler, name):
+    directory = f"{os.path.splitext(state.path)[0]}_profiles"
+    os.makedirs(directory, exist_ok=True)
+    state.profiles += 1
+    path = os.path.join(directory, f"{state.profiles:03d}_{name.replace('/', '_')}.prof")
+    profiler.dump_stats(path)
+    return path
+
+# =============================================================================
+# OUTPUT
+# =============================================================================
+
+def write():
+    """Write the trace file (runs at exit; safe to call early)."""
+    if _state is None or not _state.events:
+        return None
+    path = _state.path
+    if os.getpid() != _state.pid:
+        # Forked workers inherit the trace; keep their spans out of the parent's file
+        stem, ext = os.path.splitext(path)
+        path = f"{stem}.{os.getpid()}{ext}"
+    events = sorted(_state.events, key=lambda e: e['ts'])
+    trace = {
+        'traceEvents': [{'name': 'process_name', 'ph': 'M', 'pid': _state.pid,
+                         'args': {'name': ' '.join([os.path.basename(sys.argv[0])] + sys.argv[1:])}}] + events,
+        'displayTimeUnit': 'ms',
+    }
+    with open(path, 'w') as f:
+        json.dump(trace, f, default=str)
+    print(f"Wrote trace to {path} ({len(events)} spans)", file=sys.stderr)
+    return path
+
+
+def summarize(trace):
+    """Per-span-name count, total wall and CPU ms, longest first."""
+    totals = {}
+    for event in trace['traceEvents']:
+        if event.get('ph') != 'X':
+            continue
+        entry = totals.setdefault(event['name'], [0, 0.0, 0.0])
+        entry[0] += 1
+        entry[1] += event['dur'] / 1e3
+        entry[2] += event['args'].get('cpu_ms', 0.0)
+    return sorted(((name, *entry) for name, entry in totals.items()), key=lambda r: -r[2])
+
+
+def main(argv):
+    if len(argv) != 1:
+        print(__doc__)
+        sys.exit(1)
+    with open(argv[0]) as f:
+        trace = json.load(f)
+
+    print("\n" + "=" * 80)
+    print(f"TRACE SUMMARY: {argv[0]}")
+    print("=" * 80)
+    print(f"{'Span':<30} {'Calls':>6} {'Wall ms':>10} {'CPU ms':>10}")
+    for name, calls, wall, cpu in summarize(trace):
+        print(f"{name:<30} {calls:>6} {wall:>10.1f} {cpu:>10.1f}")
+
+
+enable_from_env()
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
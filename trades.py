@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Trade evaluator: projected roto standings before and after a trade.
+
+Every rostered player (Rostered_By, from rosters.csv) contributes projected
+stat components to the franchise (franchises.franchise_rollup); franchise
+category values come from the summed components (roto.category_values) and
+are ranked into roto points with ties split (roto.league_points). A trade
+moves component sums between two rows of the franchise matrix, so a batch of
+trades is one (trades x teams x categories) ranking.
+
+--search enumerates every 1-for-1 and 2-for-1 (either direction) trade
+between --me and each other franchise. Players with no projected PA or IP
+cannot move the standings and are left out. Trades that cost the partner
+more than --min-partner points are dropped as unrealistic, and of the rest
+only the Pareto front of (my gain, partner gain) per partner is kept: a
+trade is dominated when another gives both sides at least as much. Partners
+are searched in parallel worker processes over shared-memory components.
+
+Usage:
+    python trades.py --me "Tyler Hart"                                   # projected standings
+    python trades.py --me "Tyler Hart" --give "Matt Olson" --get "Cal Raleigh"
+    python trades.py --me "Tyler Hart" --search --workers 4 --top 30
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import franchises
+import player_cache
+import player_identity
+import roto
+import shared_arrays
+
+CHUNK_TRADES = 4096
+MIN_PARTNER_GAIN = 0.0
+
+
+# =============================================================================
+# STANDINGS
+# =============================================================================
+
+def standings(team_bat, team_pit):
+    """(values, points) per team and category for component totals (..., teams, components)."""
+    values = roto.category_values(team_bat, team_pit)
+    return values, roto.league_points(values)
+
+
+def trade_points(team_bat, team_pit, me, partner, d_bat, d_pit):
+    """Roto points (trades x teams x categories) after each trade.
+
+    d_bat/d_pit (trades x components) are what `me` receives minus what it
+    sends; the partner gets the opposite.
+    """
+    bat = np.repeat(team_bat[None], len(d_bat), axis=0)
+    pit = np.repeat(team_pit[None], len(d_pit), axis=0)
+    bat[:, me] += d_bat
+    bat[:, partner] -= d_bat
+    pit[:, me] += d_pit
+    pit[:, partner] -= d_pit
+    return standings(bat, pit)[1]
+
+
+# =============================================================================
+# SEARCH
+# =============================================================================
+
+def candidate_trades(mine, theirs):
+    """All 1-for-1 and 2-for-1 trades as (give, get) index arrays padded with -1."""
+    a, b = np.meshgrid(mine, theirs, indexing='ij')
+    pad = lambda n: np.full(n, -1)
+    give = [np.column_stack([a.ravel(), pad(a.size)])]
+    get = [np.column_stack([b.ravel(), pad(b.size)])]
+    i, j = np.triu_indices(len(mine), k=1)
+    pairs = np.column_stack([mine[i], mine[j]])
+    give.append(np.repeat(pairs, len(theirs), axis=0))
+    get.append(np.column_stack([np.tile(theirs, len(pairs)), pad(len(pairs) * len(theirs))]))
+    i, j = np.triu_indices(len(theirs), k=1)
+    pairs = np.column_stack([theirs[i], theirs[j]])
+    give.append(np.column_stack([np.repeat(mine, len(pairs)), pad(len(mine) * len(pairs))]))
+    get.append(np.tile(pairs, (len(mine), 1)))
+    return np.concatenate(give), np.concatenate(get)
+
+
+def _sum_rows(components, index):
+    """Sum component rows for (trades, 2) indices where -1 means no player."""
+    padded = np.vstack([components, np.zeros(components.shape[1])])
+    return padded[index].sum(axis=1)
+
+
+def pareto_front(mine, partner):
+    """Indices of trades not dominated in (mine, partner), best mine first."""
+    order = np.lexsort((-partner, -mine))
+    best_partner = np.maximum.accumulate(partner[order])
+    keep = np.ones(len(order), dtype=bool)
+    keep[1:] = partner[order][1:] > best_partner[:-1]
+    return order[keep]
+
+
+def search_partner(arrays, me, partner, chunk=CHUNK_TRADES, min_partner=MIN_PARTNER_GAIN):
+    """Non-dominated trades with one partner as (give, get, my_gain, partner_gain)."""
+    active = (arrays['bat'][:, roto.BATTING_COMPONENTS.index('PA')] > 0) | \
+             (arrays['pit'][:, roto.PITCHING_COMPONENTS.index('IP')] > 0)
+    mine = np.flatnonzero((arrays['codes'] == me) & active)
+    theirs = np.flatnonzero((arrays['codes'] == partner) & active)
+    give, get = candidate_trades(mine, theirs)
+    base = standings(arrays['team_bat'], arrays['team_pit'])[1].sum(axis=-1)
+
+    my_gain = np.empty(len(give))
+    partner_gain = np.empty(len(give))
+    for start in range(0, len(give), chunk):
+        g, r = give[start:start + chunk], get[start:start + chunk]
+        d_bat = _sum_rows(arrays['bat'], r) - _sum_rows(arrays['bat'], g)
+        d_pit = _sum_rows(arrays['pit'], r) - _sum_rows(arrays['pit'], g)
+        totals = trade_points(arrays['team_bat'], arrays['team_pit'], me, partner, d_bat, d_pit).sum(axis=-1)
+        my_gain[start:start + chunk] = totals[:, me] - base[me]
+        partner_gain[start:start + chunk] = totals[:, partner] - base[partner]
+
+    viable = np.flatnonzero((my_gain > 0) & (partner_gain >= min_partner))
+    front = viable[pareto_front(my_gain[viable], partner_gain[viable])]
+    return give[front], get[front], my_gain[front], partner_gain[front], len(give)
+
+
+def _search_worker(me, partner, chunk, min_partner):
+    return partner, search_partner(shared_arrays.worker_arrays(), me, partner, chunk, min_partner)
+
+
+def search_trades(rollup, me, workers=None, chunk=CHUNK_TRADES, min_partner=MIN_PARTNER_GAIN):
+    """Search every partner in parallel; returns (ranked trades DataFrame, trades evaluated)."""
+    arrays = {key: rollup[key] for key in ('codes', 'bat', 'pit', 'team_bat', 'team_pit')}
+    partners = [p for p in range(len(rollup['teams'])) if p != me]
+    names = rollup['players']['Name'].to_numpy()
+    records, evaluated = [], 0
+    with shared_arrays.SharedArrays(arrays) as shared, \
+            ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                                initializer=shared_arrays.attach_worker,
+                                initargs=(shared.specs,)) as pool:
+        futures = [pool.submit(_search_worker, me, p, chunk, min_partner) for p in partners]
+        for future in futures:
+            partner, (give, get, my_gain, partner_gain, n) = future.result()
+            evaluated += n
+            for g, r, mg, pg in zip(give, get, my_gain, partner_gain):
+                records.append({
+                    'Partner': rollup['teams'][partner],
+                    'Give': ' + '.join(names[i] for i in g if i >= 0),
+                    'Get': ' + '.join(names[i] for i in r if i >= 0),
+                    'My_Gain': mg,
+                    'Partner_Gain': pg,
+                })
+    trades = pd.DataFrame(records, columns=['Partner', 'Give', 'Get', 'My_Gain', 'Partner_Gain'])
+    trades = trades.sort_values(['My_Gain', 'Partner_Gain'], ascending=False, kind='stable')
+    return trades.reset_index(drop=True), evaluated
+
+# =============================================================================
+# REPORT
+# =============================================================================
+
+def print_standings(teams, points, title, before=None):
+    totals = points.sum(axis=-1)
+    print("\n" + "=" * 80)
+    print(title)
+    print("=" * 80)
+    print(f"{'Franchise':<30} {'Points':>7}" + (f" {'Change':>7}" if before is not None else '')
+          + ' ' + ' '.join(f'{c:>5}' for c in roto.CATEGORIES[:7]))
+    for t in np.argsort(-totals, kind='stable'):
+        change = f" {totals[t] - before.sum(axis=-1)[t]:>+7.1f}" if before is not None else ''
+        print(f"{teams[t]:<30} {totals[t]:>7.1f}{change} "
+              + ' '.join(f'{p:>5.1f}' for p in points[t, :7]))
+
+
+def print_trade_sides(teams, before, after, sides):
+    for t in sides:
+        delta = after[t] - before[t]
+        print(f"\n{teams[t]}: {before[t].sum():.1f} -> {after[t].sum():.1f} ({delta.sum():+.1f})")
+        moved = [f"{c} {d:+.1f}" for c, d in zip(roto.CATEGORIES, delta) if d]
+        print(f"  {', '.join(moved) if moved else 'no category changes'}")
+
+
+def find_players(index, players, names, franchise):
+    """Rows of players for names, resolved with a PlayerIndex built over players."""
+    rows = []
+    for name in names:
+        row = index.lookup(name).row
+        if row is None or players.at[row, 'Rostered_By'] != franchise:
+            print(f"{name} is not on {franchise}'s roster")
+            sys.exit(1)
+        rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--me', required=True, help='my franchise (Rostered_By)')
+    parser.add_argument('--give', action='append', default=[], help='player I send (repeatable)')
+    parser.add_argument('--get', action='append', default=[], help='player I receive (repeatable)')
+    parser.add_argument('--search', action='store_true', help='rank every 1-for-1 and 2-for-1 trade')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk', type=int, default=CHUNK_TRADES)
+    parser.add_argument('--min-partner', type=float, default=MIN_PARTNER_GAIN,
+                        help='lowest partner point change a trade may have')
+    parser.add_argument('--top', type=int, default=25)
+    parser.add_argument('--csv', action='store_true', help='write trade_search.csv')
+    args = parser.parse_args()
+
+    rollup = franchises.franchise_rollup(player_cache.load_player_table())
+    teams, players = rollup['teams'], rollup['players']
+    if args.me not in teams:
+        print(f"Unknown franchise: {args.me}")
+        print(f"Available: {', '.join(teams)}")
+        sys.exit(1)
+    me = teams.index(args.me)
+    _, points = standings(rollup['team_bat'], rollup['team_pit'])
+
+    if args.give or args.get:
+        if not args.get:
+            print("--give needs at least one --get player (the partner is whoever rosters them)")
+            sys.exit(1)
+        index = player_identity.PlayerIndex(players)
+        give = find_players(index, players, args.give, args.me)
+        partners = {players.at[row, 'Rostered_By'] for row in
+                    (index.lookup(name).row for name in args.get) if row is not None}
+        if len(partners) != 1:
+            print("--get players must all come from one other franchise")
+            sys.exit(1)
+        partner_name = partners.pop()
+        if partner_name == args.me:
+            print(f"--get players are already on {args.me}'s roster; name players from another franchise")
+            sys.exit(1)
+        get = find_players(index, players, args.get, partner_name)
+        partner = teams.index(partner_name)
+        d_bat = (rollup['bat'][get].sum(axis=0) - rollup['bat'][give].sum(axis=0))[None]
+        d_pit = (rollup['pit'][get].sum(axis=0) - rollup['pit'][give].sum(axis=0))[None]
+        after = trade_points(rollup['team_bat'], rollup['team_pit'], me, partner, d_bat, d_pit)[0]
+        print_standings(teams, after, f"PROJECTED STANDINGS AFTER TRADE WITH {partner_name.upper()}", points)
+        print_trade_sides(teams, points, after, [me, partner])
+    elif args.search:
+        start = time.perf_counter()
+        trades, evaluated = search_trades(rollup, me, args.workers, args.chunk, args.min_partner)
+        elapsed = time.perf_counter() - start
+        print("\n" + "=" * 80)
+        print(f"BEST TRADES FOR {args.me.upper()} (non-dominated, partner change >= {args.min_partner:+.1f})")
+        print("=" * 80)
+        print(f"{'Partner':<22} {'Mine':>5} {'Them':>5}  Give -> Get")
+        for _, row in trades.head(args.top).iterrows():
+            print(f"{row['Partner'][:22]:<22} {row['My_Gain']:>+5.1f} {row['Partner_Gain']:>+5.1f}  "
+                  f"{row['Give']} -> {row['Get']}")
+        print(f"\nEvaluated {evaluated:,} trades in {elapsed:.1f}s ({evaluated / elapsed:,.0f}/s); "
+              f"{len(trades)} on the Pareto fronts")
+        if args.csv:
+            trades.to_csv('trade_search.csv', index=False)
+    else:
+        print_standings(teams, points, "PROJECTED STANDINGS (rostered players)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Search category weights for the roster that would win the 2025 league.
+
+A weight vector over z_HR ... z_HLD ranks the available pool. The roster it
+produces is drafted from one snake slot in a 12-team league: the other teams
+take players in ADP order, we take our best-scored available player each
+round until N_BATTERS batters and N_PITCHERS pitchers are filled. That roster's
+projected category totals are scored in roto points against the 12 real teams
+in fantrax_data.csv (max 13 points per category). Candidate weights are
+searched with the cross-entropy method: sample a batch, keep the elite
+fraction, refit the sampling distribution, repeat. Weights are unbounded in
+sign, so the search reaches negative (punt) weights like those in
+draft_board_analysis.STRATEGIES.
+
+Batches are scored in parallel by a process pool. The z-score and stat
+component matrices live in shared memory (shared_arrays) so each worker
+reads the same read-only copy instead of unpickling it per task. Within a
+task every candidate drafts at once: one (candidates x players) pass per round.
+
+Usage:
+    python weight_optimizer.py                  # 25 iterations of 4096 candidates, all cores
+    python weight_optimizer.py --slot 1 --iterations 40 --batch 8192 --workers 4 --seed 7
+    python weight_optimizer.py --reliever-pool  # search the power_rp/elite_bullpen pool
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import draft_board_analysis as dba
+import roto
+import shared_arrays
+from scoring import CATEGORIES, ScoringEngine, strategy_weights
+
+LEAGUE_SIZE = roto.LEAGUE_SIZE
+DRAFT_SLOT = 6
+N_BATTERS = roto.ROSTER_BATTERS
+N_PITCHERS = roto.ROSTER_PITCHERS
+ELITE_FRACTION = 0.1
+SMOOTHING = 0.7  # Weight of the new elite fit vs the previous distribution
+MIN_STD = 0.02
+CHUNK_SIZE = 256  # Candidates per pool task
+
+NB = len(dba.BATTER_CATEGORIES)
+
+
+def snake_picks(slot, rounds, league_size=LEAGUE_SIZE):
+    """Overall pick numbers (1-based) for a draft slot in a snake draft."""
+    return np.array([r * league_size + (slot if r % 2 == 0 else league_size + 1 - slot)
+                     for r in range(rounds)])
+
+
+def draft_rosters(arrays, weights, slot=DRAFT_SLOT, n_batters=N_BATTERS, n_pitchers=N_PITCHERS):
+    """Player columns drafted for each weight row (k x 13) -> (k x rounds).
+
+    Players are in ADP order, so the players the other teams have taken by
+    our pick are the first `others_taken` players we have not taken ourselves.
+    """
+    scores = weights @ arrays['z'].T                      # k x players
+    is_batter = arrays['is_batter']
+    k, n = scores.shape
+    column = np.arange(n)
+    mine = np.zeros((k, n), dtype=bool)
+    batters_left = np.full(k, n_batters)
+    pitchers_left = np.full(k, n_pitchers)
+    picks = snake_picks(slot, n_batters + n_pitchers)
+    drafted = np.empty((k, len(picks)), dtype=np.int64)
+
+    for round_no, pick in enumerate(picks):
+        others_taken = pick - 1 - round_no
+        mine_before = np.cumsum(mine, axis=1) - mine
+        gone = (column - mine_before) < others_taken
+        allowed = ~mine & ~gone
+        allowed &= np.where(is_batter, batters_left[:, None] > 0, pitchers_left[:, None] > 0)
+        choice = np.argmax(np.where(allowed, scores, -np.inf), axis=1)
+        mine[np.arange(k), choice] = True
+        drafted[:, round_no] = choice
+        took_batter = is_batter[choice]
+        batters_left -= took_batter
+        pitchers_left -= ~took_batter
+    return drafted
+
+
+def roster_values(arrays, weights, slot=DRAFT_SLOT, n_batters=N_BATTERS, n_pitchers=N_PITCHERS):
+    """Category values (k x CATEGORIES) of the roster drafted for each weight row."""
+    drafted = draft_rosters(arrays, weights, slot, n_batters, n_pitchers)
+    bat = arrays['batting'][drafted].sum(axis=1)          # k x components
+    pit = arrays['pitching'][drafted].sum(axis=1)
+    return roto.category_values(bat, pit)
+
+
+def roster_points(arrays, weights, slot=DRAFT_SLOT, n_batters=N_BATTERS, n_pitchers=N_PITCHERS):
+    """Total roto points vs the league for each weight row."""
+    values = roster_values(arrays, weights, slot, n_batters, n_pitchers)
+    return roto.points_against(values, arrays['league']).sum(axis=-1)
+
+
+def _score_chunk(weights, slot, n_batters, n_pitchers):
+    return roster_points(shared_arrays.worker_arrays(), weights, slot, n_batters, n_pitchers)
+
+
+def optimizer_arrays(engine, league_values):
+    """Read-only matrices the objective needs, in ADP order, keyed for shared memory.
+
+    Returns (arrays, order) where order maps array columns to engine player rows.
+    """
+    nb, n = engine.n_batters, len(engine.players)
+    order = np.argsort(engine.players['ADP'].to_numpy(dtype=float), kind='stable')
+
+    z = np.zeros((n, len(CATEGORIES)))
+    z[:nb, :NB] = np.nan_to_num(engine.batter_z)
+    z[nb:, NB:] = np.nan_to_num(engine.pitcher_z)
+    batting = np.zeros((n, len(roto.BATTING_COMPONENTS)))
+    batting[:nb] = roto.batting_components(engine.players.iloc[:nb])
+    pitching = np.zeros((n, len(roto.PITCHING_COMPONENTS)))
+    pitching[nb:] = roto.pitching_components(engine.players.iloc[nb:])
+
+    arrays = {
+        'z': z[order],
+        'is_batter': (np.arange(n) < nb)[order],
+        'batting': batting[order],
+        'pitching': pitching[order],
+        'league': league_values,
+    }
+    return arrays, order
+
+
+def weight_vector(weights):
+    return np.array([weights.get(col, 0) for col in CATEGORIES], dtype=float)
+
+
+def weight_dict(vector):
+    """Weights scaled so the largest absolute weight is 1.
+
+    Batters and pitchers compete for the same picks, so the ratio between
+    the two sides matters: one shared scale keeps every pick (and the
+    score) of the raw vector, where per-side scales would not. Six decimals
+    keep near-tied picks as well; three changed about 2% of rosters.
+    """
+    vector = np.asarray(vector, dtype=float)
+    scale = np.abs(vector).max()
+    if scale > 0:
+        vector = vector / scale
+    return {col: round(float(w), 6) for col, w in zip(CATEGORIES, vector)}
+
+
+def optimize(arrays, iterations=25, batch=4096, workers=None, seed=0, slot=DRAFT_SLOT,
+             n_batters=N_BATTERS, n_pitchers=N_PITCHERS, start=None):
+    """Cross-entropy search over weights; returns (best_weights, best_points, trace).
+
+    trace has one dict per iteration: iteration, evaluated, best, elite_mean,
+    batch_mean, seconds.
+    """
+    rng = np.random.default_rng(seed)
+    dims = len(CATEGORIES)
+    mean = np.full(dims, 0.5) if start is None else np.asarray(start, dtype=float)
+    std = np.full(dims, 0.5)
+    n_elite = max(int(batch * ELITE_FRACTION), 2)
+
+    best_weights, best_points = mean.copy(), -np.inf
+    trace = []
+    evaluated = 0
+
+    with shared_arrays.SharedArrays(arrays) as shared, \
+            ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                                initializer=shared_arrays.attach_worker,
+                                initargs=(shared.specs,)) as pool:
+        began = time.perf_counter()
+        for iteration in range(1, iterations + 1):
+            # Negative weights stay in: punting a category is part of the space
+            candidates = rng.normal(mean, std, size=(batch, dims))
+            if iteration == 1:
+                candidates[0] = mean
+            chunks = [candidates[i:i + CHUNK_SIZE] for i in range(0, batch, CHUNK_SIZE)]
+            n = len(chunks)
+            points = np.concatenate(list(pool.map(
+                _score_chunk, chunks, [slot] * n, [n_batters] * n, [n_pitchers] * n)))
+            evaluated += batch
+
+            elite = np.argpartition(-points, n_elite - 1)[:n_elite]
+            top = elite[np.argmax(points[elite])]
+            if points[top] > best_points:
+                best_points, best_weights = float(points[top]), candidates[top].copy()
+
+            mean = SMOOTHING * candidates[elite].mean(axis=0) + (1 - SMOOTHING) * mean
+            std = np.maximum(SMOOTHING * candidates[elite].std(axis=0) + (1 - SMOOTHING) * std, MIN_STD)
+            trace.append({
+                'iteration': iteration,
+                'evaluated': evaluated,
+                'best': best_points,
+                'elite_mean': float(points[elite].mean()),
+                'batch_mean': float(points.mean()),
+                'seconds': time.perf_counter() - began,
+            })
+
+    return best_weights, best_points, trace
+
+
+def print_trace(trace):
+    print("\n" + "=" * 80)
+    print("CONVERGENCE")
+    print("=" * 80)
+    print(f"{'Iter':>4} {'Evaluated':>10} {'Best':>7} {'Elite':>7} {'Batch':>7} {'Seconds':>8} {'Evals/s':>9}")
+    for row in trace:
+        rate = row['evaluated'] / row['seconds'] if row['seconds'] else float('inf')
+        print(f"{row['iteration']:>4} {row['evaluated']:>10,} {row['best']:>7.1f} {row['elite_mean']:>7.1f} "
+              f"{row['batch_mean']:>7.1f} {row['seconds']:>8.2f} {rate:>9,.0f}")
+
+
+def print_result(engine, arrays, order, teams, best_weights, best_points, slot, n_batters, n_pitchers):
+    print("\n" + "=" * 80)
+    print(f"BEST WEIGHTS: {best_points:.1f} of {len(CATEGORIES) * (len(teams) + 1)} roto points")
+    print("=" * 80)
+    for col, w in weight_dict(best_weights).items():
+        print(f"  {col:<8} {w:>9.6f}")
+
+    values = roster_values(arrays, best_weights[None, :], slot, n_batters, n_pitchers)[0]
+    points = roto.points_against(values, arrays['league'])
+    print(f"\n{'Category':<9} {'Value':>9} {'Points':>7}")
+    for cat, value, pts in zip(roto.CATEGORIES, values, points):
+        print(f"{cat:<9} {value:>9.3f} {pts:>7.1f}")
+
+    drafted = draft_rosters(arrays, best_weights[None, :], slot, n_batters, n_pitchers)[0]
+    picks = snake_picks(slot, len(drafted))
+    adp = engine.players['ADP'].to_numpy()
+    print(f"\nRoster (slot {slot}):")
+    for pick, column in zip(picks, drafted):
+        row = order[column]
+        print(f"  {pick:>3}  {engine.names[row]:<25} {engine.teams[row]:<5} {engine.positions[row]:<7} "
+              f"ADP {adp[row]:>6.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--iterations', type=int, default=25)
+    parser.add_argument('--batch', type=int, default=4096)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--slot', type=int, default=DRAFT_SLOT, help=f'snake draft slot (1-{LEAGUE_SIZE})')
+    parser.add_argument('--batters', type=int, default=N_BATTERS)
+    parser.add_argument('--pitchers', type=int, default=N_PITCHERS)
+    parser.add_argument('--reliever-pool', action='store_true',
+                        help='use the reliever-split pool (power_rp/elite_bullpen)')
+    args = parser.parse_args()
+
+    engine = ScoringEngine.from_cache(reliever_split=args.reliever_pool)
+    teams, league_values, _ = roto.load_league()
+    arrays, order = optimizer_arrays(engine, league_values)
+
+    print("\n" + "=" * 80)
+    print(f"STRATEGY BASELINES (slot {args.slot}, {args.batters} batters + {args.pitchers} pitchers "
+          f"vs {len(teams)} teams)")
+    print("=" * 80)
+    pool_keys = [key for key in dba.STRATEGIES if (key in dba.RELIEVER_STRATEGIES) == args.reliever_pool]
+    baselines = np.array([weight_vector(strategy_weights(key)) for key in pool_keys])
+    baseline_points = roster_points(arrays, baselines, args.slot, args.batters, args.pitchers)
+    for key, pts in zip(pool_keys, baseline_points):
+        print(f"  {key:<15} {pts:>6.1f}")
+
+    start = baselines[np.argmax(baseline_points)]
+    best_weights, best_points, trace = optimize(
+        arrays, args.iterations, args.batch, args.workers, args.seed, args.slot,
+        args.batters, args.pitchers, start=start)
+    print_trace(trace)
+    print_result(engine, arrays, order, teams, best_weights, best_points,
+                 args.slot, args.batters, args.pitchers)
+
+
+if __name__ == '__main__':
+    main()